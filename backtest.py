@@ -0,0 +1,202 @@
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from technical import TechnicalAnalysis
+
+logger = logging.getLogger(__name__)
+
+# 15m बार: साल में ~35,040 (24x7 क्रिप्टो); NSE के लिए ~6,500
+BARS_PER_YEAR = {'1m': 525600, '5m': 105120, '15m': 35040, '30m': 17520, '1h': 8760, '1d': 365}
+
+
+class BacktestEngine:
+    """
+    scanner वाली EMA+RSI+Volume स्ट्रैटेजी का वेक्टराइज़्ड बैकटेस्ट
+    सिग्नल → पोज़िशन → अगले बार पर fill (fees + slippage) → equity, सब NumPy arrays
+    """
+
+    def __init__(self, close: np.ndarray, volume: np.ndarray, fee_bps: float = 10.0,
+                 slippage_bps: float = 5.0, long_only: bool = False, bars_per_year: int = 35040):
+        self.close = np.asarray(close, dtype=float)
+        self.volume = np.asarray(volume, dtype=float)
+        self.cost = (fee_bps + slippage_bps) / 1e4
+        self.long_only = long_only
+        self.bars_per_year = bars_per_year
+        self.returns = np.zeros_like(self.close)
+        self.returns[1:] = self.close[1:] / self.close[:-1] - 1
+        # पैरामीटर स्वीप में एक ही window बार-बार न बने
+        self._ema: Dict[int, np.ndarray] = {}
+        self._rsi: Dict[int, np.ndarray] = {}
+        self._volume_ok: Dict[int, np.ndarray] = {}
+
+    def ema(self, window: int) -> np.ndarray:
+        if window not in self._ema:
+            self._ema[window] = pd.Series(self.close).ewm(span=window, adjust=False).mean().to_numpy()
+        return self._ema[window]
+
+    def rsi(self, window: int) -> np.ndarray:
+        if window not in self._rsi:
+            rsi = TechnicalAnalysis.calculate_rsi_series(self.close, window)
+            # बहुत कम बार्स → None; NaN पर कोई सिग्नल नहीं बनता
+            self._rsi[window] = rsi if rsi is not None else np.full_like(self.close, np.nan)
+        return self._rsi[window]
+
+    def volume_ok(self, window: int) -> np.ndarray:
+        if window not in self._volume_ok:
+            volume_ma = pd.Series(self.volume).rolling(window=window).mean().to_numpy()
+            self._volume_ok[window] = self.volume > volume_ma
+        return self._volume_ok[window]
+
+    def signals(self, ema_window: int = 20, rsi_window: int = 14, volume_window: int = 20,
+                rsi_overbought: float = 70, rsi_oversold: float = 30) -> np.ndarray:
+        """
+        हर बार पर +1 (BUY), -1 (SELL) या 0 - check_signals जैसे ही नियम
+        warm-up (सबसे बड़ी window) से पहले 0: RSI का seed `rsi[:window]` बाद के deltas से बनता है (look-ahead)
+        """
+        ema, rsi, volume_ok = self.ema(ema_window), self.rsi(rsi_window), self.volume_ok(volume_window)
+        buy = (self.close > ema) & (rsi < rsi_overbought) & volume_ok
+        sell = ~buy & (self.close < ema) & (rsi > rsi_oversold) & volume_ok
+        signals = buy.astype(np.int8) - sell.astype(np.int8)
+        signals[:max(ema_window, rsi_window, volume_window)] = 0
+        return signals
+
+    def positions(self, signals: np.ndarray) -> np.ndarray:
+        """
+        आखिरी सिग्नल तक पोज़िशन होल्ड; सिग्नल बार के close के बाद अगले बार से लागू (no look-ahead)
+        """
+        target = signals.astype(float)
+        if self.long_only:
+            target[target < 0] = 0.
+        # आखिरी non-zero सिग्नल को आगे fill करें
+        idx = np.where(signals != 0, np.arange(len(signals)), -1)
+        np.maximum.accumulate(idx, out=idx)
+        held = np.where(idx >= 0, target[idx], 0.)
+        position = np.zeros_like(held)
+        position[1:] = held[:-1]
+        return position
+
+    def run(self, **params) -> dict:
+        position = self.positions(self.signals(**params))
+        turnover = np.abs(np.diff(position, prepend=0.))
+        strategy = position * self.returns - turnover * self.cost
+        return dict(params, **self.metrics(strategy, turnover, position))
+
+    def equity_curve(self, **params) -> np.ndarray:
+        position = self.positions(self.signals(**params))
+        turnover = np.abs(np.diff(position, prepend=0.))
+        return np.cumprod(1 + position * self.returns - turnover * self.cost)
+
+    def metrics(self, strategy: np.ndarray, turnover: np.ndarray, position: np.ndarray) -> dict:
+        equity = np.cumprod(1 + strategy)
+        peak = np.maximum.accumulate(equity)
+        std = strategy.std()
+        return {
+            'total_return': round(float(equity[-1] - 1), 6),
+            'sharpe': round(float(strategy.mean() / std * np.sqrt(self.bars_per_year)), 4) if std > 0 else 0.0,
+            'max_drawdown': round(float((equity / peak - 1).min()), 6),
+            'trades': int(np.count_nonzero(turnover)),
+            'exposure': round(float(np.mean(position != 0)), 4),
+        }
+
+
+# ---------------- पैरामीटर स्वीप (process pool + shared memory) ----------------
+
+def parameter_grid(ema_windows: Iterable[int] = (10, 20, 50),
+                   rsi_bounds: Iterable[Tuple[float, float]] = ((70, 30),),
+                   volume_windows: Iterable[int] = (20,),
+                   rsi_windows: Iterable[int] = (14,)) -> List[dict]:
+    return [
+        {'ema_window': ema, 'rsi_window': rsi, 'volume_window': vol,
+         'rsi_overbought': overbought, 'rsi_oversold': oversold}
+        for ema, rsi, vol, (overbought, oversold)
+        in itertools.product(ema_windows, rsi_windows, volume_windows, rsi_bounds)
+    ]
+
+
+_worker_engine: Optional[BacktestEngine] = None
+_worker_shm: list = []
+
+
+def _init_worker(close_name: str, volume_name: str, length: int, engine_kwargs: dict) -> None:
+    global _worker_engine, _worker_shm
+    # shared memory से zero-copy views - हर worker में price arrays की कॉपी नहीं
+    _worker_shm = [shared_memory.SharedMemory(name=close_name), shared_memory.SharedMemory(name=volume_name)]
+    close = np.ndarray((length,), dtype=np.float64, buffer=_worker_shm[0].buf)
+    volume = np.ndarray((length,), dtype=np.float64, buffer=_worker_shm[1].buf)
+    _worker_engine = BacktestEngine(close, volume, **engine_kwargs)
+
+
+def _run_chunk(combos: List[dict]) -> List[dict]:
+    return [_worker_engine.run(**params) for params in combos]
+
+
+def sweep(close: np.ndarray, volume: np.ndarray, grid: List[dict], processes: Optional[int] = None,
+          sort_by: str = 'sharpe', **engine_kwargs) -> pd.DataFrame:
+    """
+    पूरा grid process pool में चलाएँ; एक ही EMA window वाले combos एक chunk में,
+    ताकि worker के EMA/RSI/Volume caches दोबारा इस्तेमाल हों
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    volume = np.ascontiguousarray(volume, dtype=np.float64)
+    processes = processes or os.cpu_count() or 1
+
+    by_ema: Dict[int, List[dict]] = {}
+    for params in grid:
+        by_ema.setdefault(params['ema_window'], []).append(params)
+    chunks = list(by_ema.values())
+    if len(chunks) < processes:
+        size = -(-len(grid) // processes)
+        chunks = [grid[i:i + size] for i in range(0, len(grid), size)]
+
+    if processes == 1 or len(chunks) == 1:
+        engine = BacktestEngine(close, volume, **engine_kwargs)
+        results = [engine.run(**params) for params in grid]
+    else:
+        blocks = []
+        try:
+            for array in (close, volume):
+                shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+                np.ndarray(array.shape, dtype=np.float64, buffer=shm.buf)[:] = array
+                blocks.append(shm)
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=(blocks[0].name, blocks[1].name, len(close), engine_kwargs)) as pool:
+                results = [row for rows in pool.map(_run_chunk, chunks) for row in rows]
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    return pd.DataFrame(results).sort_values(sort_by, ascending=False, ignore_index=True)
+
+
+# उदाहरण: python backtest.py BTC 15m  (नाम, alias या Yahoo टिकर)
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from src.bar_store import bar_store
+    from src.symbols import symbol_registry
+
+    symbol = symbol_registry.to_yahoo(sys.argv[1] if len(sys.argv) > 1 else "BTC")
+    interval = sys.argv[2] if len(sys.argv) > 2 else "15m"
+    bars = bar_store.load(symbol, interval)
+    if bars.empty:
+        raise SystemExit(f"{symbol} {interval} के लिए कोई डेटा नहीं")
+
+    grid = parameter_grid(
+        ema_windows=range(10, 101, 5),
+        rsi_bounds=list(itertools.product((60, 65, 70, 75, 80), (20, 25, 30, 35, 40))),
+        volume_windows=(10, 20, 30, 50),
+    )
+    start = time.perf_counter()
+    table = sweep(bars['Close'].to_numpy(), bars['Volume'].to_numpy(), grid,
+                  bars_per_year=BARS_PER_YEAR.get(interval, 35040))
+    print(f"{len(grid)} combos × {len(bars)} bars: {time.perf_counter() - start:.1f}s")
+    print(table.head(10).to_string())
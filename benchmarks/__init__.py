@@ -0,0 +1 @@
+# Benchmark / parity scripts - run from repo root: python -m benchmarks.<name>
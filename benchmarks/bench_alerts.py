@@ -0,0 +1,94 @@
+"""
+AlertDispatcher against an in-process fake Bot API that enforces Telegram's limits
+(30 msg/s global, 1 msg/s per chat) and answers violations with 429 + retry_after.
+
+    python -m benchmarks.bench_alerts
+"""
+import asyncio
+import time
+from collections import defaultdict, deque
+
+from src.alerts import AlertDispatcher
+
+
+class RetryAfter(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Flood control exceeded. Retry in {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class FakeBotAPI:
+    def __init__(self, global_rate: int = 30, per_chat_rate: int = 1, latency: float = 0.02):
+        self.global_rate = global_rate
+        self.per_chat_rate = per_chat_rate
+        self.latency = latency
+        self.sent = []
+        self.rejected = 0
+        self._global = deque()
+        self._per_chat = defaultdict(deque)
+
+    @staticmethod
+    def _over(window: deque, limit: int, now: float) -> bool:
+        while window and now - window[0] >= 1.0:
+            window.popleft()
+        return len(window) >= limit
+
+    async def send_message(self, chat_id: str, text: str) -> None:
+        await asyncio.sleep(self.latency)
+        now = time.monotonic()
+        chat = self._per_chat[chat_id]
+        if self._over(self._global, self.global_rate, now) or self._over(chat, self.per_chat_rate, now):
+            self.rejected += 1
+            raise RetryAfter(1)
+        self._global.append(now)
+        chat.append(now)
+        self.sent.append((chat_id, text))
+
+
+async def naive(api: FakeBotAPI, alerts, chats) -> float:
+    # पुराना तरीका: हर alert पर सीधे await send_message
+    t0 = time.perf_counter()
+    for text in alerts:
+        for chat in chats:
+            try:
+                await api.send_message(chat, text)
+            except RetryAfter:
+                pass
+    return time.perf_counter() - t0
+
+
+async def dispatched(api: FakeBotAPI, alerts, chats) -> float:
+    dispatcher = AlertDispatcher(api.send_message, workers=8)
+    dispatcher.start()
+    t0 = time.perf_counter()
+    for text in alerts:
+        dispatcher.publish(text, chats)
+        dispatcher.publish(text, chats)  # duplicate - dedupe होना चाहिए
+    publish_time = time.perf_counter() - t0
+    await dispatcher.stop(drain_timeout=120)
+    elapsed = time.perf_counter() - t0
+    m = dispatcher.metrics()
+    print(f"  dispatcher: publish {publish_time * 1e3:.2f}ms, drained in {elapsed:.1f}s, "
+          f"sent {m['sent']}, dedup {m['deduplicated']}, 429s {m['rate_limited']}, "
+          f"max depth {m['max_depth']}, max wait {m['max_wait']}s")
+    return elapsed
+
+
+async def main() -> None:
+    chats = [f"chat{i}" for i in range(60)]
+    alerts = [f"🔔 [BUY SIGNAL] SYM{i} is bullish" for i in range(3)]
+    total = len(chats) * len(alerts)
+
+    api = FakeBotAPI()
+    elapsed = await naive(api, alerts, chats)
+    print(f"naive loop: {len(api.sent)}/{total} delivered, {api.rejected} rejected (429), {elapsed:.1f}s")
+
+    api = FakeBotAPI()
+    print("dispatcher:")
+    await dispatched(api, alerts, chats)
+    print(f"  {len(api.sent)}/{total} delivered, {api.rejected} rejected (429)")
+    assert len(api.sent) == total and api.rejected == 0
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
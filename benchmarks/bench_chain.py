@@ -0,0 +1,94 @@
+"""
+Multi-expiry chain summary: time for the columnar summarize_chains vs a brute-force
+per-expiry loop (n×n payoff matrix for max pain). Parity is covered by
+tests/test_chain_summary.py.
+
+    python -m benchmarks.bench_chain
+"""
+import asyncio
+import os
+import time
+
+import numpy as np
+
+from options import OptionAnalyzer, summarize_chains
+from src.providers import AsyncMarketData, FakeProvider
+
+EXPIRIES = int(os.getenv("CHAIN_EXPIRIES", "12"))
+STRIKES = int(os.getenv("CHAIN_STRIKES", "400"))
+SPOT = 22000.
+
+
+def synthetic_columns(n_expiries: int, n_strikes: int, seed: int = 5):
+    # हर एक्सपायरी में अलग स्ट्राइक ग्रिड; कुछ स्ट्राइक्स पर सिर्फ एक साइड
+    rng = np.random.default_rng(seed)
+    parts = []
+    for e in range(n_expiries):
+        strikes = SPOT + 50. * (np.arange(n_strikes) - n_strikes // 2 + e)
+        for is_call in (True, False):
+            keep = rng.random(n_strikes) > 0.1
+            k = strikes[keep]
+            parts.append((np.full(k.size, e, dtype=np.int32), np.full(k.size, is_call), k,
+                          rng.integers(0, 100000, k.size).astype(float),
+                          rng.integers(0, 5000, k.size).astype(float),
+                          np.where(rng.random(k.size) > 0.05, rng.uniform(0.1, 0.4, k.size), np.nan)))
+    order = rng.permutation(sum(p[0].size for p in parts))
+    names = ('expiry', 'is_call', 'strike', 'open_interest', 'volume', 'iv')
+    columns = {name: np.concatenate([p[i] for p in parts])[order] for i, name in enumerate(names)}
+    columns.update(last_price=np.ones(order.size), bid=np.ones(order.size), ask=np.ones(order.size))
+    return columns
+
+
+def brute_force(columns, n_expiries: int, walls: int):
+    out = {'pcr_oi': [], 'max_pain': [], 'call_walls': [], 'put_walls': []}
+    for e in range(n_expiries):
+        m = columns['expiry'] == e
+        k, oi, call = columns['strike'][m], columns['open_interest'][m], columns['is_call'][m]
+        out['pcr_oi'].append(oi[~call].sum() / oi[call].sum())
+        grid = np.unique(k)
+        C = np.array([oi[call & (k == s)].sum() for s in grid])
+        P = np.array([oi[~call & (k == s)].sum() for s in grid])
+        settle = grid[:, None]
+        pain = (np.maximum(settle - grid, 0) * C).sum(1) + (np.maximum(grid - settle, 0) * P).sum(1)
+        out['max_pain'].append(grid[np.argmin(pain)])
+        for side, side_oi in (('call', C), ('put', P)):
+            top = np.argsort(-side_oi, kind='stable')[:walls]
+            out[f'{side}_walls'].append(grid[top])
+    return out
+
+
+def timing(columns, repeat: int = 20) -> None:
+    t0 = time.perf_counter()
+    brute_force(columns, EXPIRIES, 3)
+    brute = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        summarize_chains(columns, SPOT, EXPIRIES)
+    columnar = (time.perf_counter() - t0) / repeat
+    print(f"brute-force loop: {brute * 1e3:8.1f}ms   summarize_chains: {columnar * 1e3:6.2f}ms"
+          f"   ({brute / columnar:,.0f}x)")
+
+
+async def fake_end_to_end() -> None:
+    provider = FakeProvider(latency=0.05)
+    analyzer = OptionAnalyzer("NIFTY")
+    t0 = time.perf_counter()
+    summary = await analyzer.summarize_expiries_async(AsyncMarketData(provider), solve_iv=True)
+    elapsed = time.perf_counter() - t0
+    print(f"fake provider, {len(summary['expiries'])} expiries @50ms latency: {elapsed * 1e3:.0f}ms "
+          f"({provider.calls.get('option_chain', 0)} chain fetches)")
+    for i, expiry in enumerate(summary['expiries']):
+        print(f"  {expiry}  pcr {summary['pcr_oi'][i]:.2f}  max pain {summary['max_pain'][i]:.0f}"
+              f"  call wall {summary['call_walls'][i, 0]:.0f}  put wall {summary['put_walls'][i, 0]:.0f}")
+
+
+def main() -> None:
+    columns = synthetic_columns(EXPIRIES, STRIKES)
+    print(f"{EXPIRIES} expiries x {STRIKES} strikes ({columns['strike'].size} rows)")
+    timing(columns)
+    asyncio.run(fake_end_to_end())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+NumPy Black-Scholes engine throughput (vectorized vs a per-strike calculate_greeks loop).
+Parity lives in tests/test_greeks_parity.py.
+
+    python -m benchmarks.bench_greeks
+"""
+import time
+
+import numpy as np
+
+import options
+from options import black_scholes_greeks
+
+
+def synthetic_chain(n: int, spot: float = 45000., seed: int = 5):
+    rng = np.random.default_rng(seed)
+    strikes = spot + 100 * rng.integers(-40, 41, n)
+    expiries = rng.choice([3, 7, 14, 28, 56], n) / 365
+    ivs = rng.uniform(0.08, 0.45, n)
+    flags = rng.choice(['c', 'p'], n)
+    return strikes.astype(float), expiries, ivs, flags
+
+
+def bench_throughput() -> None:
+    S, r = 45000., 0.06
+    for n in (1_000, 100_000, 1_000_000):
+        strikes, expiries, ivs, flags = synthetic_chain(n)
+        t0 = time.perf_counter()
+        black_scholes_greeks(S, strikes, expiries, r, ivs, flags)
+        elapsed = time.perf_counter() - t0
+        line = f"{n:>9} strikes: numpy {elapsed * 1e3:8.2f}ms ({n / elapsed / 1e6:.1f}M/s)"
+
+        if n <= 1_000:
+            analyzer = options.OptionAnalyzer()
+            t0 = time.perf_counter()
+            for f, k, t, s in zip(flags, strikes, expiries, ivs):
+                analyzer.calculate_greeks(S, float(k), float(t), float(s), str(f))
+            line += f", calculate_greeks loop {(time.perf_counter() - t0) * 1e3:8.1f}ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    bench_throughput()
@@ -0,0 +1,89 @@
+"""
+Per-call clients vs the shared pooled client against a local Bot API stub.
+
+    python -m benchmarks.bench_http
+"""
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+from src import http_client
+from src.http_client import create_http_client, telegram_api
+
+RESPONSE = json.dumps({"ok": True, "result": {"message_id": 1}}).encode()
+
+
+async def stub_server(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    # keep-alive वाला छोटा HTTP/1.1 स्टब - हर रिक्वेस्ट पर sendMessage जैसा जवाब
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: %d\r\n\r\n%s" % (len(RESPONSE), RESPONSE))
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def summary(name: str, samples: list) -> None:
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{name:<28} p50 {statistics.median(samples) * 1e3:6.2f}ms  p99 {p99 * 1e3:6.2f}ms")
+
+
+async def main(n: int = 500) -> None:
+    server = await asyncio.start_server(stub_server, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/botTOKEN/sendMessage"
+    http_client.TELEGRAM_API_URL = f"http://127.0.0.1:{port}"
+    params = {"chat_id": "1", "text": "🔔 [BUY SIGNAL] BTC"}
+
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            await client.post(url, json=params)
+        samples.append(time.perf_counter() - t0)
+    summary("new AsyncClient per call", samples)
+
+    try:
+        import requests
+        loop = asyncio.get_running_loop()
+        samples = []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            await loop.run_in_executor(None, lambda: requests.post(url, data=params).json())
+            samples.append(time.perf_counter() - t0)
+        summary("requests.post per call", samples)
+    except ImportError:
+        pass
+
+    http_client._client = create_http_client(http2=False)
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        await telegram_api("TOKEN", "sendMessage", **params)
+        samples.append(time.perf_counter() - t0)
+    summary("shared pooled client", samples)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(telegram_api("TOKEN", "sendMessage", **params) for _ in range(n)))
+    print(f"{'shared client, concurrent':<28} {n / (time.perf_counter() - t0):8.0f} req/s")
+    await http_client.close_http_client()
+
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
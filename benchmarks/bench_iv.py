@@ -0,0 +1,45 @@
+"""
+Batched IV solver on 10k-strike synthetic chains: time (scalar py_vollib loop के साथ तुलना)।
+Accuracy / round-trip checks live in tests/test_implied_volatility.py.
+
+    python -m benchmarks.bench_iv
+"""
+import time
+
+import numpy as np
+
+import options
+from benchmarks.bench_greeks import synthetic_chain
+from options import black_scholes_greeks, implied_volatility
+
+
+def main(n: int = 10_000, S: float = 45000., r: float = 0.06) -> None:
+    strikes, expiries, ivs, flags = synthetic_chain(n)
+    greeks = black_scholes_greeks(S, strikes, expiries, r, ivs, flags)
+
+    t0 = time.perf_counter()
+    solved = implied_volatility(greeks['price'], S, strikes, expiries, r, flags)
+    elapsed = time.perf_counter() - t0
+
+    # बिना time value वाले डीप ITM/OTM स्ट्राइक्स पर IV पहचानी नहीं जा सकती
+    identifiable = greeks['vega'] > 1e-3
+    err = np.abs(solved - ivs)[identifiable]
+    print(f"{n} strikes: {elapsed * 1e3:.1f}ms, solved {np.isfinite(solved).mean():.1%}, "
+          f"max abs err (vega>1e-3) {np.nanmax(err):.2e}")
+
+    if options.vollib_available:
+        from py_vollib.black_scholes.implied_volatility import implied_volatility as vollib_iv
+
+        sample = np.flatnonzero(identifiable)[:1000]
+        t0 = time.perf_counter()
+        for i in sample:
+            try:
+                vollib_iv(greeks['price'][i], S, strikes[i], expiries[i], r, flags[i])
+            except Exception:
+                pass
+        per_strike = (time.perf_counter() - t0) / len(sample)
+        print(f"py_vollib scalar loop: ~{per_strike * n * 1e3:.1f}ms for {n} strikes (extrapolated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Error storm: old log_error (sync FileHandler + stat/rename per call) vs the
+queue-based logging_setup pipeline (with and without dedupe), plus a
+multi-process rotation check (no lines lost while 4 workers rotate one file).
+
+    python -m benchmarks.bench_logging
+"""
+import glob
+import logging
+import multiprocessing
+import os
+import queue
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from logging.handlers import QueueListener
+
+from src.logging_setup import (DedupeFilter, JsonFormatter, NonBlockingQueueHandler,
+                               SizeRotatingFileHandler)
+
+STORM = int(os.getenv("LOG_STORM", "20000"))
+WORKERS = 4
+PER_WORKER = int(os.getenv("LOG_PER_WORKER", "5000"))
+
+
+def failing_fetch():
+    raise ConnectionError("yfinance: HTTP 503 Service Unavailable")
+
+
+def storm(emit) -> list:
+    # डेटा आउटेज जैसा: एक ही एरर traceback के साथ बार-बार
+    samples = []
+    for i in range(STORM):
+        try:
+            failing_fetch()
+        except ConnectionError:
+            t0 = time.perf_counter()
+            emit(f"Scan failed for BTC-USD: {i % 3}")
+            samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def summary(name: str, samples: list, drain: float = 0.0) -> None:
+    samples = sorted(samples)
+    total = sum(samples)
+    print(f"{name:<26} {len(samples) / total:10.0f} calls/s  p50 {statistics.median(samples) * 1e6:6.1f}µs"
+          f"  p99 {samples[int(len(samples) * 0.99) - 1] * 1e6:7.1f}µs  max {samples[-1] * 1e3:6.2f}ms"
+          f"  drain {drain * 1e3:6.0f}ms")
+
+
+def legacy(directory: str) -> None:
+    # पुराना utils.log_error: sync FileHandler, हर कॉल पर exists + getsize (+ rename)
+    log_file = os.path.join(directory, "legacy.log")
+    logger = logging.getLogger("bench.legacy")
+    logger.propagate = False
+    handler = logging.FileHandler(log_file)
+    handler.setFormatter(logging.Formatter('%(asctime)s | %(levelname)s | %(message)s'))
+    logger.addHandler(handler)
+
+    def emit(message):
+        logger.error(message, exc_info=True)
+        if os.path.exists(log_file) and os.path.getsize(log_file) > 10 * 1024 * 1024:
+            os.rename(log_file, os.path.join(directory, f"legacy_{datetime.now():%Y%m%d_%H%M%S}.log"))
+
+    summary("legacy log_error", storm(emit))
+    handler.close()
+
+
+def queued(directory: str, dedupe: bool) -> None:
+    name = "queue + dedupe" if dedupe else "queue, no dedupe"
+    logger = logging.getLogger(f"bench.{'dedupe' if dedupe else 'queue'}")
+    logger.propagate = False
+    file_handler = SizeRotatingFileHandler(os.path.join(directory, f"{logger.name}.log"))
+    file_handler.setFormatter(JsonFormatter())
+    queue_handler = NonBlockingQueueHandler(queue.Queue(100000))
+    if dedupe:
+        queue_handler.addFilter(DedupeFilter())
+    logger.addHandler(queue_handler)
+    listener = QueueListener(queue_handler.queue, file_handler)
+    listener.start()
+
+    samples = storm(lambda message: logger.error(message, exc_info=True))
+    t0 = time.perf_counter()
+    listener.stop()
+    summary(name, samples, time.perf_counter() - t0)
+    if queue_handler.dropped:
+        print(f"  dropped (queue full): {queue_handler.dropped}")
+    file_handler.close()
+
+
+def rotation_worker(log_file: str, worker: int) -> None:
+    handler = SizeRotatingFileHandler(log_file, max_bytes=64 * 1024, backup_count=10000)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger(f"bench.rotate.{worker}")
+    logger.propagate = False
+    logger.addHandler(handler)
+    for i in range(PER_WORKER):
+        logger.error("worker=%d seq=%d", worker, i)
+    handler.close()
+
+
+def rotation(directory: str) -> None:
+    log_file = os.path.join(directory, "rotate.log")
+    t0 = time.perf_counter()
+    processes = [multiprocessing.Process(target=rotation_worker, args=(log_file, w)) for w in range(WORKERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - t0
+
+    lines = set()
+    files = [path for path in glob.glob(log_file + "*") if not path.endswith(".lock")]
+    for path in files:
+        with open(path) as handle:
+            lines.update(handle.read().splitlines())
+    expected = WORKERS * PER_WORKER
+    status = "OK" if len(lines) == expected else "LOST LINES"
+    print(f"{WORKERS} processes x {PER_WORKER} records → {len(files)} files, "
+          f"{len(lines)}/{expected} lines in {elapsed:.2f}s  {status}")
+
+
+def main() -> None:
+    print(f"error storm: {STORM} log_error(exc_info=True) calls, caller-side latency")
+    with tempfile.TemporaryDirectory() as directory:
+        legacy(directory)
+        queued(directory, dedupe=False)
+        queued(directory, dedupe=True)
+        rotation(directory)
+
+
+if __name__ == "__main__":
+    main()
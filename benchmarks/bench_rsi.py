@@ -0,0 +1,39 @@
+"""
+Loop RSI (calculate_rsi) vs vectorized RSI (calculate_rsi_series) at 1k / 100k / 1M bars.
+Parity lives in tests/test_rsi_parity.py.
+
+    python -m benchmarks.bench_rsi
+"""
+import time
+
+import numpy as np
+
+from technical import TechnicalAnalysis
+
+
+def timed(fn, *args, repeat: int = 3, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main() -> None:
+    rng = np.random.default_rng(42)
+    ta = TechnicalAnalysis
+    print(f"{'bars':>9} {'loop':>10} {'series':>10} {'last_only':>10} {'speedup':>8}")
+    for n in (1_000, 100_000, 1_000_000):
+        prices = 62000 + np.cumsum(rng.normal(0, 40, n))
+
+        t_loop, _ = timed(ta.calculate_rsi, prices, repeat=1 if n > 100_000 else 3)
+        t_series, _ = timed(ta.calculate_rsi_series, prices)
+        t_last, _ = timed(ta.calculate_rsi_series, prices, last_only=True)
+
+        print(f"{n:>9} {t_loop * 1e3:>8.2f}ms {t_series * 1e3:>8.2f}ms "
+              f"{t_last * 1e3:>8.3f}ms {t_loop / t_series:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Cold-start import time of the web process (`import src.main`), with a budget.
+
+    python -m benchmarks.bench_startup            # budget: STARTUP_BUDGET_MS (default 1500)
+
+Exits non-zero if the import exceeds the budget or pulls in a heavy module
+(pandas/numpy/yfinance/py_vollib) that should only load on first use.
+"""
+import os
+import subprocess
+import sys
+
+HEAVY = ("pandas", "numpy", "yfinance", "py_vollib")
+BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "1500"))
+RUNS = int(os.getenv("STARTUP_RUNS", "5"))
+
+
+def import_times() -> dict:
+    # ताज़ा interpreter में -X importtime; stderr: "import time: self | cumulative | name"
+    env = dict(os.environ, BOT_TOKEN="1:x", CHAT_ID="1", WEBHOOK_URL="http://localhost")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def main() -> int:
+    runs = [import_times() for _ in range(RUNS)]
+    totals = sorted(run["src.main"][1] / 1000 for run in runs)
+    median = totals[len(totals) // 2]
+    print(f"import src.main: median {median:.0f} ms, min {totals[0]:.0f} ms over {RUNS} runs")
+
+    last = runs[-1]
+    top = sorted(last.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    print("top modules by self time:")
+    for name, (self_us, cumulative_us) in top:
+        print(f"  {name:<40} {self_us / 1000:7.1f} ms  (cumulative {cumulative_us / 1000:.1f} ms)")
+
+    failed = False
+    loaded = [name for name in HEAVY if name in last]
+    if loaded:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(loaded)}")
+        failed = True
+    if median > BUDGET_MS:
+        print(f"FAIL: {median:.0f} ms > budget {BUDGET_MS:.0f} ms")
+        failed = True
+    if not failed:
+        print(f"OK: within {BUDGET_MS:.0f} ms budget, no heavy modules loaded")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
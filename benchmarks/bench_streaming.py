@@ -0,0 +1,46 @@
+"""
+Streaming vs batch indicators: per-bar update cost.
+Parity lives in tests/test_streaming_parity.py and tests/test_rsi_parity.py.
+
+    python -m benchmarks.bench_streaming
+"""
+import time
+
+import numpy as np
+
+from technical import TechnicalAnalysis, StreamingRSI, StreamingBollingerBands
+
+
+def synthetic_bars(n: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    close = 62000 + np.cumsum(rng.normal(0, 40, n))
+    high = close + rng.uniform(0, 60, n)
+    low = close - rng.uniform(0, 60, n)
+    volume = rng.uniform(10, 500, n)
+    return high, low, close, volume
+
+
+def bench_update_cost(n: int = 5000) -> None:
+    high, low, close, volume = synthetic_bars(n)
+    ta = TechnicalAnalysis
+
+    t0 = time.perf_counter()
+    for _ in range(100):
+        ta.calculate_rsi(close)
+        ta.calculate_bollinger_bands(close)
+    batch = (time.perf_counter() - t0) / 100
+
+    rsi, bb = StreamingRSI(14), StreamingBollingerBands()
+    rsi.seed(close[:-100])
+    bb.seed(close[:-100])
+    t0 = time.perf_counter()
+    for price in close[-100:]:
+        rsi.update(price)
+        bb.update(price)
+    stream = (time.perf_counter() - t0) / 100
+
+    print(f"RSI+BB on {n} bars: batch {batch * 1e3:.3f} ms/bar, streaming {stream * 1e6:.2f} us/bar")
+
+
+if __name__ == "__main__":
+    bench_update_cost()
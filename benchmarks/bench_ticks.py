@@ -0,0 +1,69 @@
+"""
+Tick → bar pipeline throughput (replay file and in-memory). Parity with pandas
+resample + IndicatorBatch is covered by tests/test_ticks.py.
+
+    python -m benchmarks.bench_ticks
+"""
+import asyncio
+import csv
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.ticks import ReplayTickSource, Tick, TickPipeline
+
+N_TICKS = int(os.getenv("TICKS", "200000"))
+SYMBOLS = ("BTC", "ETH")
+INTERVALS = ("1m", "5m", "15m")
+
+
+def synthetic_ticks(n: int, seed: int = 11):
+    # ~2 ticks/s, irregular spacing, दोनों सिंबल बारी-बारी
+    rng = np.random.default_rng(seed)
+    ts = 1_700_000_000 + np.cumsum(rng.exponential(0.5, n))
+    symbols = np.array(SYMBOLS)[rng.integers(0, len(SYMBOLS), n)]
+    price = np.where(symbols == "BTC", 62000.0, 3000.0) * np.exp(np.cumsum(rng.normal(0, 2e-4, n)))
+    volume = rng.exponential(0.3, n)
+    return symbols, ts, price, volume
+
+
+def write_replay(path: str, symbols, ts, price, volume) -> None:
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["symbol", "ts", "price", "volume"])
+        writer.writerows(zip(symbols, ts.round(3), price.round(4), volume.round(6)))
+
+
+def throughput(symbols, ts, price, volume) -> None:
+    ticks = [Tick(s, t, p, v) for s, t, p, v in zip(symbols.tolist(), ts.tolist(), price.tolist(), volume.tolist())]
+    pipeline = TickPipeline(ReplayTickSource(""), intervals=INTERVALS, capacity=500)
+
+    async def feed():
+        for tick in ticks:
+            await pipeline.process(tick)
+
+    t0 = time.perf_counter()
+    asyncio.run(feed())
+    elapsed = time.perf_counter() - t0
+    print(f"in-memory: {len(ticks) / elapsed:,.0f} ticks/s ({elapsed / len(ticks) * 1e6:.2f}µs/tick, "
+          f"{len(INTERVALS)} timeframes, {pipeline.bars_closed} bars closed, {pipeline.alerts} alerts)")
+
+
+def main() -> None:
+    symbols, ts, price, volume = synthetic_ticks(N_TICKS)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ticks.csv")
+        write_replay(path, symbols, ts, price, volume)
+        print(f"{N_TICKS} ticks, {len(SYMBOLS)} symbols → {', '.join(INTERVALS)}")
+
+        t0 = time.perf_counter()
+        pipeline = TickPipeline(ReplayTickSource(path), intervals=INTERVALS)
+        asyncio.run(pipeline.run())
+        print(f"replay file: {N_TICKS / (time.perf_counter() - t0):,.0f} ticks/s (incl. CSV parsing)")
+    throughput(symbols, ts, price, volume)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Cross-sectional watchlist scan: scan time vs symbol count (synthetic bars, no network).
+
+    python -m benchmarks.bench_watchlist
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.scanner import SIGNAL_SPECS, align_bars, evaluate_signals
+from technical import IndicatorBatch
+
+
+def synthetic_watchlist(n_symbols: int, n_bars: int = 480, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=n_bars, freq="15min")
+    columns = [f"SYM{i:03d}.NS" for i in range(n_symbols)]
+    close = 1000 + np.cumsum(rng.normal(0, 2, (n_bars, n_symbols)), axis=0)
+    volume = rng.uniform(1e3, 1e5, (n_bars, n_symbols))
+    # आधे सिंबल्स का डेटा देर से शुरू - अलग-अलग लंबाई की हिस्ट्री
+    close[: n_bars // 4, ::2] = np.nan
+    return pd.DataFrame(close, index, columns), pd.DataFrame(volume, index, columns)
+
+
+def per_symbol_loop(close: pd.DataFrame, volume: pd.DataFrame) -> int:
+    hits = 0
+    for sym in close.columns:
+        frame = pd.DataFrame({'Close': close[sym], 'Volume': volume[sym]}).dropna()
+        ind = IndicatorBatch(frame).compute(SIGNAL_SPECS).iloc[-1]
+        last = frame.iloc[-1]
+        hits += bool(last['Close'] > ind['EMA20'] and last['Volume'] > ind['Volume_MA'])
+    return hits
+
+
+def main() -> None:
+    print(f"{'symbols':>8} {'vectorized':>11} {'per-symbol':>11} {'signals':>8}")
+    for n in (10, 50, 100, 250, 500):
+        close, volume = synthetic_watchlist(n)
+
+        t0 = time.perf_counter()
+        close_2d, volume_2d, kept = align_bars(close, volume)
+        signals = evaluate_signals(close_2d, volume_2d, kept)
+        t_vec = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        per_symbol_loop(close, volume)
+        t_loop = time.perf_counter() - t0
+
+        print(f"{n:>8} {t_vec * 1e3:>9.2f}ms {t_loop * 1e3:>9.1f}ms {len(signals):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,76 +1,490 @@
-import yfinance as yf
+import asyncio
+import importlib.util
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
 
-try:
-    from py_vollib.black_scholes import black_scholes
-    from py_vollib.black_scholes.greeks.analytical import delta, gamma, theta, vega, rho
-    vollib_available = True
-except ImportError:
-    vollib_available = False
+from src.bar_store import bar_store
+from src.cache import market_cache
+from src.metrics import timed
+from src.providers import DEFAULT_MAX_WORKERS, OptionChain
+from src.symbols import symbol_registry
+
+# py_vollib वैकल्पिक है (सिर्फ बेंचमार्क में तुलना के लिए); यहाँ सिर्फ उपलब्धता जाँचें
+vollib_available = importlib.util.find_spec("py_vollib") is not None
 
-# लॉगिंग सेटअप
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# ---------------- NumPy Black-Scholes इंजन ----------------
+# पूरे स्ट्राइक arrays पर एक साथ price + ग्रीक्स; यूनिट्स py_vollib जैसी
+# (theta प्रति दिन, vega प्रति 1% IV, rho प्रति 1% रेट)
+
+def norm_pdf(x):
+    return np.exp(-0.5 * x * x) / np.sqrt(2 * np.pi)
+
+
+def norm_cdf(x):
+    """
+    स्टैंडर्ड नॉर्मल CDF (Hart 1968 / West) - डबल प्रिसिज़न, scipy के बिना
+    """
+    x = np.asarray(x, dtype=float)
+    xabs = np.abs(x)
+    exponential = np.exp(-0.5 * xabs * xabs)
+
+    num = 3.52624965998911e-02 * xabs + 0.700383064443688
+    for coef in (6.37396220353165, 33.912866078383, 112.079291497871,
+                 221.213596169931, 220.206867912376):
+        num = num * xabs + coef
+    den = 8.83883476483184e-02 * xabs + 1.75566716318264
+    for coef in (16.064177579207, 86.7807322029461, 296.564248779674,
+                 637.333633378831, 793.826512519948, 440.413735824752):
+        den = den * xabs + coef
+    small = exponential * num / den
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frac = xabs + 0.65
+        for coef in (4., 3., 2., 1.):
+            frac = xabs + coef / frac
+        large = exponential / frac / 2.506628274631
+
+    tail = np.where(xabs < 7.07106781186547, small, large)
+    tail = np.where(xabs > 37, 0., tail)
+    return np.where(x > 0, 1. - tail, tail)
+
+
+def _is_call(option_type):
+    flags = np.char.lower(np.asarray(option_type, dtype=str))
+    is_call = np.char.startswith(flags, 'c')
+    if not np.all(is_call | np.char.startswith(flags, 'p')):
+        raise ValueError("ऑप्शन टाइप 'c'/'p' (या CE/PE) होना चाहिए")
+    return is_call
+
+
+def black_scholes_greeks(S, K, T, r, sigma, option_type='c'):
+    """
+    वेक्टराइज़्ड Black-Scholes: price, delta, gamma, theta, vega, rho के flat arrays
+    S, K, T, sigma, option_type सब broadcast होते हैं; sigma/T <= 0 पर NaN
+    """
+    S, K, T, sigma = (np.asarray(x, dtype=float) for x in (S, K, T, sigma))
+    is_call = _is_call(option_type)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        valid = (sigma > 0) & (T > 0) & (S > 0) & (K > 0)
+        sqrt_t = np.sqrt(np.where(T > 0, T, np.nan))
+        vol = np.where(valid, sigma, np.nan)
+        d1 = (np.log(S / K) + (r + 0.5 * vol * vol) * T) / (vol * sqrt_t)
+        d2 = d1 - vol * sqrt_t
+
+        discount = K * np.exp(-r * T)
+        pdf_d1 = norm_pdf(d1)
+        sign = np.where(is_call, 1., -1.)
+        cdf_d1 = norm_cdf(sign * d1)
+        cdf_d2 = norm_cdf(sign * d2)
+
+        price = sign * (S * cdf_d1 - discount * cdf_d2)
+        delta_ = sign * cdf_d1
+        gamma_ = pdf_d1 / (S * vol * sqrt_t)
+        theta_ = (-S * pdf_d1 * vol / (2 * sqrt_t) - sign * r * discount * cdf_d2) / 365.
+        vega_ = S * pdf_d1 * sqrt_t * 0.01
+        rho_ = sign * T * discount * cdf_d2 * 0.01
+
+    return {
+        'price': price,
+        'delta': delta_,
+        'gamma': gamma_,
+        'theta': theta_,
+        'vega': vega_,
+        'rho': rho_
+    }
+
+
+def _bs_price_vega(S, K, T, r, sigma, sign):
+    # IV सॉल्वर के लिए सिर्फ price और raw vega (∂price/∂σ)
+    sqrt_t = np.sqrt(T)
+    d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    price = sign * (S * norm_cdf(sign * d1) - K * np.exp(-r * T) * norm_cdf(sign * d2))
+    return price, S * norm_pdf(d1) * sqrt_t
+
+
+def implied_volatility(price, S, K, T, r, option_type='c',
+                       tol=1e-6, max_iter=100, low=1e-4, high=5.0):
+    """
+    पूरी चेन के लिए IV एक साथ - वेक्टराइज़्ड Newton स्टेप्स, bracket से बाहर जाने पर bisection
+    हर स्ट्राइक का अपना convergence mask; हल न मिले (आर्बिट्राज बाउंड्स से बाहर) तो NaN
+    """
+    price, S, K, T = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (price, S, K, T)))
+    sign = np.broadcast_to(np.where(_is_call(option_type), 1., -1.), price.shape)
+    shape = price.shape
+    price, S, K, T, sign = (np.ravel(x) for x in (price, S, K, T, sign))
+
+    iv = np.full(price.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        discount = K * np.exp(-r * T)
+        intrinsic = np.maximum(sign * (S - discount), 0.)
+        upper = np.where(sign > 0, S, discount)
+        solvable = (T > 0) & (S > 0) & (K > 0) & (price > intrinsic) & (price < upper)
+
+        idx = np.flatnonzero(solvable)
+        lo = np.full(idx.size, low)
+        hi = np.full(idx.size, high)
+        # Brenner-Subrahmanyam शुरुआती अनुमान
+        sigma = np.clip(np.sqrt(2 * np.pi / T[idx]) * price[idx] / S[idx], low, high)
+
+        for _ in range(max_iter):
+            if idx.size == 0:
+                break
+            model, vega_ = _bs_price_vega(S[idx], K[idx], T[idx], r, sigma, sign[idx])
+            diff = model - price[idx]
+
+            done = np.abs(diff) < tol
+            iv[idx[done]] = sigma[done]
+
+            hi = np.where(diff > 0, sigma, hi)
+            lo = np.where(diff < 0, sigma, lo)
+            newton = sigma - diff / vega_
+            bisect = ~((newton > lo) & (newton < hi)) | ~np.isfinite(newton)
+            sigma = np.where(bisect, 0.5 * (lo + hi), newton)
+
+            # bracket सिकुड़ गया तो σ पहले से सटीक है
+            collapsed = ~done & (hi - lo <= 1e-12)
+            iv[idx[collapsed]] = sigma[collapsed]
+
+            active = ~done & ~collapsed
+            idx, lo, hi, sigma = idx[active], lo[active], hi[active], sigma[active]
+
+    return iv.reshape(shape)
+
+
+# ---------------- मल्टी-एक्सपायरी कॉलमनर चेन ----------------
+# सभी एक्सपायरी की calls+puts एक ही flat arrays में; summary सिर्फ array/groupby ops से
+
+CHAIN_FIELDS = {
+    'strike': 'strike', 'open_interest': 'openInterest', 'volume': 'volume',
+    'last_price': 'lastPrice', 'bid': 'bid', 'ask': 'ask', 'iv': 'impliedVolatility',
+}
+
+
+def stack_chains(chains):
+    """
+    [(expiry_index, chain), ...] → {'expiry', 'is_call', 'strike', 'open_interest', ...} flat arrays
+    """
+    parts = {name: [] for name in ('expiry', 'is_call') + tuple(CHAIN_FIELDS)}
+    for expiry_index, chain in chains:
+        for frame, is_call in ((chain.calls, True), (chain.puts, False)):
+            n = len(frame)
+            parts['expiry'].append(np.full(n, expiry_index, dtype=np.int32))
+            parts['is_call'].append(np.full(n, is_call))
+            for name, column in CHAIN_FIELDS.items():
+                values = (frame[column].to_numpy(dtype=float, na_value=np.nan) if column in frame
+                          else np.full(n, np.nan))
+                if name in ('open_interest', 'volume'):
+                    values = np.nan_to_num(values)
+                parts[name].append(values)
+    return {
+        name: np.concatenate(values) if values else np.empty(0, dtype=np.int32 if name == 'expiry' else float)
+        for name, values in parts.items()
+    }
+
+
+def _segment_argmin(values, seg_id, seg_start):
+    # हर सेगमेंट (एक्सपायरी) में सबसे छोटी वैल्यू की पोज़िशन - एक lexsort, कोई Python लूप नहीं
+    return np.lexsort((values, seg_id))[seg_start]
+
+
+def summarize_chains(columns, spot, n_expiries, walls=3):
+    """
+    stacked चेन → हर एक्सपायरी का PCR, max pain (O(n), n×n मैट्रिक्स नहीं), OI walls, ATM IV और OTM स्माइल (smile_offsets से बंटे)
+    """
+    e, call, k = columns['expiry'], columns['is_call'], columns['strike']
+    oi, volume, iv = columns['open_interest'], columns['volume'], columns['iv']
+    put = ~call
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        call_oi = np.bincount(e, weights=np.where(call, oi, 0.), minlength=n_expiries)
+        put_oi = np.bincount(e, weights=np.where(put, oi, 0.), minlength=n_expiries)
+        call_volume = np.bincount(e, weights=np.where(call, volume, 0.), minlength=n_expiries)
+        put_volume = np.bincount(e, weights=np.where(put, volume, 0.), minlength=n_expiries)
+        summary = {
+            'call_oi': call_oi,
+            'put_oi': put_oi,
+            'pcr_oi': np.where(call_oi > 0, put_oi / call_oi, np.nan),
+            'pcr_volume': np.where(call_volume > 0, put_volume / call_volume, np.nan),
+        }
+
+        # (expiry, strike) ग्रुप्स - expiry फिर strike के क्रम में
+        order = np.lexsort((k, e))
+        e_s, k_s, call_s = e[order], k[order], call[order]
+        new_group = np.r_[True, (e_s[1:] != e_s[:-1]) | (k_s[1:] != k_s[:-1])] if e_s.size else np.empty(0, bool)
+        group = np.cumsum(new_group) - 1
+        g_exp, g_strike = e_s[new_group], k_s[new_group]
+        n_groups = g_strike.size
+
+        C = np.bincount(group, weights=np.where(call_s, oi[order], 0.), minlength=n_groups)
+        P = np.bincount(group, weights=np.where(call_s, 0., oi[order]), minlength=n_groups)
+        iv_s = iv[order]
+        iv_ok = np.isfinite(iv_s) & (iv_s > 0)
+        call_iv = (np.bincount(group, weights=np.where(call_s & iv_ok, iv_s, 0.), minlength=n_groups)
+                   / np.bincount(group, weights=call_s & iv_ok, minlength=n_groups))
+        put_iv = (np.bincount(group, weights=np.where(~call_s & iv_ok, iv_s, 0.), minlength=n_groups)
+                  / np.bincount(group, weights=~call_s & iv_ok, minlength=n_groups))
+
+        new_seg = np.r_[True, g_exp[1:] != g_exp[:-1]] if n_groups else np.empty(0, bool)
+        seg_start = np.flatnonzero(new_seg)
+        seg_id = np.cumsum(new_seg) - 1
+        present = g_exp[seg_start]
+
+        def seg_cumsum(x):
+            c = np.cumsum(x)
+            return c - np.r_[0., c][seg_start][seg_id]
+
+        def seg_total(x):
+            return np.add.reduceat(x, seg_start)[seg_id] if n_groups else x
+
+        # settlement K_j पर payout: calls (K_i < K_j) + puts (K_i > K_j)
+        K = g_strike
+        cum_c, cum_ck = seg_cumsum(C), seg_cumsum(C * K)
+        cum_p, cum_pk = seg_cumsum(P), seg_cumsum(P * K)
+        pain = (K * cum_c - cum_ck) + (seg_total(P * K) - (cum_pk - P * K)) - K * (seg_total(P) - (cum_p - P))
+
+        max_pain = np.full(n_expiries, np.nan)
+        if n_groups:
+            max_pain[present] = K[_segment_argmin(pain, seg_id, seg_start)]
+        summary['max_pain'] = max_pain
+
+        rank_in_seg = np.arange(n_groups) - seg_start[seg_id] if n_groups else np.empty(0, int)
+        for side, side_oi, total in (('call', C, call_oi), ('put', P, put_oi)):
+            strikes = np.full((n_expiries, walls), np.nan)
+            wall_oi = np.zeros((n_expiries, walls))
+            ranked = np.lexsort((-side_oi, seg_id))
+            take = (rank_in_seg < walls) & (side_oi[ranked] > 0)
+            rows = ranked[take]
+            strikes[g_exp[rows], rank_in_seg[take]] = K[rows]
+            wall_oi[g_exp[rows], rank_in_seg[take]] = side_oi[rows]
+            summary[f'{side}_walls'] = strikes
+            summary[f'{side}_wall_oi'] = wall_oi
+            summary[f'{side}_wall_share'] = np.where(total > 0, wall_oi.sum(axis=1) / total, np.nan)
+
+        # OTM स्माइल: spot से नीचे puts, ऊपर calls; एक साइड न हो तो दूसरी
+        otm_iv = np.where(K < spot, put_iv, call_iv)
+        otm_iv = np.where(np.isnan(otm_iv), np.where(K < spot, call_iv, put_iv), otm_iv)
+        atm_iv = np.full(n_expiries, np.nan)
+        if n_groups:
+            atm_iv[present] = otm_iv[_segment_argmin(np.abs(K - spot), seg_id, seg_start)]
+        summary['atm_iv'] = atm_iv
+        summary['smile_offsets'] = np.r_[0, np.cumsum(np.bincount(g_exp, minlength=n_expiries))]
+        summary['smile_strike'] = K
+        summary['smile_moneyness'] = np.log(K / spot)
+        summary['smile_iv'] = otm_iv
+    return summary
+
+
+def _plain_chain(chain):
+    # yfinance Options(calls, puts, underlying) → OptionChain: कैश में सिर्फ DataFrames (साइज़ सही गिना जाए)
+    return OptionChain(chain.calls, chain.puts)
+
+
 class OptionAnalyzer:
     def __init__(self, symbol='BANKNIFTY', risk_free_rate=0.06):
-        self.symbol = f"{symbol}.NS"
+        # BANKNIFTY → ^NSEBANK वगैरह रजिस्ट्री से; अनजान नाम NSE स्टॉक माने जाते हैं (.NS)
+        self.instrument = symbol_registry.resolve(symbol)
+        self.symbol = symbol_registry.to_yahoo(symbol)
+        self.lot_size = self.instrument.lot_size if self.instrument else None
         self.risk_free_rate = risk_free_rate
         self.ticker = None
         self.spot_price = 0
         self.expiry_dates = []
 
+    @timed("options.fetch_option_chain", none_is_error=True)
     def fetch_option_chain(self, expiry_index=0):
         try:
+            import yfinance as yf
+
             self.ticker = yf.Ticker(self.symbol)
-            hist = self.ticker.history(period="1d")
+            self._load_spot_and_expiries()
+
+            selected_expiry = self.expiry_dates[expiry_index]
+            chain = market_cache.get_or_fetch(
+                ("option_chain", self.symbol, None, selected_expiry),
+                lambda: _plain_chain(self.ticker.option_chain(selected_expiry))
+            )
+            return self._chain_result(selected_expiry, chain)
+
+        except Exception as e:
+            logger.error(f"ऑप्शन चेन फेच करने में त्रुटि: {str(e)}")
+            print("Error:", str(e))
+            return None
+
+    def _load_spot_and_expiries(self):
+        # 1m बार स्टोर से (incremental sync); स्पॉट सिर्फ अगले मिनट तक कैश रहता है
+        hist = market_cache.get_or_fetch(
+            ("store", self.symbol, "1m", 1),
+            lambda: bar_store.load(self.symbol, "1m", tail=1)
+        )
+        if hist.empty:
+            raise ValueError("कोई मार्केट डेटा उपलब्ध नहीं")
+        self.spot_price = hist['Close'].iloc[-1]
+        self.expiry_dates = market_cache.get_or_fetch(
+            ("expiries", self.symbol, "1d"), lambda: tuple(self.ticker.options)
+        )
+        if not self.expiry_dates:
+            raise ValueError("कोई एक्सपायरी डेट उपलब्ध नहीं")
+
+    def _load_chain(self, expiry):
+        try:
+            return market_cache.get_or_fetch(
+                ("option_chain", self.symbol, None, expiry),
+                lambda: _plain_chain(self.ticker.option_chain(expiry))
+            )
+        except Exception as e:
+            logger.error(f"{expiry} की ऑप्शन चेन फेच करने में त्रुटि: {str(e)}")
+            return None
+
+    @timed("options.fetch_all_expiries", none_is_error=True)
+    def fetch_all_expiries(self, max_expiries=None):
+        """
+        सभी (या पहली max_expiries) एक्सपायरी की चेन एक साथ (thread pool) → एक कॉलमनर structure
+        """
+        try:
+            import yfinance as yf
+
+            self.ticker = yf.Ticker(self.symbol)
+            self._load_spot_and_expiries()
+            expiries = tuple(self.expiry_dates[:max_expiries])
+            # अपना छोटा pool: यह मेथड खुद shared executor के अंदर चल सकता है (deadlock से बचाव)
+            with ThreadPoolExecutor(max_workers=max(1, min(len(expiries), DEFAULT_MAX_WORKERS))) as pool:
+                chains = list(pool.map(self._load_chain, expiries))
+            return self._stacked_result(expiries, chains)
+
+        except Exception as e:
+            logger.error(f"ऑप्शन चेन फेच करने में त्रुटि: {str(e)}")
+            return None
+
+    @timed("options.fetch_all_expiries_async", none_is_error=True)
+    async def fetch_all_expiries_async(self, market, max_expiries=None):
+        try:
+            hist = await market.history(self.symbol, period="1d", interval="1m")
             if hist.empty:
                 raise ValueError("कोई मार्केट डेटा उपलब्ध नहीं")
             self.spot_price = hist['Close'].iloc[-1]
-            self.expiry_dates = self.ticker.options
-
+            self.expiry_dates = await market.expiries(self.symbol)
             if not self.expiry_dates:
                 raise ValueError("कोई एक्सपायरी डेट उपलब्ध नहीं")
 
-            selected_expiry = self.expiry_dates[expiry_index]
-            chain = self.ticker.option_chain(selected_expiry)
+            expiries = tuple(self.expiry_dates[:max_expiries])
+            results = await asyncio.gather(
+                *(market.option_chain(self.symbol, expiry) for expiry in expiries), return_exceptions=True
+            )
+            chains = []
+            for expiry, result in zip(expiries, results):
+                if isinstance(result, Exception):
+                    logger.error(f"{expiry} की ऑप्शन चेन फेच करने में त्रुटि: {str(result)}")
+                    result = None
+                chains.append(result)
+            return self._stacked_result(expiries, chains)
+
+        except Exception as e:
+            logger.error(f"ऑप्शन चेन फेच करने में त्रुटि: {str(e)}")
+            return None
+
+    def _stacked_result(self, expiries, chains):
+        loaded = [(i, chain) for i, chain in enumerate(chains) if chain is not None]
+        if not loaded:
+            raise ValueError("किसी भी एक्सपायरी की चेन नहीं मिली")
+        return {
+            'spot': round(float(self.spot_price), 2),
+            'expiries': expiries,
+            'time_to_expiry': np.array([self.get_time_to_expiry(expiry) for expiry in expiries]),
+            'columns': stack_chains(loaded),
+        }
+
+    def solve_stacked_iv(self, stacked):
+        """yfinance IV की जगह mid (या lastPrice) से IV - सभी एक्सपायरी एक वेक्टराइज़्ड कॉल में"""
+        columns = stacked['columns']
+        price = columns['last_price']
+        bid, ask = columns['bid'], columns['ask']
+        price = np.where((bid > 0) & (ask >= bid), 0.5 * (bid + ask), price)
+        columns['iv'] = implied_volatility(
+            price, stacked['spot'], columns['strike'], stacked['time_to_expiry'][columns['expiry']],
+            self.risk_free_rate, np.where(columns['is_call'], 'c', 'p')
+        )
+        return stacked
+
+    def _summarize(self, stacked, walls=3, solve_iv=False):
+        if solve_iv:
+            self.solve_stacked_iv(stacked)
+        summary = summarize_chains(stacked['columns'], stacked['spot'], len(stacked['expiries']), walls)
+        summary.update(spot=stacked['spot'], expiries=stacked['expiries'],
+                       time_to_expiry=stacked['time_to_expiry'])
+        return summary
+
+    @timed("options.summarize_expiries")
+    def summarize_expiries(self, max_expiries=None, walls=3, solve_iv=False):
+        """
+        PCR, max pain, OI walls, IV smile - हर एक्सपायरी के लिए arrays (index = expiries का क्रम)
+        """
+        stacked = self.fetch_all_expiries(max_expiries)
+        if not stacked:
+            return None
+        return self._summarize(stacked, walls, solve_iv)
+
+    @timed("options.summarize_expiries_async")
+    async def summarize_expiries_async(self, market, max_expiries=None, walls=3, solve_iv=False):
+        stacked = await self.fetch_all_expiries_async(market, max_expiries)
+        if not stacked:
+            return None
+        return self._summarize(stacked, walls, solve_iv)
 
-            chain.calls['Type'] = 'CE'
-            chain.puts['Type'] = 'PE'
+    @timed("options.fetch_option_chain_async", none_is_error=True)
+    async def fetch_option_chain_async(self, market, expiry_index=0):
+        """
+        fetch_option_chain जैसा ही, पर yfinance कॉल्स AsyncMarketData के thread pool में
+        """
+        try:
+            hist = await market.history(self.symbol, period="1d", interval="1m")
+            if hist.empty:
+                raise ValueError("कोई मार्केट डेटा उपलब्ध नहीं")
+            self.spot_price = hist['Close'].iloc[-1]
+            self.expiry_dates = await market.expiries(self.symbol)
+
+            if not self.expiry_dates:
+                raise ValueError("कोई एक्सपायरी डेट उपलब्ध नहीं")
 
-            return {
-                'spot': round(self.spot_price, 2),
-                'expiry': selected_expiry,
-                'calls': chain.calls.reset_index(drop=True),
-                'puts': chain.puts.reset_index(drop=True)
-            }
+            selected_expiry = self.expiry_dates[expiry_index]
+            chain = await market.option_chain(self.symbol, selected_expiry)
+            return self._chain_result(selected_expiry, chain)
 
         except Exception as e:
             logger.error(f"ऑप्शन चेन फेच करने में त्रुटि: {str(e)}")
-            print("Error:", str(e))
             return None
 
+    def _chain_result(self, expiry, chain):
+        # कॉपी: साझा (coalesced) fetch के DataFrames में बदलाव न हो
+        calls = chain.calls.reset_index(drop=True)
+        puts = chain.puts.reset_index(drop=True)
+        calls['Type'] = 'CE'
+        puts['Type'] = 'PE'
+
+        return {
+            'spot': round(self.spot_price, 2),
+            'expiry': expiry,
+            'calls': calls,
+            'puts': puts
+        }
+
     def calculate_greeks(self, S, K, T, sigma, option_type='c'):
         try:
-            if not vollib_available:
-                return {"error": "py_vollib इंस्टॉल नहीं है"}
-
             if not all(isinstance(x, (int, float)) for x in [S, K, T, sigma]):
                 raise ValueError("सभी इनपुट नंबर्स होने चाहिए")
 
             if option_type.lower() not in ['c', 'p']:
                 raise ValueError("ऑप्शन टाइप 'c' या 'p' होना चाहिए")
 
-            return {
-                'delta': round(delta(option_type, S, K, T, self.risk_free_rate, sigma), 4),
-                'gamma': round(gamma(option_type, S, K, T, self.risk_free_rate, sigma), 4),
-                'theta': round(theta(option_type, S, K, T, self.risk_free_rate, sigma) / 365, 4),
-                'vega': round(vega(option_type, S, K, T, self.risk_free_rate, sigma) / 100, 4),
-                'rho': round(rho(option_type, S, K, T, self.risk_free_rate, sigma) / 100, 4)
-            }
+            # वही NumPy इंजन जो चेन पर चलता है - यूनिट्स पहले से प्रति दिन / प्रति 1%, दोबारा स्केल नहीं
+            greeks = black_scholes_greeks(S, K, T, self.risk_free_rate, sigma, option_type.lower())
+            return {name: round(float(greeks[name]), 4) for name in ('delta', 'gamma', 'theta', 'vega', 'rho')}
 
         except Exception as e:
             logger.error(f"ग्रीक्स कैलकुलेट करने में त्रुटि: {str(e)}")
@@ -83,24 +497,54 @@ class OptionAnalyzer:
         days = delta.total_seconds() / (3600 * 24)
         return max(days / 365, 1 / 365)
 
-    def analyze_chain(self, expiry_index=0):
+    def fill_implied_volatility(self, df, S, T, option_type='c', column='iv'):
+        """
+        yfinance के impliedVolatility की जगह mid (या bid/ask न हो तो lastPrice) से IV निकालें
+        """
+        price = df['lastPrice'].to_numpy(dtype=float)
+        if 'bid' in df and 'ask' in df:
+            bid = df['bid'].to_numpy(dtype=float)
+            ask = df['ask'].to_numpy(dtype=float)
+            price = np.where((bid > 0) & (ask >= bid), 0.5 * (bid + ask), price)
+
+        df[column] = implied_volatility(
+            price, S, df['strike'].to_numpy(dtype=float), T, self.risk_free_rate, option_type
+        )
+        return df
+
+    @timed("options.analyze_chain")
+    def analyze_chain(self, expiry_index=0, solve_iv=False, as_records=True):
         chain_data = self.fetch_option_chain(expiry_index)
         if not chain_data:
             return None
+        return self._analyze(chain_data, solve_iv, as_records)
 
+    @timed("options.analyze_chain_async")
+    async def analyze_chain_async(self, market, expiry_index=0, solve_iv=False, as_records=True):
+        chain_data = await self.fetch_option_chain_async(market, expiry_index)
+        if not chain_data:
+            return None
+        return self._analyze(chain_data, solve_iv, as_records)
+
+    def _analyze(self, chain_data, solve_iv=False, as_records=True):
         T = self.get_time_to_expiry(chain_data['expiry'])
         S = chain_data['spot']
 
-        for idx, row in chain_data['calls'].iterrows():
-            chain_data['calls'].loc[idx, 'Greeks'] = self.calculate_greeks(
-                S, row['strike'], T, row['impliedVolatility'], 'c'
-            )
-
-        for idx, row in chain_data['puts'].iterrows():
-            chain_data['puts'].loc[idx, 'Greeks'] = self.calculate_greeks(
-                S, row['strike'], T, row['impliedVolatility'], 'p'
+        # पूरी चेन एक बार में - हर ग्रीक अलग flat कॉलम
+        for side, flag in (('calls', 'c'), ('puts', 'p')):
+            df = chain_data[side]
+            if solve_iv:
+                self.fill_implied_volatility(df, S, T, flag)
+            sigma = df['iv' if solve_iv else 'impliedVolatility'].to_numpy(dtype=float)
+            greeks = black_scholes_greeks(
+                S, df['strike'].to_numpy(dtype=float), T, self.risk_free_rate, sigma, flag
             )
+            df['theoretical_price'] = np.round(greeks.pop('price'), 2)
+            for name, values in greeks.items():
+                df[name] = np.round(values, 4)
 
+        if not as_records:  # DataFrames वैसे ही (बॉट/एनालिटिक्स के लिए, to_dict का खर्च नहीं)
+            return chain_data
         return {
             "spot": S,
             "expiry": chain_data["expiry"],
@@ -112,7 +556,7 @@ class OptionAnalyzer:
 # उदाहरण
 if __name__ == "__main__":
     analyzer = OptionAnalyzer("BANKNIFTY")
-    full_chain = analyzer.analyze_chain()
+    full_chain = analyzer.analyze_chain(solve_iv=True)
 
     greeks = analyzer.calculate_greeks(
         S=45000,
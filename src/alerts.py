@@ -0,0 +1,220 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# इन पर retry का कोई फायदा नहीं (PTB exception नाम)
+PERMANENT_ERRORS = ('BadRequest', 'Forbidden', 'InvalidToken', 'ChatMigrated')
+
+
+class TokenBucket:
+    """
+    🪣 `rate` tokens per second, bursts up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 timer: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.timer = timer
+        self.updated = timer()
+
+    def _refill(self) -> None:
+        now = self.timer()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """
+        Take a token now and return 0, or return how long until one is available.
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def refund(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    async def acquire(self) -> float:
+        waited = 0.0
+        while True:
+            wait = self.delay()
+            if wait == 0:
+                return waited
+            waited += wait
+            await asyncio.sleep(wait)
+
+
+class _Alert:
+    __slots__ = ('chat_id', 'text', 'enqueued', 'attempts', 'key')
+
+    def __init__(self, chat_id: str, text: str, enqueued: float, key: bytes):
+        self.chat_id = chat_id
+        self.text = text
+        self.enqueued = enqueued
+        self.attempts = 0
+        self.key = key
+
+
+class AlertDispatcher:
+    """
+    📨 Queue-based Telegram alert fan-out.
+
+    - `publish()` never blocks the caller (scanners); a full queue drops and counts
+    - workers respect a global token bucket (25 msg/s) and one per chat (0.9 msg/s),
+      just under Telegram's 30/s and 1/s
+    - 429s pause every worker for `retry_after`; other transient errors back off and retry
+    - identical (chat, dedupe_key or text) alerts within `dedupe_window` seconds are sent once;
+      an alert dropped on a full queue or failed for good doesn't block a resend
+    """
+
+    def __init__(self, send: Callable[[str, str], Awaitable[object]], workers: int = 4,
+                 max_queue: int = 1000, global_rate: float = 25.0, per_chat_rate: float = 0.9,
+                 dedupe_window: float = 300.0, max_retries: int = 5):
+        self.send = send
+        self.workers = workers
+        self.max_queue = max_queue
+        self.per_chat_rate = per_chat_rate
+        self.dedupe_window = dedupe_window
+        self.max_retries = max_retries
+        # burst 1: sliding 1s विंडो में भी global_rate से ज़्यादा न जाएँ
+        self.global_bucket = TokenBucket(global_rate, 1)
+        self.chat_buckets: Dict[str, TokenBucket] = {}
+        self._recent: "OrderedDict[bytes, float]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list = []
+        self._paused_until = 0.0
+        self.stats = {
+            'published': 0, 'sent': 0, 'failed': 0, 'retried': 0, 'rate_limited': 0,
+            'deduplicated': 0, 'dropped': 0, 'max_depth': 0, 'max_wait': 0.0, 'total_wait': 0.0,
+        }
+
+    # ---------------- producer side ----------------
+    def _dedupe_key(self, chat_id: str, text: str, now: float) -> Optional[bytes]:
+        """Key for a new alert, or None if the same alert is already in the window."""
+        while self._recent:
+            seen = next(iter(self._recent.values()))
+            if now - seen < self.dedupe_window:
+                break
+            self._recent.popitem(last=False)
+        key = hashlib.blake2b(f"{chat_id}\0{text}".encode(), digest_size=16).digest()
+        return None if key in self._recent else key
+
+    def publish(self, text: str, chat_ids: Iterable[str], dedupe_key: Optional[str] = None) -> int:
+        """
+        Queue `text` for every chat; returns how many were queued.
+        `dedupe_key` (default: `text`) - e.g. the raw signal, when `text` carries a timestamp.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        now = time.monotonic()
+        queued = 0
+        for chat_id in chat_ids:
+            chat_id = str(chat_id)
+            self.stats['published'] += 1
+            key = self._dedupe_key(chat_id, text if dedupe_key is None else dedupe_key, now)
+            if key is None:
+                self.stats['deduplicated'] += 1
+                continue
+            try:
+                self._queue.put_nowait(_Alert(chat_id, text, now, key))
+                # सिर्फ queue में जाने के बाद ही dedupe विंडो में
+                self._recent[key] = now
+                queued += 1
+            except asyncio.QueueFull:
+                self.stats['dropped'] += 1
+                logger.warning("Alert queue full, dropping alert for %s", chat_id)
+        self.stats['max_depth'] = max(self.stats['max_depth'], self._queue.qsize())
+        return queued
+
+    # ---------------- consumer side ----------------
+    def start(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        if self._queue is not None and self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Alert queue not drained, %d alerts left", self._queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self) -> None:
+        while True:
+            alert = await self._queue.get()
+            try:
+                await self._deliver(alert)
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, alert: _Alert) -> None:
+        bucket = self.chat_buckets.get(alert.chat_id)
+        if bucket is None:
+            bucket = self.chat_buckets[alert.chat_id] = TokenBucket(self.per_chat_rate, 1)
+
+        while True:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            # दोनों टोकन एक ही पल में: chat टोकन लेकर global पर रुकें तो उसी chat का
+            # अगला अलर्ट (दूसरा worker) पहले निकल सकता है - 429
+            await bucket.acquire()
+            wait = self.global_bucket.delay()
+            if wait > 0:
+                bucket.refund()
+                await asyncio.sleep(wait)
+                continue
+
+            alert.attempts += 1
+            try:
+                await self.send(alert.chat_id, alert.text)
+            except Exception as e:
+                permanent = getattr(e, 'permanent', type(e).__name__ in PERMANENT_ERRORS)
+                if permanent or alert.attempts > self.max_retries:
+                    self.stats['failed'] += 1
+                    # भेजा ही नहीं गया - अगला वही अलर्ट दबाया न जाए
+                    self._recent.pop(alert.key, None)
+                    logger.error("Alert to %s failed after %d attempts: %s", alert.chat_id, alert.attempts, e)
+                    return
+
+                self.stats['retried'] += 1
+                retry_after = getattr(e, 'retry_after', None)
+                if retry_after is not None:
+                    # 429: पूरा बॉट रुकता है, सभी workers को रोकें
+                    self.stats['rate_limited'] += 1
+                    if hasattr(retry_after, 'total_seconds'):
+                        retry_after = retry_after.total_seconds()
+                    self._paused_until = max(self._paused_until, time.monotonic() + float(retry_after))
+                else:
+                    await asyncio.sleep(min(2 ** alert.attempts, 30))
+                continue
+
+            wait = time.monotonic() - alert.enqueued
+            self.stats['sent'] += 1
+            self.stats['total_wait'] += wait
+            self.stats['max_wait'] = max(self.stats['max_wait'], wait)
+            return
+
+    def metrics(self) -> dict:
+        sent = self.stats['sent']
+        return dict(
+            self.stats,
+            depth=self._queue.qsize() if self._queue is not None else 0,
+            avg_wait=round(self.stats['total_wait'] / sent, 3) if sent else 0.0,
+            max_wait=round(self.stats['max_wait'], 3),
+            total_wait=round(self.stats['total_wait'], 3),
+            paused_for=round(max(self._paused_until - time.monotonic(), 0.0), 3),
+        )
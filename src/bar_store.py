@@ -0,0 +1,214 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.cache import INTERVAL_SECONDS
+from src.metrics import timed
+
+try:
+    import fcntl
+except ImportError:  # Windows: सिर्फ इन-प्रोसेस lock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+DEFAULT_ROOT = os.getenv("BAR_STORE_DIR", os.path.join("data", "bars"))
+
+# पहली बार (खाली स्टोर) कितनी हिस्ट्री लाएँ - yfinance की intraday सीमाओं के अंदर
+INITIAL_PERIOD = {'1m': '5d', '5m': '1mo', '15m': '1mo', '30m': '1mo', '1h': '6mo', '1d': '5y'}
+
+
+class BarStore:
+    """
+    💾 Local columnar bar store: one flat binary file per field per (symbol, interval)
+
+        <root>/<interval>/<symbol>/timestamp.i8   (UTC, int64 ns)
+        <root>/<interval>/<symbol>/close.f8 ...   (float64)
+
+    Reads are np.memmap views (zero-copy) that go straight into TechnicalAnalysis /
+    IndicatorBatch. Only closed bars are stored, and a re-fetched bar that hasn't
+    changed is skipped, so a normal sync is a pure append. Stored bytes are never
+    modified under a live map: if yfinance revises stored bars, a new file is
+    written and `os.replace`d, so earlier views keep the old data. Field files are
+    committed before the timestamp file, so the timestamp length is the committed
+    row count after a crash. Writers are serialised across processes with an flock.
+    """
+
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, symbol.upper().replace('/', '_'))
+
+    def _path(self, symbol: str, interval: str, field: str) -> str:
+        suffix = 'i8' if field == 'timestamp' else 'f8'
+        return os.path.join(self._dir(symbol, interval), f"{field}.{suffix}")
+
+    def length(self, symbol: str, interval: str) -> int:
+        path = self._path(symbol, interval, 'timestamp')
+        return os.path.getsize(path) // 8 if os.path.exists(path) else 0
+
+    def read(self, symbol: str, interval: str, tail: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Zero-copy arrays: {'timestamp': int64 ns, 'open'..'volume': float64}
+        """
+        arrays = {}
+        # lock: length और सभी फ़ील्ड फ़ाइलें एक ही commit की हों
+        with self._lock:
+            n = self.length(symbol, interval)
+            start = 0 if tail is None else max(n - tail, 0)
+            for field in ('timestamp',) + BAR_FIELDS:
+                dtype = np.int64 if field == 'timestamp' else np.float64
+                if n == 0:
+                    arrays[field] = np.empty(0, dtype=dtype)
+                    continue
+                data = np.memmap(self._path(symbol, interval, field), dtype=dtype, mode='r', shape=(n,))
+                arrays[field] = data[start:]
+        return arrays
+
+    def frame(self, symbol: str, interval: str, tail: Optional[int] = None) -> pd.DataFrame:
+        arrays = self.read(symbol, interval, tail)
+        index = pd.DatetimeIndex(pd.to_datetime(arrays.pop('timestamp'), utc=True), name='Datetime')
+        return pd.DataFrame({field.capitalize(): values for field, values in arrays.items()},
+                            index=index, copy=False)
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        n = self.length(symbol, interval)
+        if n == 0:
+            return None
+        ts = np.memmap(self._path(symbol, interval, 'timestamp'), dtype=np.int64, mode='r', shape=(n,))
+        return pd.Timestamp(int(ts[-1]), tz='UTC')
+
+    @contextmanager
+    def _write_lock(self, symbol: str, interval: str):
+        # थ्रेड्स के लिए threading.Lock, gunicorn workers के लिए <dir>/.lock पर flock
+        with self._lock:
+            os.makedirs(self._dir(symbol, interval), exist_ok=True)
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self._dir(symbol, interval), ".lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def append(self, symbol: str, interval: str, df: pd.DataFrame, now: Optional[float] = None) -> int:
+        """
+        नए (बंद हो चुके) बार्स जोड़ें; बदले हुए स्टोर्ड बार्स नई फ़ाइल से बदले जाते हैं। लौटाता है: लिखे गए बार्स
+        """
+        if df is None or df.empty:
+            return 0
+
+        columns = df.columns.get_level_values(0) if isinstance(df.columns, pd.MultiIndex) else df.columns
+        lookup = {str(col).lower(): i for i, col in enumerate(columns)}
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        timestamps = index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        order = np.argsort(timestamps, kind='stable')
+        timestamps = timestamps[order]
+        values = {field: df.iloc[:, lookup[field]].to_numpy(dtype=np.float64)[order] for field in BAR_FIELDS}
+
+        # अभी बन रहा बार स्टोर नहीं होता - वो हर sync पर बदलता है
+        step = INTERVAL_SECONDS.get(interval)
+        if step:
+            now = time.time() if now is None else now
+            closed = timestamps + step * 10**9 <= int(now * 10**9)
+            if not closed.all():
+                timestamps = timestamps[closed]
+                values = {field: v[closed] for field, v in values.items()}
+        if not len(timestamps):
+            return 0
+
+        with self._write_lock(symbol, interval):
+            n = self.length(symbol, interval)
+            keep = n
+            if n:
+                stored = np.memmap(self._path(symbol, interval, 'timestamp'), dtype=np.int64, mode='r', shape=(n,))
+                keep = int(np.searchsorted(stored, timestamps[0], side='left'))
+                # yfinance आखिरी स्टोर्ड बार फिर लौटाता है - बिना बदलाव वाला overlap छोड़ दें
+                overlap = min(n - keep, len(timestamps))
+                same = np.asarray(stored[keep:keep + overlap]) == timestamps[:overlap]
+                for field in BAR_FIELDS:
+                    old = np.memmap(self._path(symbol, interval, field), dtype=np.float64, mode='r', shape=(n,))
+                    same &= ((old[keep:keep + overlap] == values[field][:overlap])
+                             | (np.isnan(old[keep:keep + overlap]) & np.isnan(values[field][:overlap])))
+                    del old
+                del stored
+                skip = overlap if same.all() else int(np.argmin(same))
+                keep += skip
+                timestamps = timestamps[skip:]
+                values = {field: v[skip:] for field, v in values.items()}
+                if not len(timestamps):
+                    return 0
+
+            for field in BAR_FIELDS + ('timestamp',):
+                self._write_field(self._path(symbol, interval, field), keep, n,
+                                  timestamps if field == 'timestamp' else values[field])
+        return len(timestamps)
+
+    @staticmethod
+    def _write_field(path: str, keep: int, n: int, values: np.ndarray) -> None:
+        data = np.ascontiguousarray(values).tobytes()
+        if keep == n and os.path.exists(path):
+            # सिर्फ नए बार्स: फ़ाइल बढ़ती है, मैप हो चुके bytes नहीं बदलते
+            with open(path, 'r+b') as f:
+                f.seek(keep * 8)
+                f.write(data)
+                f.truncate()
+            return
+        # स्टोर्ड बार्स बदल रहे हैं: नई फ़ाइल + atomic replace (पुराने memmap पुराना inode पढ़ते रहते हैं)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                if keep:
+                    with open(path, 'rb') as f:
+                        out.write(f.read(keep * 8))
+                out.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def sync(self, symbol: str, interval: str,
+             fetch: Callable[[Optional[pd.Timestamp]], pd.DataFrame]) -> int:
+        """
+        `fetch(since)` को सिर्फ आखिरी स्टोर्ड बार से आगे का डेटा लाना है (since=None → पूरी शुरुआती हिस्ट्री)
+        """
+        return self.append(symbol, interval, fetch(self.last_timestamp(symbol, interval)))
+
+    @timed("bar_store.sync_yfinance")
+    def sync_yfinance(self, symbol: str, interval: str) -> int:
+        import yfinance as yf
+
+        def fetch(since):
+            ticker = yf.Ticker(symbol)
+            if since is None:
+                return ticker.history(period=INITIAL_PERIOD.get(interval, '1mo'), interval=interval)
+            return ticker.history(start=since.to_pydatetime(), interval=interval)
+
+        return self.sync(symbol, interval, fetch)
+
+    def load(self, symbol: str, interval: str, tail: Optional[int] = None) -> pd.DataFrame:
+        """
+        yfinance से incremental sync करके स्टोर से फ्रेम लौटाएँ; नेटवर्क फेल हो तो जो स्टोर्ड है वही
+        """
+        try:
+            self.sync_yfinance(symbol, interval)
+        except Exception as e:
+            logger.warning("Bar store sync failed for %s %s: %s", symbol, interval, e)
+        return self.frame(symbol, interval, tail)
+
+
+bar_store = BarStore()
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from typing import Callable, Hashable, Optional
+
+from cachetools import TLRUCache
+
+# बार इंटरवल → सेकंड
+INTERVAL_SECONDS = {
+    '1m': 60, '2m': 120, '5m': 300, '15m': 900, '30m': 1800, '60m': 3600,
+    '90m': 5400, '1h': 3600, '4h': 14400, '1d': 86400, '1w': 604800, '1wk': 604800,
+}
+
+DEFAULT_TTL = float(os.getenv("MARKET_CACHE_TTL", "60"))
+DEFAULT_MAX_BYTES = int(float(os.getenv("MARKET_CACHE_MB", "64")) * 1024 * 1024)
+
+
+def bar_expiry(interval: Optional[str], now: float, default_ttl: float = DEFAULT_TTL) -> float:
+    """
+    ⏱️ Epoch time at which the bar currently forming for `interval` closes.
+    Unknown / missing interval (e.g. option chains) falls back to `default_ttl`.
+    """
+    step = INTERVAL_SECONDS.get(interval or '')
+    if not step:
+        return now + default_ttl
+    # epoch-aligned boundaries: 15m NSE bars (09:15 IST) भी इसी ग्रिड पर हैं
+    return (now // step + 1) * step
+
+
+def _array_bytes(value) -> Optional[int]:
+    if hasattr(value, 'memory_usage'):  # DataFrame / Series (object कॉलम्स समेत)
+        usage = value.memory_usage(index=True, deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if hasattr(value, 'nbytes'):  # ndarray
+        return int(value.nbytes)
+    return None
+
+
+def _sizeof(value) -> int:
+    size = _array_bytes(value)
+    if size is not None:
+        return size
+    if isinstance(value, tuple):
+        # OptionChain / yfinance Options(calls, puts, underlying): हर array-जैसे सदस्य का साइज़
+        sizes = [_array_bytes(v) for v in value]
+        if any(s is not None for s in sizes):
+            return sum(s if s is not None else 1024 for s in sizes)
+    return 1024  # छोटी वैल्यूज़ (expiry लिस्ट वगैरह) के लिए नाममात्र साइज़
+
+
+class _CountingTLRUCache(TLRUCache):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.evictions = 0
+        self.expirations = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self.expirations += len(expired)
+        return expired
+
+
+class MarketDataCache:
+    """
+    🗄️ TTL + LRU cache for OHLCV / option-chain fetches.
+
+    Keys are (kind, symbol, interval, period-or-expiry). An entry lives until the
+    current bar of its interval closes; the total size (DataFrame bytes) is capped
+    and the least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, default_ttl: float = DEFAULT_TTL,
+                 timer: Callable[[], float] = time.time):
+        self.default_ttl = default_ttl
+        self._cache = _CountingTLRUCache(maxsize=max_bytes, ttu=self._ttu, timer=timer, getsizeof=_sizeof)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _ttu(self, key, value, now):
+        return bar_expiry(key[2] if len(key) > 2 else None, now, self.default_ttl)
+
+    def get_or_fetch(self, key: tuple, loader: Callable[[], object]):
+        with self._lock:
+            try:
+                value = self._cache[key]
+                self.hits += 1
+                return value
+            except KeyError:
+                self.misses += 1
+
+        # loader (नेटवर्क कॉल) lock के बाहर
+        value = loader()
+        if value is None or getattr(value, 'empty', False):
+            return value
+        with self._lock:
+            try:
+                self._cache[key] = value
+            except ValueError:
+                pass  # max_bytes से बड़ी वैल्यू - कैश नहीं करते
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self._cache.evictions,
+                'expirations': self._cache.expirations,
+                'entries': len(self._cache),
+                'bytes': self._cache.currsize,
+                'max_bytes': self._cache.maxsize,
+            }
+
+
+# प्रोसेस-वाइड इंस्टेंस - scanner, options और AsyncMarketData सब यही इस्तेमाल करते हैं
+market_cache = MarketDataCache()
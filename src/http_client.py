@@ -0,0 +1,91 @@
+import importlib.util
+import logging
+import os
+from typing import Optional
+
+import httpx
+
+from src.metrics import track
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
+
+# 🔧 Pool / timeout settings (env से बदले जा सकते हैं)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+# HTTP/2 सिर्फ तब जब h2 इंस्टॉल हो (httpx[http2])
+HTTP2_ENABLED = os.getenv("HTTP2", "auto") != "0" and importlib.util.find_spec("h2") is not None
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+class TelegramAPIError(Exception):
+    """
+    ❗ Bot API error with the bits AlertDispatcher needs: `retry_after` on 429, `permanent` on 4xx
+    """
+
+    def __init__(self, description: str, error_code: int = 0, retry_after: Optional[float] = None):
+        super().__init__(description)
+        self.error_code = error_code
+        self.retry_after = retry_after
+        self.permanent = error_code in (400, 401, 403, 404)
+
+
+def create_http_client(**overrides) -> httpx.AsyncClient:
+    options = dict(
+        http2=HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+    )
+    options.update(overrides)
+    return httpx.AsyncClient(**options)
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """
+    🌐 Create the app-wide pooled client (call once at startup)
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+        logger.info("HTTP client ready (http2=%s, max_connections=%d)", HTTP2_ENABLED, HTTP_MAX_CONNECTIONS)
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    if _client is None or _client.is_closed:
+        raise RuntimeError("HTTP client not started - call start_http_client() at startup")
+    return _client
+
+
+async def telegram_api(token: str, method: str, **params) -> dict:
+    """
+    📡 Bot API call over the shared client; returns `result` or raises TelegramAPIError
+    """
+    with track(f"telegram.{method}"):
+        response = await get_http_client().post(f"{TELEGRAM_API_URL}/bot{token}/{method}", json=params)
+        try:
+            payload = response.json()
+        except ValueError:
+            raise TelegramAPIError(f"HTTP {response.status_code}", response.status_code)
+
+        if not payload.get("ok"):
+            retry_after = (payload.get("parameters") or {}).get("retry_after")
+            raise TelegramAPIError(payload.get("description", "unknown error"),
+                                   payload.get("error_code", response.status_code), retry_after)
+        return payload.get("result")
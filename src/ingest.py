@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def chat_key(data: dict):
+    """
+    Chat id of a raw Telegram update (ordering key); falls back to the sender, then update_id.
+    """
+    for field in ('message', 'edited_message', 'channel_post', 'edited_channel_post'):
+        if field in data:
+            return data[field].get('chat', {}).get('id')
+    query = data.get('callback_query')
+    if query:
+        message = query.get('message') or {}
+        return message.get('chat', {}).get('id') or query.get('from', {}).get('id')
+    for value in data.values():
+        if isinstance(value, dict) and 'from' in value:
+            return value['from'].get('id')
+    return data.get('update_id')
+
+
+class UpdateIngestor:
+    """
+    📥 Ack-first webhook ingestion.
+
+    `submit()` only dedupes by update_id and enqueues; a fixed pool of workers runs
+    `process(data)`. Each worker owns a shard queue and updates are sharded by chat id,
+    so one chat's updates are handled in order while different chats run in parallel.
+    A full shard sheds the update instead of holding the HTTP response.
+    """
+
+    def __init__(self, process: Callable[[dict], Awaitable[object]], workers: int = 4,
+                 max_queue: int = 1000, dedupe_size: int = 10000, latency_samples: int = 1000):
+        self.process = process
+        self.workers = workers
+        self.shard_size = max(max_queue // workers, 1)
+        self.dedupe_size = dedupe_size
+        self._seen: "OrderedDict[int, None]" = OrderedDict()
+        self._queues: list = []
+        self._tasks: list = []
+        self._latencies: deque = deque(maxlen=latency_samples)
+        self.stats = {'received': 0, 'queued': 0, 'processed': 0, 'failed': 0,
+                      'duplicates': 0, 'shed': 0, 'max_depth': 0}
+
+    def _duplicate(self, update_id: Optional[int]) -> bool:
+        if update_id is None:
+            return False
+        if update_id in self._seen:
+            self._seen.move_to_end(update_id)
+            return True
+        self._seen[update_id] = None
+        if len(self._seen) > self.dedupe_size:
+            self._seen.popitem(last=False)
+        return False
+
+    def _ensure_queues(self) -> None:
+        if not self._queues:
+            self._queues = [asyncio.Queue(maxsize=self.shard_size) for _ in range(self.workers)]
+
+    def submit(self, data: dict) -> str:
+        """
+        Returns 'queued', 'duplicate' or 'shed'. Never awaits.
+        """
+        self._ensure_queues()
+        self.stats['received'] += 1
+        if self._duplicate(data.get('update_id')):
+            self.stats['duplicates'] += 1
+            return 'duplicate'
+
+        shard = self._queues[hash(chat_key(data)) % self.workers]
+        try:
+            shard.put_nowait((time.monotonic(), data))
+        except asyncio.QueueFull:
+            self.stats['shed'] += 1
+            logger.warning("Update queue full, shedding update %s", data.get('update_id'))
+            return 'shed'
+
+        self.stats['queued'] += 1
+        self.stats['max_depth'] = max(self.stats['max_depth'], self.depth)
+        return 'queued'
+
+    def start(self) -> None:
+        self._ensure_queues()
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker(q)) for q in self._queues]
+
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        try:
+            await asyncio.wait_for(asyncio.gather(*(q.join() for q in self._queues)), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Update queue not drained, %d updates left", self.depth)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            enqueued, data = await queue.get()
+            try:
+                await self.process(data)
+                self.stats['processed'] += 1
+            except Exception:
+                self.stats['failed'] += 1
+                logger.exception("Update %s failed", data.get('update_id'))
+            finally:
+                self._latencies.append(time.monotonic() - enqueued)
+                queue.task_done()
+
+    @property
+    def depth(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    def metrics(self) -> dict:
+        latencies = sorted(self._latencies)
+        pick = lambda q: round(latencies[min(int(len(latencies) * q), len(latencies) - 1)], 4) if latencies else 0.0
+        return dict(self.stats, depth=self.depth, workers=self.workers,
+                    latency_p50=pick(0.5), latency_p95=pick(0.95), latency_max=pick(1.0))
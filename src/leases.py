@@ -0,0 +1,269 @@
+import asyncio
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# COORDINATION_BACKEND: none (एक ही worker) | file (एक host, fcntl.flock) | sqlite (एक host/shared disk)
+COORDINATION_BACKEND = os.getenv("COORDINATION_BACKEND", "none").lower()
+LEASE_DIR = os.getenv("LEASE_DIR", os.path.join("data", "leases"))
+LEASE_TTL = float(os.getenv("LEASE_TTL", "30"))
+
+
+class LeaseBackend:
+    """
+    🔐 Storage for named leases. `acquire` both takes a free/expired lease and
+    renews one `owner` already holds; it returns whether `owner` holds it now.
+    Calls are blocking - LeaseManager runs them off the event loop.
+    """
+
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        raise NotImplementedError
+
+    def release(self, name: str, owner: str) -> None:
+        raise NotImplementedError
+
+    def holder(self, name: str) -> Optional[str]:
+        raise NotImplementedError
+
+
+class LocalLeaseBackend(LeaseBackend):
+    """Single worker: every lease is always ours (पुराना व्यवहार)."""
+
+    def acquire(self, name, owner, ttl):
+        return True
+
+    def release(self, name, owner):
+        pass
+
+    def holder(self, name):
+        return None
+
+
+class FileLeaseBackend(LeaseBackend):
+    """
+    One lock file per lease, held with a non-blocking `fcntl.flock`.
+
+    The kernel drops the lock when the owning process exits (even on SIGKILL),
+    so failover takes one renewal round, not a TTL. Only coordinates workers on
+    the same host (e.g. gunicorn workers); the TTL is not used.
+    """
+
+    def __init__(self, directory: str = LEASE_DIR):
+        import fcntl  # POSIX only
+
+        self._fcntl = fcntl
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._files: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name.replace(os.sep, "_") + ".lock")
+
+    def acquire(self, name, owner, ttl):
+        with self._lock:
+            if name in self._files:
+                return True
+            handle = open(self._path(name), "a+")
+            try:
+                self._fcntl.flock(handle, self._fcntl.LOCK_EX | self._fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                return False
+            handle.seek(0)
+            handle.truncate()
+            handle.write(owner)
+            handle.flush()
+            self._files[name] = handle
+            return True
+
+    def release(self, name, owner):
+        with self._lock:
+            handle = self._files.pop(name, None)
+            if handle is None:
+                return
+            handle.truncate(0)
+            self._fcntl.flock(handle, self._fcntl.LOCK_UN)
+            handle.close()
+
+    def holder(self, name):
+        try:
+            with open(self._path(name)) as handle:
+                return handle.read() or None
+        except FileNotFoundError:
+            return None
+
+
+class SQLiteLeaseBackend(LeaseBackend):
+    """
+    Lease table in a SQLite file: (name, owner, expires_at).
+
+    A lease is taken over only once `expires_at` has passed, so a dead owner
+    fails over after at most `ttl` seconds. Works across processes on one host
+    (or a shared disk with working POSIX locks).
+    """
+
+    def __init__(self, path: str = os.path.join(LEASE_DIR, "leases.db"),
+                 timer: Callable[[], float] = time.time):
+        self.path = path
+        self.timer = timer
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS leases ("
+                       "name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connection थ्रेड्स में शेयर नहीं होता - हर थ्रेड का अपना
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5.0)
+            self._local.db = db
+        return db
+
+    def acquire(self, name, owner, ttl):
+        now = self.timer()
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+                (name, owner, now + ttl, now),
+            )
+            row = db.execute("SELECT owner FROM leases WHERE name = ?", (name,)).fetchone()
+        return row is not None and row[0] == owner
+
+    def release(self, name, owner):
+        with self._connect() as db:
+            db.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def holder(self, name):
+        row = self._connect().execute(
+            "SELECT owner FROM leases WHERE name = ? AND expires_at >= ?", (name, self.timer())
+        ).fetchone()
+        return row[0] if row else None
+
+
+def create_backend(kind: str = COORDINATION_BACKEND) -> LeaseBackend:
+    if kind in ("", "none", "local"):
+        return LocalLeaseBackend()
+    if kind == "file":
+        return FileLeaseBackend()
+    if kind == "sqlite":
+        return SQLiteLeaseBackend()
+    raise ValueError(f"Unknown COORDINATION_BACKEND: {kind}")
+
+
+class LeaseManager:
+    """
+    👑 Keeps this worker's leases renewed and answers `owns(name)` without I/O.
+
+    - every `renew_interval` seconds all tracked leases are acquired/renewed
+    - ownership is trusted locally only until `ttl` after the last successful
+      renewal, so a worker that stops renewing steps down before anyone can
+      take over (no two owners for the same lease)
+    - leases are released on `stop()` so a clean shutdown fails over immediately
+    """
+
+    def __init__(self, backend: Optional[LeaseBackend] = None, owner: Optional[str] = None,
+                 ttl: float = LEASE_TTL, renew_interval: Optional[float] = None,
+                 timer: Callable[[], float] = time.time):
+        self.backend = backend or create_backend()
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.ttl = ttl
+        self.renew_interval = renew_interval or ttl / 3
+        self.timer = timer
+        self._tracked: Set[str] = set()
+        self._released: Set[str] = set()
+        self._owned_until: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.acquired = 0
+        self.lost = 0
+        self.errors = 0
+
+    def track(self, name: str) -> None:
+        self._tracked.add(name)
+        self._released.discard(name)
+
+    def untrack(self, name: str) -> None:
+        # release अगले renewal राउंड में (blocking कॉल event loop पर नहीं)
+        self._tracked.discard(name)
+        self._owned_until.pop(name, None)
+        self._released.add(name)
+
+    def owns(self, name: str) -> bool:
+        return self._owned_until.get(name, 0.0) > self.timer()
+
+    async def renew(self) -> None:
+        for name in list(self._released):
+            self._released.discard(name)
+            try:
+                await asyncio.to_thread(self.backend.release, name, self.owner)
+            except Exception:
+                logger.exception("Failed to release lease %s", name)
+
+        for name in list(self._tracked):
+            started = self.timer()
+            was_owner = self.owns(name)
+            try:
+                held = await asyncio.to_thread(self.backend.acquire, name, self.owner, self.ttl)
+            except Exception:
+                # पिछली ownership ttl तक मान्य; उसके बाद owns() अपने आप False
+                self.errors += 1
+                logger.exception("Lease renewal failed for %s", name)
+                continue
+            if name not in self._tracked:
+                continue
+            if held:
+                self._owned_until[name] = started + self.ttl
+                if not was_owner:
+                    self.acquired += 1
+                    logger.info("Acquired lease %s as %s", name, self.owner)
+            else:
+                self._owned_until.pop(name, None)
+                if was_owner:
+                    self.lost += 1
+                    logger.warning("Lost lease %s", name)
+
+    async def start(self) -> asyncio.Task:
+        # पहला राउंड await करें ताकि startup के बाद owns() सही जवाब दे
+        if self._task is None or self._task.done():
+            await self.renew()
+            self._task = asyncio.create_task(self._loop())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for name in list(self._tracked):
+            self.untrack(name)
+        await self.renew()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            await self.renew()
+
+    def metrics(self) -> dict:
+        now = self.timer()
+        return {
+            'owner': self.owner,
+            'backend': type(self.backend).__name__,
+            'owned': sorted(name for name, until in self._owned_until.items() if until > now),
+            'standby': sorted(name for name in self._tracked if not self.owns(name)),
+            'acquired': self.acquired,
+            'lost': self.lost,
+            'errors': self.errors,
+        }
@@ -0,0 +1,281 @@
+import atexit
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: बिना cross-process lock के rotation
+    fcntl = None
+
+# 🔧 सब env से: LOG_LEVEL, LOG_FORMAT (console: text|json), LOG_FILE ("" = सिर्फ console)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_FILE = os.getenv("LOG_FILE", "bot_errors.log")
+LOG_FILE_LEVEL = os.getenv("LOG_FILE_LEVEL", "ERROR").upper()
+LOG_FILE_FORMAT = os.getenv("LOG_FILE_FORMAT", "json").lower()
+# size: LOG_MAX_BYTES पर rotate | time: LOG_ROTATE_WHEN (midnight, h, ...) पर
+LOG_ROTATE = os.getenv("LOG_ROTATE", "size").lower()
+LOG_MAX_BYTES = int(float(os.getenv("LOG_MAX_MB", "10")) * 1024 * 1024)
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "midnight")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# एक ही (logger, level, message template) WARNING+ रिकॉर्ड: window में burst के बाद दबाएँ
+LOG_DEDUPE_WINDOW = float(os.getenv("LOG_DEDUPE_WINDOW", "60"))
+LOG_DEDUPE_BURST = int(os.getenv("LOG_DEDUPE_BURST", "5"))
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# LogRecord के अपने attributes - इनके अलावा सब `extra=` से आए फ़ील्ड हैं
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, location, extras, exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+                  .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "module": record.module,
+            "func": record.funcName,
+            "line": record.lineno,
+            "pid": record.process,
+            "thread": record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = record.stack_info
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DedupeFilter(logging.Filter):
+    """
+    🔁 Rate-limits repeated WARNING+ records during an error storm.
+
+    Records are keyed by (logger, level, message template, exception type). Per key
+    the first `burst` records in each `window` pass; the rest are dropped and
+    counted. The first record after the window carries `suppressed=N` (and a
+    note in the message), so the log still shows how many were dropped.
+    """
+
+    def __init__(self, window: float = LOG_DEDUPE_WINDOW, burst: int = LOG_DEDUPE_BURST,
+                 min_level: int = logging.WARNING, max_keys: int = 1000):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.min_level = min_level
+        self.max_keys = max_keys
+        self.suppressed_total = 0
+        # key → [window start, passed in window, suppressed in window]
+        self._keys: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.min_level or self.window <= 0:
+            return True
+        exc_type = record.exc_info[0].__name__ if record.exc_info and record.exc_info[0] else None
+        key = (record.name, record.levelno, str(record.msg), exc_type)
+        now = time.monotonic()
+        with self._lock:
+            state = self._keys.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state is not None else 0
+                if state is None and len(self._keys) >= self.max_keys:
+                    self._prune(now)
+                self._keys[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                    record.msg = f"{record.msg} [+{suppressed} similar suppressed]"
+                return True
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            self.suppressed_total += 1
+            return False
+
+    def _prune(self, now: float) -> None:
+        expired = [key for key, state in self._keys.items() if now - state[0] >= self.window]
+        for key in expired or list(self._keys)[: self.max_keys // 2]:
+            del self._keys[key]
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the caller: a full queue drops the record
+    (counted in `dropped`) instead of stalling the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # सिर्फ message कॉलर थ्रेड में (args बाद में बदल न जाएँ); traceback की
+        # formatting (linecache = disk I/O) listener थ्रेड में - एक ही प्रोसेस है, pickle नहीं चाहिए
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _InterProcessRotationMixin:
+    """
+    Serialises writes + rollover across processes (gunicorn workers) with an
+    flock on `<file>.lock`. A worker whose file was rotated by another worker
+    reopens the new file instead of rotating it a second time.
+    """
+
+    def _init_lock(self) -> None:
+        self._lock_file = open(self.baseFilename + ".lock", "a") if fcntl else None
+
+    def _rotated_elsewhere(self) -> bool:
+        if self.stream is None:
+            return False
+        try:
+            return os.stat(self.baseFilename).st_ino != os.fstat(self.stream.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _reopened(self) -> None:
+        pass
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._lock_file is None:
+            return super().emit(record)
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            if self._rotated_elsewhere():
+                self.stream.close()
+                self.stream = self._open()
+                self._reopened()
+            super().emit(record)
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        super().close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+class SizeRotatingFileHandler(_InterProcessRotationMixin, logging.handlers.RotatingFileHandler):
+    def __init__(self, filename: str, max_bytes: int = LOG_MAX_BYTES, backup_count: int = LOG_BACKUP_COUNT):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self._init_lock()
+
+
+class TimeRotatingFileHandler(_InterProcessRotationMixin, logging.handlers.TimedRotatingFileHandler):
+    def __init__(self, filename: str, when: str = LOG_ROTATE_WHEN, backup_count: int = LOG_BACKUP_COUNT):
+        super().__init__(filename, when=when, backupCount=backup_count, encoding="utf-8", utc=True)
+        self._init_lock()
+
+    def _reopened(self) -> None:
+        # दूसरे worker ने अभी rotate किया - अगला rollover नई फ़ाइल के हिसाब से
+        self.rolloverAt = self.computeRollover(int(time.time()))
+
+
+def _formatter(kind: str) -> logging.Formatter:
+    return JsonFormatter() if kind == "json" else logging.Formatter(TEXT_FORMAT)
+
+
+def build_handlers(log_file: Optional[str] = LOG_FILE) -> List[logging.Handler]:
+    console = logging.StreamHandler()
+    console.setFormatter(_formatter(LOG_FORMAT))
+    handlers: List[logging.Handler] = [console]
+    if log_file:
+        directory = os.path.dirname(log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if LOG_ROTATE == "time":
+            file_handler = TimeRotatingFileHandler(log_file)
+        else:
+            file_handler = SizeRotatingFileHandler(log_file)
+        file_handler.setLevel(LOG_FILE_LEVEL)
+        file_handler.setFormatter(_formatter(LOG_FILE_FORMAT))
+        handlers.append(file_handler)
+    return handlers
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_dedupe: Optional[DedupeFilter] = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging(level: str = LOG_LEVEL, handlers: Optional[List[logging.Handler]] = None) -> logging.Logger:
+    """
+    📝 Process-wide logging, idempotent.
+
+    The root logger gets a single non-blocking QueueHandler (+ dedupe filter);
+    a QueueListener thread does all formatting-to-disk and rotation, so no
+    file I/O ever runs on the event loop.
+    """
+    global _listener, _queue_handler, _dedupe
+    with _setup_lock:
+        root = logging.getLogger()
+        root.setLevel(level)
+        if _listener is not None:
+            return root
+
+        log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+        _dedupe = DedupeFilter()
+        _queue_handler = NonBlockingQueueHandler(log_queue)
+        _queue_handler.addFilter(_dedupe)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_queue_handler)
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, *(handlers if handlers is not None else build_handlers()),
+            respect_handler_level=True,
+        )
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return root
+
+
+def shutdown_logging() -> None:
+    """Flush the queue and close handlers (atexit पर अपने आप)."""
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener = None
+        _queue_handler = None
+
+
+def logging_stats() -> dict:
+    return {
+        'queued': _queue_handler.queue.qsize() if _queue_handler else 0,
+        'dropped': _queue_handler.dropped if _queue_handler else 0,
+        'suppressed': _dedupe.suppressed_total if _dedupe else 0,
+    }
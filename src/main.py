@@ -2,13 +2,25 @@
 import os
 import logging
 import asyncio
-from fastapi import FastAPI, Request
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Bot
+from fastapi import FastAPI, HTTPException, Request, Response
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters, CallbackQueryHandler
 from dotenv import load_dotenv
 import datetime
-import random
-import requests
+from functools import partial
+from typing import Optional
+
+from src.alerts import AlertDispatcher
+from src.cache import market_cache
+from src.http_client import HTTP_MAX_CONNECTIONS, close_http_client, start_http_client, telegram_api
+from src.ingest import UpdateIngestor
+from src.providers import AsyncMarketData, YFinanceProvider, shutdown_executor
+from src.leases import LeaseManager
+from src.logging_setup import setup_logging
+from src.metrics import CONTENT_TYPE, REGISTRY, render_metrics, timed
+from src.profiler import PROFILE_MAX_SECONDS, PROFILING_ENABLED, profiler
+from src.scheduler import ScanJob, Scheduler
+from src.symbols import symbol_registry
 
 load_dotenv()
 
@@ -19,12 +31,14 @@ WEBHOOK_URL = os.getenv("WEBHOOK_URL")
 if not TOKEN or not CHAT_ID or not WEBHOOK_URL:
     raise ValueError("BOT_TOKEN, CHAT_ID, or WEBHOOK_URL missing in environment variables!")
 
-bot = Bot(token=TOKEN)
 app = FastAPI()
 
-logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
+setup_logging()
 logger = logging.getLogger("lr-saathi")
 
+# yfinance कॉल्स event loop से बाहर (thread pool), ताकि /webhook ब्लॉक न हो
+market_data = AsyncMarketData(YFinanceProvider(), cache=market_cache)
+
 # ---------------- Command handlers ----------------
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     keyboard = [
@@ -46,101 +60,274 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.edit_message_text(text="BankNifty: कोई बड़ा सिग्नल नहीं (Demo).")
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    await update.message.reply_text("यूज़: /start — फिर बटन दबाइए।")
+    await update.message.reply_text("यूज़: /start — फिर बटन दबाइए।\n/symbol <नाम> — सिंबल खोजें।\n/options <सिंबल> — ऑप्शन चेन सार।")
+
+async def symbol_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    # /symbol bank → BANKNIFTY, BANKEX, ... (prefix search, रजिस्ट्री से)
+    query = " ".join(context.args)
+    if not query:
+        await update.message.reply_text("यूज़: /symbol <नाम का शुरुआती हिस्सा>, जैसे /symbol bank")
+        return
+    matches = symbol_registry.search(query, limit=8)
+    if not matches:
+        await update.message.reply_text(f"'{query}' से कोई सिंबल नहीं मिला।")
+        return
+    lines = [
+        f"{i.symbol} — {i.yahoo} ({i.asset_class}" + (f", lot {i.lot_size}" if i.lot_size else "") + ")"
+        for i in matches
+    ]
+    await update.message.reply_text("\n".join(lines))
+
+async def options_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    # /options nifty → नज़दीकी एक्सपायरी का ATM सार; साथ-साथ आई माँगें एक ही चेन fetch साझा करती हैं
+    if not context.args:
+        await update.message.reply_text("यूज़: /options <सिंबल>, जैसे /options nifty")
+        return
+    from options import OptionAnalyzer
+    analyzer = OptionAnalyzer(context.args[0])
+    result = await analyzer.analyze_chain_async(market_data, solve_iv=True, as_records=False)
+    if not result or result['calls'].empty:
+        await update.message.reply_text(f"{analyzer.symbol} की ऑप्शन चेन नहीं मिली।")
+        return
+    spot = result['spot']
+    lines = [f"📊 {analyzer.symbol} — स्पॉट {spot}, एक्सपायरी {result['expiry']}"]
+    for side, label in (('calls', 'CE'), ('puts', 'PE')):
+        df = result[side]
+        row = df.iloc[(df['strike'] - spot).abs().to_numpy().argmin()]
+        lines.append(f"{label} {row['strike']:g}: LTP {row['lastPrice']:g}, IV {row['iv']:.1%}, Δ {row['delta']:+.2f}")
+    await update.message.reply_text("\n".join(lines))
 
 async def text_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("कृपया बटन या कमांड का इस्तेमाल करें।")
 
 # ---------------- Alert sender ----------------
-async def send_alert_message(text: str):
-    try:
-        await bot.send_message(chat_id=CHAT_ID, text=text)
-    except Exception as e:
-        logger.exception("Telegram send failed: %s", e)
-
-# ---------------- Scanner logic (Demo placeholders) ----------------
-# यहाँ आप असली डेटा फेच और EMA/RSI/Volume लॉजिक डाल सकते हैं।
-# मैंने demo में probability/random based alerts डाले हैं ताकि टेस्ट हो सके।
-
-async def btc_scanner_task():
-    logger.info("BTC scanner started")
-    while True:
-        # Replace this block with real BTC price fetch and EMA/RSI/Volume checks
-        price = random.randint(60000, 65000)
-        if price > 64000:
-            now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            text = f"🚨 BTC Breakout Alert!\n💰 Price: ${price}\n🕒 Time: {now}\nEntry: {price-100}\nSL: {price-500}\nTarget: {price+800}\nRisk: Low"
-            await send_alert_message(text)
-        await asyncio.sleep(60)  # हर 60 सेकंड चेक
-
-async def nifty_scanner_task():
-    logger.info("Nifty scanner started")
-    while True:
-        # Replace with real Nifty fetch and EMA/RSI/Volume checks
-        val = random.randint(20000, 22000)
-        if val % 777 == 0:  # demo condition rare
-            now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            text = f"📣 Nifty Trend Alert!\n💹 Value: {val}\nTime: {now}\nEntry: {val-20}\nSL: {val-80}\nTarget: {val+150}\nRisk: Medium"
-            await send_alert_message(text)
-        await asyncio.sleep(120)
-
-async def banknifty_scanner_task():
-    logger.info("BankNifty scanner started")
-    while True:
-        # Replace with real BankNifty logic
-        val = random.randint(45000, 47000)
-        if val % 999 == 0:
-            now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            text = f"📣 BankNifty Alert!\n💹 Value: {val}\nTime: {now}\nEntry: {val-30}\nSL: {val-120}\nTarget: {val+300}\nRisk: High"
-            await send_alert_message(text)
-        await asyncio.sleep(150)
+# CHAT_ID के साथ अतिरिक्त सब्सक्राइबर्स: ALERT_CHAT_IDS=111,222
+ALERT_CHAT_IDS = [CHAT_ID] + [c.strip() for c in os.getenv("ALERT_CHAT_IDS", "").split(",") if c.strip() and c.strip() != CHAT_ID]
+
+async def telegram_send(chat_id: str, text: str):
+    await telegram_api(TOKEN, "sendMessage", chat_id=chat_id, text=text)
+
+alert_dispatcher = AlertDispatcher(telegram_send, workers=int(os.getenv("ALERT_WORKERS", "4")))
+
+ALERTS_QUEUED = REGISTRY.counter("alerts_queued_total", "Alert messages queued for delivery (per chat)")
+
+@timed("main.send_alert_message")
+async def send_alert_message(text: str, dedupe_key: Optional[str] = None):
+    # कतार में डालकर तुरंत लौटें; rate limit / retry / dedupe dispatcher workers संभालते हैं
+    ALERTS_QUEUED.inc(alert_dispatcher.publish(text, ALERT_CHAT_IDS, dedupe_key))
+
+# ---------------- Scanner jobs ----------------
+# हर जॉब बार-क्लोज़ पर एक बार चलता है; fetch market_data के thread pool में (एक सिंबल = एक in-flight fetch)
+async def run_scan(symbol: str, interval: str = "15m", label: Optional[str] = None) -> list:
+    # pandas/numpy/yfinance पहले स्कैन पर लोड होते हैं, बूट पर नहीं (तेज़ cold start)
+    from src import scanner
+    return await scanner.check_symbol_async(market_data, symbol, interval, label)
+
+SCAN_JOBS = [
+    ("btc", "BTC-USD", "15m", "BTC"),
+    ("nifty", "^NSEI", "15m", "Nifty"),
+    ("banknifty", "^NSEBANK", "15m", "BankNifty"),
+]
+
+async def deliver_scan_alerts(job: ScanJob, messages: list):
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for message in messages:
+        # dedupe कच्चे सिग्नल पर - समय वाली लाइन हर बार अलग होती है
+        await send_alert_message(f"{message}\n🕒 Time: {now}", dedupe_key=message)
+
+# कई workers (gunicorn) में हर जॉब सिर्फ अपने lease owner पर चलता है - COORDINATION_BACKEND=file|sqlite
+lease_manager = LeaseManager()
+lease_manager.track("webhook")
+scheduler = Scheduler(on_result=deliver_scan_alerts, max_concurrency=int(os.getenv("SCAN_MAX_CONCURRENCY", "4")),
+                      leases=lease_manager)
+for name, symbol, interval, label in SCAN_JOBS:
+    scheduler.add_job(ScanJob(name, symbol, interval, partial(run_scan, interval=interval, label=label)))
+# अतिरिक्त वॉचलिस्ट: SCAN_SYMBOLS=RELIANCE,INFY,ETH (नाम, alias या Yahoo टिकर)
+# पहले resolve, फिर Yahoo टिकर पर dedupe - "btc,BTC,BTC-USD" एक ही जॉब (और एक ही अलर्ट)
+_scanned = {(job.symbol, job.interval) for job in scheduler.jobs.values()}
+for symbol in filter(None, (s.strip() for s in os.getenv("SCAN_SYMBOLS", "").split(","))):
+    ticker = symbol_registry.to_yahoo(symbol)
+    if (ticker, "15m") in _scanned:
+        continue
+    _scanned.add((ticker, "15m"))
+    instrument = symbol_registry.resolve(symbol)
+    scheduler.add_job(ScanJob(instrument.symbol if instrument else ticker, ticker, "15m", run_scan))
+
+# ---------------- Live tick pipeline (opt-in) ----------------
+# TICK_STREAM_URL=wss://stream.binance.com:9443/stream?streams=btcusdt@trade/ethusdt@trade
+# या ऑफ़लाइन: TICK_REPLAY_FILE=ticks.csv (symbol,ts,price,volume)
+TICK_STREAM_URL = os.getenv("TICK_STREAM_URL", "")
+TICK_REPLAY_FILE = os.getenv("TICK_REPLAY_FILE", "")
+TICK_INTERVALS = tuple(filter(None, (s.strip() for s in os.getenv("TICK_INTERVALS", "1m,5m,15m").split(","))))
+tick_pipeline = None
+if TICK_STREAM_URL or TICK_REPLAY_FILE:
+    lease_manager.track("ticks")
+
+async def deliver_tick_alerts(series, messages: list):
+    # हर worker स्ट्रीम पढ़ता है (failover तुरंत), पर अलर्ट सिर्फ "ticks" lease owner भेजता है
+    if lease_manager.owns("ticks"):
+        await deliver_scan_alerts(series, messages)
+
+def create_tick_pipeline():
+    # numpy/technical सिर्फ तब लोड हों जब स्ट्रीम चालू हो
+    from src.bar_store import bar_store
+    from src.ticks import ReplayTickSource, TickPipeline, WebSocketTickSource
+
+    source = WebSocketTickSource(TICK_STREAM_URL) if TICK_STREAM_URL else ReplayTickSource(TICK_REPLAY_FILE, speed=1.0)
+    return TickPipeline(
+        source, intervals=TICK_INTERVALS, on_result=deliver_tick_alerts,
+        history=lambda symbol, interval: bar_store.read(symbol_registry.to_yahoo(symbol), interval, tail=500),
+    )
 
 # ---------------- Telegram Application ----------------
-telegram_app = Application.builder().token(TOKEN).build()
+# PTB का अपना httpx pool (हैंडलर replies के लिए) - वही pool साइज़
+telegram_app = Application.builder().token(TOKEN).connection_pool_size(HTTP_MAX_CONNECTIONS).build()
 telegram_app.add_handler(CommandHandler("start", start))
 telegram_app.add_handler(CommandHandler("help", help_command))
+telegram_app.add_handler(CommandHandler("symbol", symbol_command))
+telegram_app.add_handler(CommandHandler("options", options_command))
 telegram_app.add_handler(CallbackQueryHandler(button_handler))
 telegram_app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, text_handler))
 
 # ---------------- Startup / Webhook ----------------
-@app.on_event("startup")
-async def on_startup():
-    logger.info("Startup: setting webhook and starting background tasks")
-    # सेट webhook
+async def set_webhook():
     try:
-        await bot.set_webhook(f"{WEBHOOK_URL}/webhook")
+        await telegram_api(TOKEN, "setWebhook", url=f"{WEBHOOK_URL}/webhook")
         logger.info("Webhook set to %s/webhook", WEBHOOK_URL)
     except Exception:
         logger.exception("Failed to set webhook — continuing, will still try to start app")
 
+@app.on_event("startup")
+async def on_startup():
+    logger.info("Startup: setting webhook and starting background tasks")
+    await start_http_client()
+    await lease_manager.start()
+
+    # सेट webhook - सिर्फ एक worker (lease owner), बैकग्राउंड में ताकि startup इंतज़ार न करे
+    if lease_manager.owns("webhook"):
+        asyncio.create_task(set_webhook())
+
     # Telegram application initialize / start
     asyncio.create_task(telegram_app.initialize())
     asyncio.create_task(telegram_app.start())
 
-    # Background scanner tasks
-    asyncio.create_task(btc_scanner_task())
-    asyncio.create_task(nifty_scanner_task())
-    asyncio.create_task(banknifty_scanner_task())
+    alert_dispatcher.start()
+    update_ingestor.start()
+
+    # Background scanner jobs (एक scheduler टास्क, सभी जॉब्स के लिए)
+    scheduler.start()
+
+    global tick_pipeline
+    if TICK_STREAM_URL or TICK_REPLAY_FILE:
+        tick_pipeline = create_tick_pipeline()
+        tick_pipeline.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await scheduler.stop()
+    if tick_pipeline is not None:
+        await tick_pipeline.stop()
+    await lease_manager.stop()
+    await update_ingestor.stop()
+    await alert_dispatcher.stop()
+    await close_http_client()
+    shutdown_executor()
+
+async def process_raw_update(data: dict):
+    # अलग Bot() नहीं - हर Bot अपने HTTP क्लाइंट + SSL context बनाता है (धीमा बूट)
+    update = Update.de_json(data, telegram_app.bot)
+    await telegram_app.process_update(update)
+
+# WEBHOOK_MODE=queue: तुरंत ack, worker pool में प्रोसेस; inline: पुराना तरीका
+WEBHOOK_MODE = os.getenv("WEBHOOK_MODE", "queue")
+update_ingestor = UpdateIngestor(
+    process_raw_update,
+    workers=int(os.getenv("WEBHOOK_WORKERS", "4")),
+    max_queue=int(os.getenv("WEBHOOK_MAX_QUEUE", "1000")),
+)
+
+WEBHOOK_UPDATES = REGISTRY.counter("webhook_updates_total", "Telegram updates received, by outcome", ("status",))
 
 @app.post("/webhook")
+@timed("main.telegram_webhook")
 async def telegram_webhook(req: Request):
     data = await req.json()
-    update = Update.de_json(data, bot)
-    await telegram_app.process_update(update)
-    return {"ok": True}
+    if WEBHOOK_MODE == "inline":
+        await process_raw_update(data)
+        WEBHOOK_UPDATES.inc(status="processed")
+        return {"ok": True}
+    # shed होने पर भी 200 - Telegram वही update दोबारा न भेजे
+    status = update_ingestor.submit(data)
+    WEBHOOK_UPDATES.inc(status=status)
+    return {"ok": True, "status": status}
 
 # final-test endpoint to force-send a telegram message via Bot API (use after deploy)
 @app.get("/final-test")
 async def final_test():
     try:
-        r = requests.post(
-            f"https://api.telegram.org/bot{TOKEN}/sendMessage",
-            data={"chat_id": CHAT_ID, "text": "✅ LR Saathi Final Test — Bot is Working!"}
-        )
-        return {"status": "message sent", "telegram_response": r.json()}
+        result = await telegram_api(TOKEN, "sendMessage", chat_id=CHAT_ID,
+                                    text="✅ LR Saathi Final Test — Bot is Working!")
+        return {"status": "message sent", "telegram_response": {"ok": True, "result": result}}
     except Exception as e:
         return {"error": str(e)}
 
+@app.get("/scheduler")
+async def scheduler_status():
+    return scheduler.metrics()
+
+@app.get("/ticks")
+async def ticks_status():
+    return tick_pipeline.metrics() if tick_pipeline is not None else {"enabled": False}
+
+@app.get("/leases")
+async def lease_status():
+    return lease_manager.metrics()
+
+@app.get("/metrics")
+async def metrics():
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
+
+# ---------------- Profiling (opt-in: PROFILING_ENABLED=1) ----------------
+# folded stacks → flamegraph.pl / speedscope
+def require_profiling():
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling disabled")
+
+@app.get("/debug/profile")
+async def profile_for(seconds: float = 10.0):
+    require_profiling()
+    if profiler.running:
+        raise HTTPException(status_code=409, detail="Profiler already running")
+    profiler.start()
+    try:
+        await asyncio.sleep(min(max(seconds, 0.1), PROFILE_MAX_SECONDS))
+    finally:
+        folded = profiler.stop()
+    return Response(folded, media_type="text/plain")
+
+@app.post("/debug/profile/start")
+async def profile_start():
+    require_profiling()
+    if profiler.running:
+        raise HTTPException(status_code=409, detail="Profiler already running")
+    profiler.start()
+    return {"status": "started", "interval": profiler.interval}
+
+@app.post("/debug/profile/stop")
+async def profile_stop():
+    require_profiling()
+    if not profiler.running:
+        raise HTTPException(status_code=409, detail="Profiler not running")
+    return Response(profiler.stop(), media_type="text/plain")
+
+@app.get("/alerts")
+async def alerts_status():
+    return alert_dispatcher.metrics()
+
+@app.get("/ingest")
+async def ingest_status():
+    return update_ingestor.metrics()
+
 @app.get("/")
 async def root():
     return {"message": "LR Saathi Running ✅"}
@@ -0,0 +1,86 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+# /debug/profile सिर्फ PROFILING_ENABLED=1 पर - प्रोडक्शन में डिफ़ॉल्ट बंद
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") in ("1", "true", "yes")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+
+
+class SamplingProfiler:
+    """
+    🔥 Wall-clock sampling profiler for all threads of the process.
+
+    A daemon thread reads `sys._current_frames()` every `interval` seconds and
+    counts each stack as `thread;module:function;...`. `folded()` returns the
+    counts in Brendan Gregg's folded format - feed it to flamegraph.pl or
+    speedscope. No tracing hooks, so the profiled code runs at full speed; the
+    cost is one stack walk per thread per sample.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            raise RuntimeError("Profiler already running")
+        self.stacks.clear()
+        self.samples = 0
+        self.duration = 0.0
+        self.started_at = time.time()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.duration = time.time() - self.started_at
+        return self.folded()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names: Dict[int, str] = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                self.stacks[self._fold(names.get(ident, str(ident)), frame)] += 1
+            self.samples += 1
+
+    @staticmethod
+    def _fold(thread_name: str, frame) -> str:
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+            frame = frame.f_back
+        parts.append(thread_name.replace(";", "_").replace(" ", "_"))
+        return ";".join(reversed(parts))
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def dump(self, path: str) -> str:
+        with open(path, "w") as handle:
+            handle.write(self.folded())
+        return path
+
+
+profiler = SamplingProfiler()
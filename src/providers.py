@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Optional
+
+from src.metrics import timed
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# yfinance जैसा ही आकार: .calls / .puts
+OptionChain = namedtuple("OptionChain", ["calls", "puts"])
+
+DEFAULT_MAX_WORKERS = int(os.getenv("DATA_MAX_WORKERS", "8"))
+DEFAULT_TIMEOUT = float(os.getenv("DATA_TIMEOUT", "20"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    🧵 Shared bounded thread pool for blocking market-data calls
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="market-data")
+        return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+# ---------------- Providers (blocking) ----------------
+
+class DataProvider:
+    """
+    📡 Blocking data source. Methods run inside the thread pool via AsyncMarketData.
+    """
+    name = "base"
+    max_concurrency = 4
+
+    def history(self, symbol: str, period: str = "1d", interval: str = "15m") -> pd.DataFrame:
+        raise NotImplementedError
+
+    def download(self, symbols: tuple, period: str = "1d", interval: str = "15m") -> pd.DataFrame:
+        raise NotImplementedError
+
+    def expiries(self, symbol: str) -> tuple:
+        raise NotImplementedError
+
+    def option_chain(self, symbol: str, expiry: str) -> OptionChain:
+        raise NotImplementedError
+
+    def bars(self, symbol: str, interval: str = "15m", tail: int = 200) -> pd.DataFrame:
+        # स्कैनर के लिए आखिरी `tail` बार्स
+        return self.history(symbol, period="5d", interval=interval).tail(tail)
+
+
+class YFinanceProvider(DataProvider):
+    name = "yfinance"
+    max_concurrency = int(os.getenv("YF_MAX_CONCURRENCY", "4"))
+
+    @timed("yfinance.history")
+    def history(self, symbol, period="1d", interval="15m"):
+        import yfinance as yf
+        return yf.Ticker(symbol).history(period=period, interval=interval)
+
+    @timed("yfinance.download")
+    def download(self, symbols, period="1d", interval="15m"):
+        import yfinance as yf
+        return yf.download(list(symbols), period=period, interval=interval, group_by='column',
+                           threads=False, progress=False)
+
+    @timed("yfinance.expiries")
+    def expiries(self, symbol):
+        import yfinance as yf
+        return tuple(yf.Ticker(symbol).options)
+
+    @timed("yfinance.option_chain")
+    def option_chain(self, symbol, expiry):
+        import yfinance as yf
+        chain = yf.Ticker(symbol).option_chain(expiry)
+        return OptionChain(chain.calls, chain.puts)
+
+    def bars(self, symbol, interval="15m", tail=200):
+        # लोकल बार स्टोर: सिर्फ आखिरी स्टोर्ड बार के बाद वाले बार्स फेच होते हैं
+        from src.bar_store import bar_store
+        return bar_store.load(symbol, interval, tail=tail)
+
+
+class FakeProvider(DataProvider):
+    """
+    🧪 Offline provider: deterministic random-walk bars and option chains per symbol.
+    `latency` (seconds) simulates a slow network; `calls` counts every fetch.
+    """
+    name = "fake"
+
+    INTERVAL_MINUTES = {'1m': 1, '5m': 5, '15m': 15, '30m': 30, '1h': 60, '4h': 240, '1d': 1440}
+    PERIOD_DAYS = {'1d': 1, '5d': 5, '1mo': 30, '3mo': 90, '6mo': 180, '1y': 365}
+
+    def __init__(self, latency: float = 0.0, base_price: float = 1000.0, max_concurrency: int = 4):
+        self.latency = latency
+        self.base_price = base_price
+        self.max_concurrency = max_concurrency
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, method: str) -> None:
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+        if self.latency:
+            threading.Event().wait(self.latency)
+
+    def _rng(self, *parts):
+        import numpy as np
+        digest = hashlib.sha256("|".join(map(str, parts)).encode()).digest()
+        return np.random.default_rng(int.from_bytes(digest[:8], "little"))
+
+    def history(self, symbol, period="1d", interval="15m"):
+        import numpy as np
+        import pandas as pd
+
+        self._record("history")
+        minutes = self.INTERVAL_MINUTES.get(interval, 15)
+        bars = max(int(self.PERIOD_DAYS.get(period, 1) * 1440 / minutes), 1)
+        rng = self._rng(symbol, interval)
+        close = self.base_price * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+        spread = close * rng.uniform(0, 0.003, bars)
+        index = pd.date_range(end=pd.Timestamp("2024-01-01", tz="UTC"), periods=bars, freq=f"{minutes}min")
+        return pd.DataFrame({
+            'Open': np.roll(close, 1),
+            'High': close + spread,
+            'Low': close - spread,
+            'Close': close,
+            'Volume': rng.uniform(1e3, 1e5, bars),
+        }, index=index)
+
+    def download(self, symbols, period="1d", interval="15m"):
+        import pandas as pd
+
+        frames = {sym: self.history(sym, period, interval) for sym in symbols}
+        return pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
+
+    def expiries(self, symbol):
+        self._record("expiries")
+        today = date.today()
+        thursday = today + timedelta(days=(3 - today.weekday()) % 7)
+        return tuple((thursday + timedelta(weeks=w)).isoformat() for w in range(4))
+
+    def option_chain(self, symbol, expiry):
+        import numpy as np
+        import pandas as pd
+
+        self._record("option_chain")
+        rng = self._rng(symbol, expiry)
+        strikes = self.base_price * (1 + np.arange(-10, 11) * 0.01)
+
+        def side():
+            return pd.DataFrame({
+                'strike': strikes,
+                'lastPrice': rng.uniform(1, 50, strikes.size),
+                'bid': rng.uniform(1, 40, strikes.size),
+                'ask': rng.uniform(41, 60, strikes.size),
+                'volume': rng.integers(0, 5000, strikes.size),
+                'openInterest': rng.integers(0, 50000, strikes.size),
+                'impliedVolatility': rng.uniform(0.1, 0.4, strikes.size),
+            })
+
+        return OptionChain(side(), side())
+
+
+# ---------------- Async facade ----------------
+
+class AsyncMarketData:
+    """
+    ⚡ Runs provider calls off the event loop with a per-provider concurrency limit,
+    a timeout, and request coalescing: concurrent calls with the same arguments
+    share one in-flight fetch.
+
+    A timed-out call still occupies its pool thread until the provider returns;
+    the bounded executor keeps that from growing without limit.
+
+    With a `cache` (MarketDataCache), results are keyed by
+    (kind, symbol, interval, period/expiry) and reused until the bar closes.
+    """
+
+    def __init__(self, provider: DataProvider, executor: Optional[ThreadPoolExecutor] = None,
+                 timeout: float = DEFAULT_TIMEOUT, cache=None):
+        self.provider = provider
+        self.timeout = timeout
+        self.cache = cache
+        self._executor = executor
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def _fetch(self, method: str, args: tuple, cache_key: tuple):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.provider.max_concurrency)
+        loop = asyncio.get_running_loop()
+        call = partial(getattr(self.provider, method), *args)
+        if self.cache is not None:
+            call = partial(self.cache.get_or_fetch, cache_key, call)
+        async with self._semaphore:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._executor or get_executor(), call), self.timeout
+            )
+
+    async def _call(self, method: str, args: tuple, cache_key: tuple):
+        key = (method,) + args
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(method, args, cache_key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield: एक caller के cancel होने से साझा fetch cancel न हो
+        return await asyncio.shield(task)
+
+    async def history(self, symbol: str, period: str = "1d", interval: str = "15m") -> pd.DataFrame:
+        return await self._call("history", (symbol, period, interval), ("history", symbol, interval, period))
+
+    async def download(self, symbols, period: str = "1d", interval: str = "15m") -> pd.DataFrame:
+        symbols = tuple(symbols)
+        return await self._call("download", (symbols, period, interval), ("download", symbols, interval, period))
+
+    async def expiries(self, symbol: str) -> tuple:
+        return await self._call("expiries", (symbol,), ("expiries", symbol, "1d"))
+
+    async def option_chain(self, symbol: str, expiry: str) -> OptionChain:
+        return await self._call("option_chain", (symbol, expiry), ("option_chain", symbol, None, expiry))
+
+    async def bars(self, symbol: str, interval: str = "15m", tail: int = 200) -> pd.DataFrame:
+        return await self._call("bars", (symbol, interval, tail), ("store", symbol, interval, tail))
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
@@ -1,24 +1,180 @@
-import yfinance as yf
+from typing import Optional
+
+import time
+
+import numpy as np
 import pandas as pd
-import ta
 
-def check_signals():
-    signals = []
+from src.bar_store import bar_store
+from src.cache import INTERVAL_SECONDS, market_cache
+from src.metrics import timed
+from src.symbols import symbol_registry
+from technical import IndicatorBatch, TechnicalAnalysis
 
-    df = yf.download("BTC-USD", period="1d", interval="15m")
+# EMA20 + RSI + Volume MA - एक ही बैच पास में, साझा Series के साथ
+SIGNAL_SPECS = [
+    {'kind': 'ema', 'window': 20, 'name': 'EMA20'},
+    {'kind': 'rsi', 'window': 14, 'name': 'RSI'},
+    {'kind': 'volume_ma', 'window': 20, 'name': 'Volume_MA'},
+]
+
+BUY_MESSAGE = "🔔 [BUY SIGNAL] {symbol} is bullish with EMA+RSI+Volume confirmation."
+SELL_MESSAGE = "🔻 [SELL SIGNAL] {symbol} is bearish with EMA+RSI+Volume confirmation."
+
+def closed_bars(df: pd.DataFrame, interval: Optional[str], now: Optional[float] = None) -> pd.DataFrame:
+    # अभी बन रहा बार (start + interval > now) हटाएँ - बार-क्लोज़ के कुछ सेकंड बाद उसका वॉल्यूम लगभग शून्य होता है
+    step = INTERVAL_SECONDS.get(interval or '')
+    if not step or df.empty:
+        return df
+    now = time.time() if now is None else now
+    starts = pd.DatetimeIndex(df.index).as_unit('ns').asi8
+    return df[starts + step * 10**9 <= int(now * 10**9)]
+
+def signals_from_frame(df: pd.DataFrame, label: str = "BTC", interval: Optional[str] = None,
+                       now: Optional[float] = None) -> list:
+    # interval दिया हो तो सिर्फ बंद हो चुके बार्स पर नियम
+    df = closed_bars(df, interval, now)
     if df.empty or len(df) < 50:
-        return signals
+        return []
+
+    batch = IndicatorBatch(df)
+    indicators = batch.compute(SIGNAL_SPECS)
+    indicators['Close'] = batch.series('close')
+    indicators['Volume'] = batch.series('volume')
+
+    latest = indicators.iloc[-1]
+    return signals_from_values(label, latest['Close'], latest['EMA20'], latest['RSI'],
+                               latest['Volume'], latest['Volume_MA'])
+
+def signals_from_values(label: str, close: float, ema: float, rsi: float,
+                        volume: float, volume_ma: float) -> list:
+    # वही नियम, सिर्फ आखिरी बार के scalars पर (tick pipeline bar-close पर यही बुलाती है)
+    if close > ema and rsi < 70 and volume > volume_ma:
+        return [BUY_MESSAGE.format(symbol=label)]
+    if close < ema and rsi > 30 and volume > volume_ma:
+        return [SELL_MESSAGE.format(symbol=label)]
+    return []
+
+@timed("scanner.check_symbol")
+def check_symbol(symbol: str, interval: str = "15m", label: Optional[str] = None) -> list:
+    # लोकल बार स्टोर: सिर्फ आखिरी स्टोर्ड बार के बाद वाले बार्स फेच होते हैं, हर बार पर एक बार
+    ticker = symbol_registry.to_yahoo(symbol)
+    df = market_cache.get_or_fetch(
+        ("store", ticker, interval, 200),  # tail भी key में - /options का 1-बार फ्रेम यहाँ न आए
+        lambda: bar_store.load(ticker, interval, tail=200)
+    )
+    return signals_from_frame(df, label or symbol, interval)
+
+@timed("scanner.check_symbol_async")
+async def check_symbol_async(market, symbol: str, interval: str = "15m", label: Optional[str] = None) -> list:
+    """
+    check_symbol का non-blocking वर्ज़न - एक ही सिंबल के साथ-साथ आए स्कैन एक ही fetch साझा करते हैं
+    """
+    ticker = symbol_registry.to_yahoo(symbol)
+    df = await market.bars(ticker, interval, tail=200)
+    return signals_from_frame(df, label or symbol, interval)
+
+@timed("scanner.check_signals")
+def check_signals():
+    return check_symbol("BTC-USD", "15m", "BTC")
+
+@timed("scanner.check_signals_async")
+async def check_signals_async(market, symbol: str = "BTC-USD", label: str = "BTC") -> list:
+    """
+    check_signals का non-blocking वर्ज़न - fetch AsyncMarketData के thread pool में
+    """
+    df = await market.history(symbol, period="1d", interval="15m")
+    return signals_from_frame(df, label, "15m")
 
-    df['EMA20'] = ta.trend.ema_indicator(df['Close'], window=20).ema_indicator()
-    df['RSI'] = ta.momentum.RSIIndicator(df['Close']).rsi()
-    df['Volume_MA'] = df['Volume'].rolling(window=20).mean()
 
-    latest = df.iloc[-1]
+# ---------------- मल्टी-सिंबल (cross-sectional) स्कैनर ----------------
 
-    if latest['Close'] > latest['EMA20'] and latest['RSI'] < 70 and latest['Volume'] > latest['Volume_MA']:
-        signals.append("🔔 [BUY SIGNAL] BTC is bullish with EMA+RSI+Volume confirmation.")
+def align_bars(close: pd.DataFrame, volume: pd.DataFrame, min_bars: int = 50, lookback: int = 200):
+    """
+    (time × symbol) फ्रेम्स को हर सिंबल के आखिरी बार पर right-align करके dense 2-D arrays बनाएँ।
+    क्रिप्टो 24x7 और NSE अलग टाइम पर ट्रेड होते हैं, इसलिए timestamp की जगह बार-इंडेक्स पर align करते हैं।
+    """
+    close_values = close.to_numpy(dtype=float)
+    volume_values = volume.reindex(columns=close.columns).to_numpy(dtype=float)
+    valid = ~np.isnan(close_values)
 
-    elif latest['Close'] < latest['EMA20'] and latest['RSI'] > 30 and latest['Volume'] > latest['Volume_MA']:
-        signals.append("🔻 [SELL SIGNAL] BTC is bearish with EMA+RSI+Volume confirmation.")
+    # stable argsort: invalid (False) रो ऊपर, valid रो अपने क्रम में नीचे
+    order = np.argsort(valid, axis=0, kind='stable')
+    close_values = np.take_along_axis(close_values, order, axis=0)
+    volume_values = np.nan_to_num(np.take_along_axis(volume_values, order, axis=0))
 
+    counts = valid.sum(axis=0)
+    keep = counts >= min_bars
+    if not keep.any():
+        return np.empty((0, 0)), np.empty((0, 0)), []
+
+    length = int(min(counts[keep].min(), lookback))
+    symbols = [str(sym) for sym in close.columns[keep]]
+    return close_values[-length:, keep], volume_values[-length:, keep], symbols
+
+
+def evaluate_signals(close: np.ndarray, volume: np.ndarray, symbols: list,
+                     ema_window: int = 20, rsi_window: int = 14, volume_window: int = 20,
+                     rsi_overbought: float = 70, rsi_oversold: float = 30) -> list:
+    """
+    check_signals वाले EMA20/RSI/Volume-MA नियम सभी सिंबल्स पर एक साथ (कॉलम-वाइज़) चलाएँ
+    """
+    if close.size == 0:
+        return []
+
+    ema = pd.DataFrame(close).ewm(span=ema_window, adjust=False).mean().to_numpy()[-1]
+    rsi = TechnicalAnalysis.calculate_rsi_series(close, rsi_window, last_only=True)
+    volume_ma = volume[-volume_window:].mean(axis=0)
+    last_close, last_volume = close[-1], volume[-1]
+
+    volume_ok = last_volume > volume_ma
+    buy = (last_close > ema) & (rsi < rsi_overbought) & volume_ok
+    sell = ~buy & (last_close < ema) & (rsi > rsi_oversold) & volume_ok
+
+    signals = []
+    for side, mask, template in (('BUY', buy, BUY_MESSAGE), ('SELL', sell, SELL_MESSAGE)):
+        for i in np.flatnonzero(mask):
+            signals.append({
+                'symbol': symbols[i],
+                'signal': side,
+                'message': template.format(symbol=symbols[i]),
+                'close': round(float(last_close[i]), 2),
+                'ema': round(float(ema[i]), 2),
+                'rsi': float(rsi[i]),
+            })
     return signals
+
+
+@timed("scanner.scan_watchlist")
+def scan_watchlist(symbols: list, period: str = "5d", interval: str = "15m", min_bars: int = 50) -> list:
+    """
+    पूरी वॉचलिस्ट एक yf.download कॉल में लोड करके सारे ट्रिगर हुए सिग्नल्स लौटाएँ
+    """
+    import yfinance as yf
+
+    df = market_cache.get_or_fetch(
+        ("download", tuple(symbols), interval, period),
+        lambda: yf.download(symbols, period=period, interval=interval, group_by='column',
+                            threads=True, progress=False)
+    )
+    return signals_from_watchlist_frame(df, symbols, min_bars, interval)
+
+@timed("scanner.scan_watchlist_async")
+async def scan_watchlist_async(market, symbols: list, period: str = "5d", interval: str = "15m",
+                               min_bars: int = 50) -> list:
+    df = await market.download(symbols, period=period, interval=interval)
+    return signals_from_watchlist_frame(df, symbols, min_bars, interval)
+
+def signals_from_watchlist_frame(df: pd.DataFrame, symbols: list, min_bars: int = 50,
+                                 interval: Optional[str] = None, now: Optional[float] = None) -> list:
+    df = closed_bars(df, interval, now)
+    if df.empty:
+        return []
+
+    close, volume = df['Close'], df['Volume']
+    if isinstance(close, pd.Series):
+        # सिंगल सिंबल पर yfinance फ्लैट कॉलम देता है
+        close, volume = close.to_frame(symbols[0]), volume.to_frame(symbols[0])
+
+    close_2d, volume_2d, kept = align_bars(close, volume, min_bars=min_bars)
+    return evaluate_signals(close_2d, volume_2d, kept)
@@ -0,0 +1,198 @@
+import asyncio
+import heapq
+import logging
+import time
+import zlib
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.cache import bar_expiry
+from src.leases import LeaseManager
+from src.providers import get_executor
+
+logger = logging.getLogger(__name__)
+
+
+class ScanJob:
+    """
+    📋 One scan: run `rule(symbol)` shortly after every `interval` bar closes.
+
+    `rule` is either a blocking function (runs in the market-data thread pool)
+    or a coroutine function; it returns a list of alert messages.
+    """
+
+    def __init__(self, name: str, symbol: str, interval: str, rule: Callable,
+                 offset: Optional[float] = None):
+        self.name = name
+        self.symbol = symbol
+        self.interval = interval
+        self.rule = rule
+        self.offset = offset
+        self.running = False
+        self.runs = 0
+        self.skipped = 0
+        self.standby = 0
+        self.errors = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.last_duration = 0.0
+        self.total_duration = 0.0
+        self.next_run: Optional[float] = None
+
+    def metrics(self) -> dict:
+        return {
+            'symbol': self.symbol,
+            'interval': self.interval,
+            'running': self.running,
+            'runs': self.runs,
+            'skipped': self.skipped,
+            'standby': self.standby,
+            'errors': self.errors,
+            'last_lag': round(self.last_lag, 3),
+            'max_lag': round(self.max_lag, 3),
+            'last_duration': round(self.last_duration, 3),
+            'avg_duration': round(self.total_duration / self.runs, 3) if self.runs else 0.0,
+            'next_run': self.next_run,
+        }
+
+
+class Scheduler:
+    """
+    ⏰ Single-task scheduler for many ScanJobs.
+
+    - runs are aligned to bar-close boundaries (+ `settle_delay` so the provider has the bar)
+    - each job gets a stable offset in [0, spread) so jobs don't all fire together
+    - a job whose previous run is still going is skipped, not queued
+    - blocking rules run off the event loop, at most `max_concurrency` at a time
+    - one heap + one loop task, regardless of how many jobs are registered
+    - with `leases`, a job runs only on the worker holding its `scan:<name>`
+      lease; the others keep the schedule and take over when the owner dies
+    """
+
+    def __init__(self, on_result: Optional[Callable[[ScanJob, List[str]], Awaitable[None]]] = None,
+                 max_concurrency: int = 4, settle_delay: float = 2.0, spread: float = 30.0,
+                 timer: Callable[[], float] = time.time, leases: Optional[LeaseManager] = None):
+        self.on_result = on_result
+        self.max_concurrency = max_concurrency
+        self.settle_delay = settle_delay
+        self.spread = spread
+        self.timer = timer
+        self.leases = leases
+        self.jobs: Dict[str, ScanJob] = {}
+        self._heap: list = []
+        self._seq = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running_tasks: set = set()
+
+    def _offset(self, job: ScanJob) -> float:
+        if job.offset is not None:
+            return job.offset
+        # नाम से stable offset - रीस्टार्ट के बाद भी वही स्लॉट
+        return (zlib.crc32(job.name.encode()) % 1000) / 1000 * self.spread
+
+    def _schedule(self, job: ScanJob, now: float) -> None:
+        # अगला bar-close (+settle +offset) जो now के बाद हो
+        shift = self.settle_delay + self._offset(job)
+        job.next_run = bar_expiry(job.interval, now - shift) + shift
+        self._seq += 1
+        heapq.heappush(self._heap, (job.next_run, self._seq, job.name))
+
+    @staticmethod
+    def lease_name(job_name: str) -> str:
+        return f"scan:{job_name}"
+
+    def add_job(self, job: ScanJob) -> ScanJob:
+        if job.name in self.jobs:
+            raise ValueError(f"Job already registered: {job.name}")
+        self.jobs[job.name] = job
+        if self.leases is not None:
+            self.leases.track(self.lease_name(job.name))
+        self._schedule(job, self.timer())
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    def remove_job(self, name: str) -> None:
+        # heap की पुरानी एंट्री लूप में अपने आप छूट जाती है
+        if self.jobs.pop(name, None) is not None and self.leases is not None:
+            self.leases.untrack(self.lease_name(name))
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._loop())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._running_tasks):
+            task.cancel()
+
+    async def _loop(self) -> None:
+        logger.info("Scheduler started with %d jobs", len(self.jobs))
+        while True:
+            now = self.timer()
+            while self._heap and self._heap[0][0] <= now:
+                scheduled, _, name = heapq.heappop(self._heap)
+                job = self.jobs.get(name)
+                if job is None or job.next_run != scheduled:
+                    continue
+                if self.leases is not None and not self.leases.owns(self.lease_name(name)):
+                    # दूसरा worker इस जॉब का owner है - यहाँ सिर्फ शेड्यूल आगे बढ़ाएँ
+                    job.standby += 1
+                elif job.running:
+                    job.skipped += 1
+                    logger.warning("Skipping %s: previous run still in progress", name)
+                else:
+                    self._launch(job, scheduled)
+                self._schedule(job, now)
+
+            delay = self._heap[0][0] - now if self._heap else 3600
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(delay, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    def _launch(self, job: ScanJob, scheduled: float) -> None:
+        job.running = True
+        task = asyncio.create_task(self._execute(job, scheduled))
+        self._running_tasks.add(task)
+        task.add_done_callback(self._running_tasks.discard)
+
+    async def _execute(self, job: ScanJob, scheduled: float) -> None:
+        try:
+            async with self._semaphore:
+                started = self.timer()
+                job.last_lag = started - scheduled
+                job.max_lag = max(job.max_lag, job.last_lag)
+                try:
+                    if asyncio.iscoroutinefunction(job.rule):
+                        messages = await job.rule(job.symbol)
+                    else:
+                        loop = asyncio.get_running_loop()
+                        messages = await loop.run_in_executor(get_executor(), job.rule, job.symbol)
+                except Exception:
+                    job.errors += 1
+                    logger.exception("Scan job %s failed", job.name)
+                    messages = []
+                finally:
+                    job.runs += 1
+                    job.last_duration = self.timer() - started
+                    job.total_duration += job.last_duration
+
+            if messages and self.on_result is not None:
+                await self.on_result(job, messages)
+        finally:
+            job.running = False
+
+    def metrics(self) -> Dict[str, dict]:
+        return {name: job.metrics() for name, job in self.jobs.items()}
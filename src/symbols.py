@@ -0,0 +1,124 @@
+import csv
+import os
+from bisect import bisect_left
+from collections import namedtuple
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# पूरी NSE/crypto यूनिवर्स वाली फ़ाइल: SYMBOLS_FILE=/path/to/symbols.csv (वही कॉलम)
+SYMBOLS_FILE = os.getenv("SYMBOLS_FILE", os.path.join(os.path.dirname(__file__), "data", "symbols.csv"))
+
+# yfinance इंटरवल नाम; एक बार बना frozenset - O(1) जाँच
+VALID_TIMEFRAMES = frozenset({'1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h', '4h', '1d', '1w', '1wk'})
+
+Instrument = namedtuple(
+    "Instrument", ["symbol", "yahoo", "asset_class", "exchange", "lot_size", "tick_size", "aliases"]
+)
+
+
+def normalize(text: str) -> str:
+    # केस और स्पेस से फर्क नहीं: "nifty 50" == "NIFTY50"
+    return "".join(str(text).split()).upper()
+
+
+class SymbolRegistry:
+    """
+    📇 Immutable symbol universe, built once.
+
+    - `resolve` / `in`: one dict lookup over symbol, Yahoo ticker and every alias
+    - `search(prefix)`: bisect over the sorted key tuple, for bot autocomplete
+    - an alias that points at two different instruments is a load-time error
+    """
+
+    def __init__(self, instruments: Iterable[Instrument]):
+        index: Dict[str, Instrument] = {}
+        by_symbol: Dict[str, Instrument] = {}
+        by_class: Dict[str, List[Instrument]] = {}
+        for instrument in instruments:
+            if instrument.symbol in by_symbol:
+                raise ValueError(f"Duplicate symbol {instrument.symbol}")
+            by_symbol[instrument.symbol] = instrument
+            for key in (instrument.symbol, instrument.yahoo) + instrument.aliases:
+                key = normalize(key)
+                existing = index.get(key)
+                if existing is not None and existing.symbol != instrument.symbol:
+                    raise ValueError(f"Symbol key {key!r} maps to both {existing.symbol} and {instrument.symbol}")
+                index[key] = instrument
+            by_class.setdefault(instrument.asset_class, []).append(instrument)
+
+        self._index = MappingProxyType(index)
+        self._keys: Tuple[str, ...] = tuple(sorted(index))
+        self._symbols: Tuple[Instrument, ...] = tuple(by_symbol[s] for s in sorted(by_symbol))
+        self._by_class = MappingProxyType({k: tuple(v) for k, v in by_class.items()})
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __iter__(self) -> Iterator[Instrument]:
+        return iter(self._symbols)
+
+    def __contains__(self, text) -> bool:
+        return normalize(text) in self._index
+
+    def resolve(self, text: str) -> Optional[Instrument]:
+        return self._index.get(normalize(text))
+
+    def to_yahoo(self, text: str, default_suffix: str = ".NS") -> str:
+        """
+        Yahoo ticker for `text`. Unknown bare names are treated as NSE stocks
+        (`.NS`); anything already ticker-shaped (`^`, `.`, `-`, `=`) passes through.
+        """
+        instrument = self.resolve(text)
+        if instrument is not None:
+            return instrument.yahoo
+        text = text.strip().upper()
+        if any(ch in text for ch in "^.-="):
+            return text
+        return f"{text}{default_suffix}"
+
+    def by_class(self, asset_class: str) -> Tuple[Instrument, ...]:
+        return self._by_class.get(asset_class.upper(), ())
+
+    def search(self, prefix: str, limit: int = 10) -> List[Instrument]:
+        """Instruments whose symbol, ticker or alias starts with `prefix` (symbol matches first)."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        primary, secondary, seen = [], [], set()
+        for i in range(bisect_left(self._keys, prefix), len(self._keys)):
+            key = self._keys[i]
+            if not key.startswith(prefix):
+                break
+            instrument = self._index[key]
+            if instrument.symbol in seen:
+                continue
+            seen.add(instrument.symbol)
+            (primary if normalize(instrument.symbol).startswith(prefix) else secondary).append(instrument)
+            if len(primary) >= limit:
+                break
+        return (primary + secondary)[:limit]
+
+
+def _parse_number(value: str, kind):
+    value = (value or "").strip()
+    return kind(value) if value else None
+
+
+def load_registry(path: str = SYMBOLS_FILE) -> SymbolRegistry:
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    return SymbolRegistry(
+        Instrument(
+            symbol=row["symbol"].strip().upper(),
+            yahoo=row["yahoo"].strip(),
+            asset_class=row["asset_class"].strip().upper(),
+            exchange=row["exchange"].strip().upper(),
+            lot_size=_parse_number(row.get("lot_size"), int),
+            tick_size=_parse_number(row.get("tick_size"), float),
+            aliases=tuple(a.strip() for a in (row.get("aliases") or "").split("|") if a.strip()),
+        )
+        for row in rows
+    )
+
+
+symbol_registry = load_registry()
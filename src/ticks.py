@@ -0,0 +1,410 @@
+import asyncio
+import csv
+import json
+import logging
+import time
+from collections import namedtuple
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.cache import INTERVAL_SECONDS
+from src.symbols import symbol_registry
+from technical import StreamingEMA, StreamingRSI
+
+logger = logging.getLogger(__name__)
+
+Tick = namedtuple("Tick", ["symbol", "ts", "price", "volume"])  # ts: epoch seconds
+
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+# ---------------- Tick sources ----------------
+
+class TickSource:
+    """
+    📡 Async stream of Ticks. `realtime` sources are paced by a clock, so the
+    pipeline also closes bars on a timer when the market goes quiet. `clock()`
+    is "now" in the ticks' own time base (wall clock for live feeds).
+    """
+
+    realtime = True
+
+    def clock(self) -> float:
+        return time.time()
+
+    def stream(self) -> AsyncIterator[Tick]:
+        raise NotImplementedError
+
+
+class ReplayTickSource(TickSource):
+    """
+    CSV replay (`symbol,ts,price,volume`, ts in epoch seconds) for offline tests.
+    `speed=0` replays as fast as possible; `speed=1` keeps the original spacing.
+
+    A paced replay's `clock()` is the replayed time (last tick ts + scaled
+    elapsed time), never past the tick it is waiting to emit, so timer flushes
+    can't close a historical bar before its own ticks arrive.
+    """
+
+    def __init__(self, path: str, speed: float = 0.0):
+        self.path = path
+        self.speed = speed
+        self.realtime = speed > 0
+        self._replay_ts: Optional[float] = None
+        self._replay_wall = 0.0
+        self._pending_ts: Optional[float] = None
+
+    def clock(self) -> float:
+        if self._replay_ts is None:
+            return float("-inf")
+        now = self._replay_ts + (time.monotonic() - self._replay_wall) * self.speed
+        return now if self._pending_ts is None else min(now, self._pending_ts)
+
+    async def stream(self) -> AsyncIterator[Tick]:
+        previous = None
+        with open(self.path, newline="") as handle:
+            for i, row in enumerate(csv.DictReader(handle)):
+                tick = Tick(row["symbol"], float(row["ts"]), float(row["price"]), float(row["volume"] or 0))
+                if self.speed > 0 and previous is not None and tick.ts > previous:
+                    self._pending_ts = tick.ts
+                    await asyncio.sleep((tick.ts - previous) / self.speed)
+                elif i % 1000 == 0:
+                    await asyncio.sleep(0)  # बड़ी फ़ाइल पर भी event loop को मौका
+                previous = tick.ts
+                # रीप्ले घड़ी इसी टिक से आगे बढ़ती है
+                self._replay_ts, self._replay_wall, self._pending_ts = tick.ts, time.monotonic(), None
+                yield tick
+
+
+def binance_trade_parser(message: dict) -> Iterable[Tick]:
+    """Binance `<pair>@trade` payload (raw or combined stream) → Tick; BTCUSDT → BTC via registry."""
+    data = message.get("data", message)
+    if data.get("e") != "trade":
+        return ()
+    instrument = symbol_registry.resolve(data["s"])
+    symbol = instrument.symbol if instrument else data["s"]
+    return (Tick(symbol, data["T"] / 1000.0, float(data["p"]), float(data["q"])),)
+
+
+class WebSocketTickSource(TickSource):
+    """
+    Websocket adapter (aiohttp): every text frame is JSON-decoded and handed to
+    `parse`, which returns zero or more Ticks. Reconnects with capped backoff.
+    """
+
+    def __init__(self, url: str, parse: Callable[[dict], Iterable[Tick]] = binance_trade_parser,
+                 subscribe: Optional[dict] = None, reconnect_delay: float = 1.0, max_delay: float = 60.0):
+        self.url = url
+        self.parse = parse
+        self.subscribe = subscribe
+        self.reconnect_delay = reconnect_delay
+        self.max_delay = max_delay
+        self.reconnects = 0
+
+    async def stream(self) -> AsyncIterator[Tick]:
+        import aiohttp
+
+        delay = self.reconnect_delay
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    async with session.ws_connect(self.url, heartbeat=30) as ws:
+                        if self.subscribe is not None:
+                            await ws.send_json(self.subscribe)
+                        delay = self.reconnect_delay
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                for tick in self.parse(json.loads(msg.data)):
+                                    yield tick
+                            elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    logger.warning("Tick stream %s failed: %s", self.url, e)
+                self.reconnects += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_delay)
+
+
+# ---------------- Bars ----------------
+
+class BarSeries:
+    """
+    🕯️ OHLCV bars for one (symbol, interval), built tick by tick.
+
+    - the forming bar is plain Python floats; a tick only does compares/adds
+    - closed bars go into preallocated numpy ring buffers (`capacity` bars,
+      timestamps int64 ns like BarStore), so nothing is allocated per tick
+    - on close the bar feeds StreamingEMA / StreamingRSI and an O(1) rolling
+      volume sum; `snapshot()` is what scanner rules see
+    """
+
+    def __init__(self, symbol: str, interval: str, capacity: int = 500,
+                 ema_window: int = 20, rsi_window: int = 14, volume_window: int = 20):
+        if interval not in INTERVAL_SECONDS:
+            raise ValueError(f"Unknown interval: {interval}")
+        if capacity < volume_window:
+            raise ValueError("capacity must cover volume_window")
+        self.symbol = symbol
+        self.interval = interval
+        self.step = INTERVAL_SECONDS[interval]
+        self.capacity = capacity
+        self.timestamp = np.zeros(capacity, dtype=np.int64)
+        self.columns = {name: np.zeros(capacity, dtype=np.float64) for name in BAR_COLUMNS}
+        self.count = 0
+        self.late_ticks = 0
+
+        self.start: Optional[int] = None
+        self.last_closed = -1
+        self.open = self.high = self.low = self.close = self.volume = 0.0
+
+        self.ema = StreamingEMA(ema_window)
+        self.rsi = StreamingRSI(rsi_window)
+        self.volume_window = volume_window
+        self.volume_sum = 0.0
+
+    def add_tick(self, ts: float, price: float, volume: float) -> bool:
+        """Returns True when this tick closed the previous bar."""
+        start = int(ts // self.step) * self.step
+        if start == self.start:
+            if price > self.high:
+                self.high = price
+            elif price < self.low:
+                self.low = price
+            self.close = price
+            self.volume += volume
+            return False
+        if start <= self.last_closed or (self.start is not None and start < self.start):
+            # बंद हो चुके बार का देर से आया टिक - बार दोबारा नहीं खुलता
+            self.late_ticks += 1
+            return False
+        closed = self.start is not None
+        if closed:
+            self._close_bar()
+        self.start = start
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+        return closed
+
+    def flush(self, now: float) -> bool:
+        """Close the forming bar once its period has ended (quiet market)."""
+        if self.start is not None and now >= self.start + self.step:
+            self._close_bar()
+            self.start = None
+            return True
+        return False
+
+    def _close_bar(self) -> None:
+        self.last_closed = self.start
+        self.append(self.start, self.open, self.high, self.low, self.close, self.volume)
+
+    def append(self, start: int, open_: float, high: float, low: float, close: float, volume: float) -> None:
+        pos = self.count % self.capacity
+        if self.count >= self.volume_window:
+            # जो वॉल्यूम window से बाहर जा रहा है (ring में अभी भी मौजूद)
+            self.volume_sum -= self.columns['volume'][(self.count - self.volume_window) % self.capacity]
+        self.timestamp[pos] = start * 1_000_000_000
+        self.columns['open'][pos] = open_
+        self.columns['high'][pos] = high
+        self.columns['low'][pos] = low
+        self.columns['close'][pos] = close
+        self.columns['volume'][pos] = volume
+        self.volume_sum += volume
+        self.count += 1
+        self.ema.update(close)
+        self.rsi.update(close)
+
+    def warm_up(self, bars: Dict[str, np.ndarray]) -> int:
+        """Seed ring + indicators from BarStore.read() arrays (oldest first)."""
+        timestamps = bars['timestamp'][-self.capacity:]
+        offset = len(bars['timestamp']) - len(timestamps)
+        # इंडिकेटर्स पूरी हिस्ट्री से, ring सिर्फ आखिरी capacity बार्स
+        for close in bars['close'][:offset]:
+            self.ema.update(close)
+            self.rsi.update(close)
+        for i in range(len(timestamps)):
+            j = offset + i
+            self.append(int(timestamps[i]) // 1_000_000_000, bars['open'][j], bars['high'][j],
+                        bars['low'][j], bars['close'][j], bars['volume'][j])
+        if len(timestamps):
+            self.last_closed = int(timestamps[-1]) // 1_000_000_000
+        return len(timestamps)
+
+    def last(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Last `n` closed bars, oldest first (copies - off the tick path)."""
+        size = min(self.count, self.capacity)
+        n = size if n is None else min(n, size)
+        idx = (np.arange(self.count - n, self.count)) % self.capacity
+        out = {'timestamp': self.timestamp[idx]}
+        out.update({name: values[idx] for name, values in self.columns.items()})
+        return out
+
+    def snapshot(self) -> Optional[dict]:
+        if self.count == 0:
+            return None
+        pos = (self.count - 1) % self.capacity
+        window = min(self.count, self.volume_window)
+        return {
+            'symbol': self.symbol,
+            'interval': self.interval,
+            'start': int(self.timestamp[pos] // 1_000_000_000),
+            'bars': self.count,
+            'close': float(self.columns['close'][pos]),
+            'volume': float(self.columns['volume'][pos]),
+            'ema': self.ema.value,
+            'rsi': self.rsi.value,
+            'volume_ma': float(self.volume_sum / window),
+        }
+
+
+class BarAggregator:
+    """One symbol → a BarSeries per interval; every tick updates all timeframes."""
+
+    def __init__(self, symbol: str, intervals: Sequence[str] = ('1m', '5m', '15m'), capacity: int = 500):
+        self.symbol = symbol
+        self.series = {interval: BarSeries(symbol, interval, capacity) for interval in intervals}
+
+    def add_tick(self, ts: float, price: float, volume: float) -> List[BarSeries]:
+        return [s for s in self.series.values() if s.add_tick(ts, price, volume)]
+
+    def flush(self, now: float) -> List[BarSeries]:
+        return [s for s in self.series.values() if s.flush(now)]
+
+
+# ---------------- Pipeline ----------------
+
+def ema_rsi_volume_rule(series: BarSeries) -> List[str]:
+    # scanner का EMA20/RSI/Volume-MA नियम, streaming वैल्यूज़ पर
+    from src.scanner import signals_from_values
+
+    bar = series.snapshot()
+    if bar is None or bar['ema'] is None or bar['rsi'] is None:
+        return []
+    return signals_from_values(f"{series.symbol} {series.interval}", bar['close'], bar['ema'], bar['rsi'],
+                               bar['volume'], bar['volume_ma'])
+
+
+class TickPipeline:
+    """
+    ⚡ Ticks → multi-timeframe bars → indicators → scanner rules on bar close.
+
+    - `rules(series) -> [messages]` run only on bar close, after `min_bars` bars
+      (same warm-up as signals_from_frame)
+    - realtime sources: a timer closes bars whose period ended without a new tick,
+      judged by `timer` (default: the source's own clock, so replays use replayed time)
+    - `on_result(series, messages)` is awaited for every bar that produced alerts
+    - `history(symbol, interval)` (optional, e.g. BarStore.read) seeds a new
+      symbol's bars + indicators so rules don't wait `min_bars` live bars
+    """
+
+    def __init__(self, source: TickSource, intervals: Sequence[str] = ('1m', '5m', '15m'),
+                 rules: Optional[List[Callable[[BarSeries], List[str]]]] = None,
+                 on_result: Optional[Callable[[BarSeries, List[str]], Awaitable[None]]] = None,
+                 capacity: int = 500, min_bars: int = 50, flush_interval: float = 1.0,
+                 history: Optional[Callable[[str, str], Dict[str, np.ndarray]]] = None,
+                 timer: Optional[Callable[[], float]] = None):
+        self.source = source
+        self.intervals = tuple(intervals)
+        self.rules = rules if rules is not None else [ema_rsi_volume_rule]
+        self.on_result = on_result
+        self.capacity = capacity
+        self.min_bars = min_bars
+        self.flush_interval = flush_interval
+        self.history = history
+        self.timer = timer or source.clock
+        self.aggregators: Dict[str, BarAggregator] = {}
+        self.ticks = 0
+        self.bars_closed = 0
+        self.alerts = 0
+        self.rule_errors = 0
+        self.last_tick: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def aggregator(self, symbol: str) -> BarAggregator:
+        agg = self.aggregators.get(symbol)
+        if agg is None:
+            agg = self.aggregators[symbol] = BarAggregator(symbol, self.intervals, self.capacity)
+            if self.history is not None:
+                for interval, series in agg.series.items():
+                    try:
+                        series.warm_up(self.history(symbol, interval))
+                    except Exception:
+                        logger.exception("Warm-up failed for %s %s", symbol, interval)
+        return agg
+
+    def warm_up(self, symbol: str, interval: str, bars: Dict[str, np.ndarray]) -> int:
+        return self.aggregator(symbol).series[interval].warm_up(bars)
+
+    async def _closed(self, closed: List[BarSeries]) -> None:
+        for series in closed:
+            self.bars_closed += 1
+            if series.count < self.min_bars:
+                continue
+            messages = []
+            for rule in self.rules:
+                try:
+                    messages.extend(rule(series))
+                except Exception:
+                    self.rule_errors += 1
+                    logger.exception("Rule %s failed on %s %s", getattr(rule, "__name__", rule),
+                                     series.symbol, series.interval)
+            if messages:
+                self.alerts += len(messages)
+                if self.on_result is not None:
+                    await self.on_result(series, messages)
+
+    async def process(self, tick: Tick) -> None:
+        self.ticks += 1
+        self.last_tick = tick.ts
+        closed = self.aggregator(tick.symbol).add_tick(tick.ts, tick.price, tick.volume)
+        if closed:
+            await self._closed(closed)
+
+    async def flush(self, now: float) -> None:
+        for agg in list(self.aggregators.values()):
+            closed = agg.flush(now)
+            if closed:
+                await self._closed(closed)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush(self.timer())
+
+    async def run(self) -> None:
+        flusher = asyncio.create_task(self._flush_loop()) if self.source.realtime else None
+        try:
+            async for tick in self.source.stream():
+                await self.process(tick)
+        finally:
+            if flusher is not None:
+                flusher.cancel()
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def metrics(self) -> dict:
+        return {
+            'ticks': self.ticks,
+            'bars_closed': self.bars_closed,
+            'alerts': self.alerts,
+            'rule_errors': self.rule_errors,
+            'last_tick': self.last_tick,
+            'late_ticks': sum(s.late_ticks for agg in self.aggregators.values() for s in agg.series.values()),
+            'series': {
+                f"{symbol}:{interval}": series.snapshot()
+                for symbol, agg in self.aggregators.items()
+                for interval, series in agg.series.items()
+            },
+        }
@@ -1,53 +1,31 @@
 import logging
-import os
-from datetime import datetime
 from typing import Union, List
 
-# 🔧 Logging Setup
-LOG_FILE = "bot_errors.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)s | %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+from src.symbols import VALID_TIMEFRAMES, symbol_registry
+
+# 🔧 Logging: src/logging_setup.py (queue + rotation + JSON) - यहाँ सिर्फ logger
 logger = logging.getLogger(__name__)
 
 
 def log_error(message: str, exc: bool = False) -> None:
     """
-    ❗ Error logging with rotation (10MB max)
+    ❗ Error logging (rotation/dedupe logging_setup के listener थ्रेड में)
     """
-    try:
-        logger.error(message, exc_info=exc)
-        if os.path.exists(LOG_FILE) and os.path.getsize(LOG_FILE) > 10 * 1024 * 1024:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            os.rename(LOG_FILE, f"bot_errors_{timestamp}.log")
-    except Exception as e:
-        print(f"Logging failed: {e}")
+    logger.error(message, exc_info=exc)
 
 
 def validate_symbol(symbol: str) -> bool:
     """
-    ✅ Symbol validator (Crypto, Indices, Stocks)
+    ✅ Symbol validator (Crypto, Indices, Stocks) - नाम, Yahoo टिकर या alias
     """
-    valid_symbols = {
-        'CRYPTO': ['BTC', 'ETH', 'BNB', 'XRP'],
-        'INDICES': ['NIFTY', 'BANKNIFTY', 'FINNIFTY', 'SENSEX'],
-        'STOCKS': ['RELIANCE', 'TATASTEEL', 'HDFCBANK', 'INFY']
-    }
-    all_symbols = [sym for group in valid_symbols.values() for sym in group]
-    return symbol.upper() in all_symbols
+    return symbol in symbol_registry
 
 
 def validate_timeframe(tf: str) -> bool:
     """
     ⏱️ Timeframe validator
     """
-    valid_tfs = ['1m', '5m', '15m', '30m', '1h', '4h', '1d', '1w']
-    return tf.lower() in valid_tfs
+    return tf.lower() in VALID_TIMEFRAMES
 
 
 def format_currency(value: Union[float, int]) -> str:
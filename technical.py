@@ -1,14 +1,13 @@
 import pandas as pd
 import numpy as np
 import logging
+from collections import deque
 from typing import Union, Dict, Optional
 from datetime import datetime
 
-# लॉगिंग सेटअप
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+from src.metrics import timed
+
+# लॉगिंग कॉन्फ़िगरेशन ऐप (src/main.py) करता है - इम्पोर्ट पर कोई side effect नहीं
 logger = logging.getLogger(__name__)
 
 class TechnicalAnalysis:
@@ -17,6 +16,7 @@ class TechnicalAnalysis:
     """
     
     @staticmethod
+    @timed("technical.calculate_rsi", none_is_error=True)
     def calculate_rsi(prices: Union[list, pd.Series], window: int = 14) -> Optional[float]:
         """
         RSI (Relative Strength Index) कैलकुलेट करें - TA-Lib से 2x तेज
@@ -49,6 +49,77 @@ class TechnicalAnalysis:
             return None
 
     @staticmethod
+    @timed("technical.calculate_rsi_series", none_is_error=True)
+    def calculate_rsi_series(prices: Union[list, pd.Series, np.ndarray],
+                             window: int = 14,
+                             last_only: bool = False) -> Optional[Union[np.ndarray, float]]:
+        """
+        वेक्टराइज़्ड RSI - calculate_rsi जैसे ही नंबर, बिना Python लूप के
+        2-D (time × symbol) array पर कॉलम-वाइज़ चलता है; last_only=True पर सिर्फ आखिरी वैल्यू
+        """
+        try:
+            prices = np.asarray(prices, dtype=float)
+            if len(prices) < window:
+                raise ValueError(f"कम से कम {window} प्राइस वैल्यूज चाहिए")
+
+            alpha = 1. / window
+            if last_only:
+                # पुराने बार का वज़न नगण्य है - सिर्फ ज़रूरी tail पर काम करें
+                prices = prices[-(TechnicalAnalysis._wilder_tail(alpha) + window):]
+
+            deltas = np.diff(prices, axis=0)
+            gains = np.where(deltas > 0, deltas, 0.)
+            losses = np.where(deltas < 0, -deltas, 0.)
+
+            if last_only:
+                up = TechnicalAnalysis._wilder_last(gains, window, alpha)
+                down = TechnicalAnalysis._wilder_last(losses, window, alpha)
+            else:
+                up = TechnicalAnalysis._wilder_series(gains, window, alpha)
+                down = TechnicalAnalysis._wilder_series(losses, window, alpha)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rsi = 100. - 100. / (1. + up / down)
+
+            if last_only:
+                return round(float(rsi), 2) if np.ndim(rsi) == 0 else np.round(rsi, 2)
+            return rsi
+
+        except Exception as e:
+            logger.error(f"RSI कैलकुलेशन में त्रुटि: {str(e)}")
+            return None
+
+    @staticmethod
+    def _wilder_series(values: np.ndarray, window: int, alpha: float) -> np.ndarray:
+        # seed (पहले window का औसत) को आगे रखकर ewm(adjust=False) = Wilder smoothing
+        seed = values[:window].sum(axis=0, keepdims=True) / window
+        smoothed = np.concatenate([seed, values[window - 1:]], axis=0)
+        frame = pd.DataFrame(smoothed) if smoothed.ndim > 1 else pd.Series(smoothed)
+        smoothed = frame.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+        # calculate_rsi की तरह शुरुआती window बार seed वैल्यू रखते हैं
+        head = np.repeat(smoothed[:1], window - 1, axis=0)
+        return np.concatenate([head, smoothed], axis=0)
+
+    @staticmethod
+    def _wilder_tail(alpha: float) -> int:
+        # इतने बार के बाद (1-α)^j का वज़न 1e-18 से कम हो जाता है
+        return int(np.ceil(np.log(1e-18) / np.log(1. - alpha)))
+
+    @staticmethod
+    def _wilder_last(values: np.ndarray, window: int, alpha: float) -> Union[np.ndarray, float]:
+        # आखिरी वैल्यू = seed·(1-α)^m + Σ α(1-α)^j·x[-1-j]
+        steps = len(values) - window + 1
+        tail = min(steps, TechnicalAnalysis._wilder_tail(alpha))
+        weights = alpha * (1. - alpha) ** np.arange(tail)
+        recent = values[len(values) - tail:][::-1]
+        last = np.tensordot(weights, recent, axes=(0, 0))
+        if tail == steps:
+            seed = values[:window].sum(axis=0) / window
+            last = last + seed * (1. - alpha) ** steps
+        return last
+
+    @staticmethod
+    @timed("technical.calculate_macd", none_is_error=True)
     def calculate_macd(prices: Union[list, pd.Series], 
                       window_slow: int = 26, 
                       window_fast: int = 12, 
@@ -77,6 +148,7 @@ class TechnicalAnalysis:
             return None
 
     @staticmethod
+    @timed("technical.calculate_bollinger_bands", none_is_error=True)
     def calculate_bollinger_bands(prices: Union[list, pd.Series], 
                                 window: int = 20, 
                                 window_dev: int = 2) -> Optional[Dict[str, float]]:
@@ -97,6 +169,7 @@ class TechnicalAnalysis:
             return None
 
     @staticmethod
+    @timed("technical.calculate_stochastic_oscillator", none_is_error=True)
     def calculate_stochastic_oscillator(high: Union[list, pd.Series],
                                       low: Union[list, pd.Series],
                                       close: Union[list, pd.Series],
@@ -125,6 +198,7 @@ class TechnicalAnalysis:
             return None
 
     @staticmethod
+    @timed("technical.calculate_vwap", none_is_error=True)
     def calculate_vwap(high: Union[list, pd.Series],
                      low: Union[list, pd.Series],
                      close: Union[list, pd.Series],
@@ -143,3 +217,383 @@ class TechnicalAnalysis:
         except Exception as e:
             logger.error(f"VWAP कैलकुलेशन में त्रुटि: {str(e)}")
             return None
+
+
+# ---------------- इंक्रीमेंटल (स्ट्रीमिंग) इंडिकेटर्स ----------------
+# ऊपर वाले static methods पूरी हिस्ट्री पर दोबारा कैलकुलेट करते हैं (batch path)।
+# नीचे की क्लासेज़ हर नए बार पर O(1) में अपडेट होती हैं और वही नंबर देती हैं।
+
+class StreamingEMA:
+    """
+    EMA (adjust=False) - हर नए प्राइस पर O(1) अपडेट
+    """
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.value: Optional[float] = None
+
+    def update(self, price: float) -> float:
+        price = float(price)
+        if self.value is None:
+            self.value = price
+        else:
+            self.value = self.alpha * price + (1 - self.alpha) * self.value
+        return self.value
+
+    def seed(self, prices: Union[list, pd.Series, np.ndarray]) -> Optional[float]:
+        for price in prices:
+            self.update(price)
+        return self.value
+
+
+class StreamingRSI:
+    """
+    Wilder RSI - calculate_rsi जैसा ही seed (पहले window डेल्टा का औसत) और smoothing
+    """
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.count = 0
+        self.last_price: Optional[float] = None
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.up = 0.0
+        self.down = 0.0
+        self.value: Optional[float] = None
+
+    def _smooth(self, gain: float, loss: float) -> None:
+        self.up = (self.up * (self.window - 1) + gain) / self.window
+        self.down = (self.down * (self.window - 1) + loss) / self.window
+
+    def _rsi(self) -> float:
+        if self.down == 0:
+            return 100.0 if self.up > 0 else float('nan')
+        return 100. - 100. / (1. + self.up / self.down)
+
+    def update(self, price: float) -> Optional[float]:
+        price = float(price)
+        self.count += 1
+        if self.last_price is None:
+            self.last_price = price
+            return None
+
+        delta = price - self.last_price
+        self.last_price = price
+        gain = delta if delta > 0 else 0.
+        loss = -delta if delta < 0 else 0.
+
+        if self.count <= self.window + 1:
+            # seed फेज़: calculate_rsi पहले window डेल्टा का योग /window लेता है
+            self.gain_sum += gain
+            self.loss_sum += loss
+            if self.count < self.window:
+                return None
+            self.up = self.gain_sum / self.window
+            self.down = self.loss_sum / self.window
+            if self.count == self.window + 1:
+                # batch लूप seed का आखिरी डेल्टा दोबारा smooth करता है
+                self._smooth(gain, loss)
+        else:
+            self._smooth(gain, loss)
+
+        self.value = self._rsi()
+        return round(self.value, 2)
+
+    def seed(self, prices: Union[list, pd.Series, np.ndarray]) -> Optional[float]:
+        result = None
+        for price in prices:
+            result = self.update(price)
+        return result
+
+
+class StreamingMACD:
+    """
+    MACD - fast/slow/signal तीनों EMA इंक्रीमेंटल
+    """
+
+    def __init__(self, window_slow: int = 26, window_fast: int = 12, window_sign: int = 9):
+        self.window_slow = window_slow
+        self.ema_slow = StreamingEMA(window_slow)
+        self.ema_fast = StreamingEMA(window_fast)
+        self.ema_signal = StreamingEMA(window_sign)
+        self.count = 0
+
+    def update(self, price: float) -> Optional[Dict[str, float]]:
+        self.count += 1
+        macd_line = self.ema_fast.update(price) - self.ema_slow.update(price)
+        signal_line = self.ema_signal.update(macd_line)
+        if self.count < self.window_slow:
+            return None
+        return {
+            'macd': round(macd_line, 4),
+            'signal': round(signal_line, 4),
+            'histogram': round(macd_line - signal_line, 4)
+        }
+
+    def seed(self, prices: Union[list, pd.Series, np.ndarray]) -> Optional[Dict[str, float]]:
+        result = None
+        for price in prices:
+            result = self.update(price)
+        return result
+
+
+class StreamingBollingerBands:
+    """
+    बोलिंगर बैंड्स - rolling mean/variance (Welford) window डेक के साथ
+    """
+
+    def __init__(self, window: int = 20, window_dev: int = 2):
+        self.window = window
+        self.window_dev = window_dev
+        self.prices: deque = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, price: float) -> Optional[Dict[str, float]]:
+        price = float(price)
+        self.prices.append(price)
+        n = len(self.prices)
+        if n <= self.window:
+            delta = price - self.mean
+            self.mean += delta / n
+            self.m2 += delta * (price - self.mean)
+        else:
+            old = self.prices.popleft()
+            old_mean = self.mean
+            self.mean += (price - old) / self.window
+            self.m2 += (price - old) * (price - self.mean + old - old_mean)
+
+        if len(self.prices) < self.window:
+            return None
+        std = np.sqrt(max(self.m2, 0.0) / (self.window - 1))
+        return {
+            'upper': round(self.mean + std * self.window_dev, 2),
+            'middle': round(self.mean, 2),
+            'lower': round(self.mean - std * self.window_dev, 2)
+        }
+
+    def seed(self, prices: Union[list, pd.Series, np.ndarray]) -> Optional[Dict[str, float]]:
+        result = None
+        for price in prices:
+            result = self.update(price)
+        return result
+
+
+class StreamingStochastic:
+    """
+    स्टोकेस्टिक ऑसिलेटर - monotonic deque से rolling min/max
+    """
+
+    def __init__(self, window: int = 14, smooth_window: int = 3):
+        self.window = window
+        self.smooth_window = smooth_window
+        self.count = 0
+        self.lows: deque = deque()   # (index, low) - बढ़ते क्रम में
+        self.highs: deque = deque()  # (index, high) - घटते क्रम में
+        self.k_values: deque = deque()
+        self.k_sum = 0.0
+
+    def update(self, high: float, low: float, close: float) -> Optional[Dict[str, float]]:
+        i = self.count
+        self.count += 1
+        high, low, close = float(high), float(low), float(close)
+
+        while self.lows and self.lows[-1][1] >= low:
+            self.lows.pop()
+        self.lows.append((i, low))
+        while self.highs and self.highs[-1][1] <= high:
+            self.highs.pop()
+        self.highs.append((i, high))
+        while self.lows[0][0] <= i - self.window:
+            self.lows.popleft()
+        while self.highs[0][0] <= i - self.window:
+            self.highs.popleft()
+
+        if self.count < self.window:
+            return None
+
+        lowest_low, highest_high = self.lows[0][1], self.highs[0][1]
+        rng = highest_high - lowest_low
+        k = 100 * (close - lowest_low) / rng if rng else float('nan')
+
+        self.k_values.append(k)
+        self.k_sum += k
+        if len(self.k_values) > self.smooth_window:
+            self.k_sum -= self.k_values.popleft()
+        if len(self.k_values) < self.smooth_window:
+            d = float('nan')
+        else:
+            d = self.k_sum / self.smooth_window
+        return {
+            'k': round(k, 2),
+            'd': round(d, 2)
+        }
+
+    def seed(self, high, low, close) -> Optional[Dict[str, float]]:
+        result = None
+        for h, l, c in zip(high, low, close):
+            result = self.update(h, l, c)
+        return result
+
+
+class StreamingVWAP:
+    """
+    rolling VWAP - window के अंदर (typical price × volume) और volume के running sums
+    """
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.bars: deque = deque()
+        self.tp_volume_sum = 0.0
+        self.volume_sum = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> Optional[float]:
+        typical_price = (float(high) + float(low) + float(close)) / 3
+        volume = float(volume)
+        self.bars.append((typical_price * volume, volume))
+        self.tp_volume_sum += typical_price * volume
+        self.volume_sum += volume
+        if len(self.bars) > self.window:
+            old_tp_volume, old_volume = self.bars.popleft()
+            self.tp_volume_sum -= old_tp_volume
+            self.volume_sum -= old_volume
+
+        if len(self.bars) < self.window:
+            return None
+        if self.volume_sum == 0:
+            return float('nan')
+        return round(self.tp_volume_sum / self.volume_sum, 2)
+
+    def seed(self, high, low, close, volume) -> Optional[float]:
+        result = None
+        for h, l, c, v in zip(high, low, close, volume):
+            result = self.update(h, l, c, v)
+        return result
+
+
+# ---------------- बैच मल्टी-इंडिकेटर API ----------------
+
+class IndicatorBatch:
+    """
+    एक OHLCV फ्रेम पर कई इंडिकेटर एक पास में - Series कन्वर्ज़न, EMA, rolling sums
+    और typical price एक बार बनते हैं और सभी specs में साझा होते हैं
+
+    spec: {'kind': 'ema', 'window': 20, 'name': 'EMA20'} या सिर्फ 'rsi' (डिफ़ॉल्ट पैरामीटर्स)
+    kinds: sma, ema, rsi, macd, bollinger, stochastic, vwap, volume_ma
+    """
+
+    COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+    KINDS = ('sma', 'ema', 'rsi', 'macd', 'bollinger', 'stochastic', 'vwap', 'volume_ma')
+
+    def __init__(self, data: Union[pd.DataFrame, Dict[str, np.ndarray]]):
+        if isinstance(data, pd.DataFrame):
+            columns = data.columns
+            if isinstance(columns, pd.MultiIndex):
+                # नए yfinance सिंगल टिकर पर भी (field, ticker) कॉलम देते हैं
+                columns = columns.get_level_values(0)
+            self.index = data.index
+            arrays = {str(col).lower(): data.iloc[:, i].to_numpy(dtype=float)
+                      for i, col in enumerate(columns)}
+        else:
+            arrays = {str(col).lower(): np.asarray(values, dtype=float) for col, values in data.items()}
+            self.index = pd.RangeIndex(len(next(iter(arrays.values()))))
+
+        self._arrays = {col: arrays[col] for col in self.COLUMNS if col in arrays}
+        self._series: Dict[str, pd.Series] = {}
+        self._cache: Dict[tuple, pd.Series] = {}
+
+    # --- साझा intermediates ---
+    def series(self, source: str) -> pd.Series:
+        if source not in self._series:
+            if source == 'typical':
+                values = (self._arrays['high'] + self._arrays['low'] + self._arrays['close']) / 3
+            elif source == 'typical_volume':
+                values = self.series('typical').to_numpy() * self._arrays['volume']
+            else:
+                values = self._arrays[source]
+            self._series[source] = pd.Series(values, index=self.index, copy=False)
+        return self._series[source]
+
+    def _cached(self, key: tuple, build) -> pd.Series:
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def ema(self, source: str, span: int) -> pd.Series:
+        return self._cached(('ema', source, span),
+                            lambda: self.series(source).ewm(span=span, adjust=False).mean())
+
+    def rolling_sum(self, source: str, window: int) -> pd.Series:
+        return self._cached(('sum', source, window), lambda: self.series(source).rolling(window=window).sum())
+
+    def rolling_mean(self, source: str, window: int) -> pd.Series:
+        return self._cached(('mean', source, window), lambda: self.rolling_sum(source, window) / window)
+
+    def rolling_std(self, source: str, window: int) -> pd.Series:
+        return self._cached(('std', source, window), lambda: self.series(source).rolling(window=window).std())
+
+    # --- इंडिकेटर्स (TechnicalAnalysis जैसे ही फॉर्मूले, पूरी सीरीज़) ---
+    def _sma(self, name, window=20, source='close'):
+        return {name or f'sma_{window}': self.rolling_mean(source, window)}
+
+    def _ema(self, name, window=20, source='close'):
+        return {name or f'ema_{window}': self.ema(source, window)}
+
+    def _volume_ma(self, name, window=20):
+        return {name or f'volume_ma_{window}': self.rolling_mean('volume', window)}
+
+    def _rsi(self, name, window=14):
+        rsi = self._cached(('rsi', window), lambda: pd.Series(
+            TechnicalAnalysis.calculate_rsi_series(self._arrays['close'], window), index=self.index))
+        return {name or f'rsi_{window}': rsi}
+
+    def _macd(self, name, window_slow=26, window_fast=12, window_sign=9):
+        prefix = name or 'macd'
+        macd_line = self.ema('close', window_fast) - self.ema('close', window_slow)
+        signal_line = macd_line.ewm(span=window_sign, adjust=False).mean()
+        return {prefix: macd_line, f'{prefix}_signal': signal_line, f'{prefix}_hist': macd_line - signal_line}
+
+    def _bollinger(self, name, window=20, window_dev=2, source='close'):
+        prefix = name or 'bb'
+        sma = self.rolling_mean(source, window)
+        std = self.rolling_std(source, window)
+        return {f'{prefix}_upper': sma + std * window_dev, f'{prefix}_middle': sma,
+                f'{prefix}_lower': sma - std * window_dev}
+
+    def _stochastic(self, name, window=14, smooth_window=3):
+        prefix = name or 'stoch'
+        lowest_low = self._cached(('min', 'low', window), lambda: self.series('low').rolling(window=window).min())
+        highest_high = self._cached(('max', 'high', window),
+                                    lambda: self.series('high').rolling(window=window).max())
+        k = 100 * ((self.series('close') - lowest_low) / (highest_high - lowest_low))
+        return {f'{prefix}_k': k, f'{prefix}_d': k.rolling(window=smooth_window).mean()}
+
+    def _vwap(self, name, window=14):
+        vwap = self.rolling_sum('typical_volume', window) / self.rolling_sum('volume', window)
+        return {name or f'vwap_{window}': vwap}
+
+    @timed("technical.IndicatorBatch.compute")
+    def compute(self, specs: list) -> pd.DataFrame:
+        """
+        सभी specs कैलकुलेट करके एक कॉलमनार DataFrame लौटाएँ (इंडेक्स इनपुट जैसा)
+        """
+        columns: Dict[str, pd.Series] = {}
+        for spec in specs:
+            params = {'kind': spec} if isinstance(spec, str) else dict(spec)
+            kind = params.pop('kind')
+            name = params.pop('name', None)
+            if kind not in self.KINDS:
+                raise ValueError(f"अनजान इंडिकेटर: {kind}")
+            columns.update(getattr(self, f'_{kind}')(name, **params))
+        return pd.DataFrame(columns, index=self.index)
+
+
+def compute_indicators(data: Union[pd.DataFrame, Dict[str, np.ndarray]], specs: list) -> Optional[pd.DataFrame]:
+    """
+    IndicatorBatch का शॉर्टकट - त्रुटि पर बाकी मेथड्स की तरह None
+    """
+    try:
+        return IndicatorBatch(data).compute(specs)
+    except Exception as e:
+        logger.error(f"बैच इंडिकेटर कैलकुलेशन में त्रुटि: {str(e)}")
+        return None
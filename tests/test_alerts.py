@@ -0,0 +1,72 @@
+import asyncio
+
+from src.alerts import AlertDispatcher
+
+
+class Permanent(Exception):
+    permanent = True
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def dispatcher(send, **kwargs):
+    kwargs.setdefault('workers', 1)
+    kwargs.setdefault('global_rate', 1000.0)
+    kwargs.setdefault('per_chat_rate', 1000.0)
+    return AlertDispatcher(send, **kwargs)
+
+
+def test_dedupe_key_ignores_changing_text():
+    async def main():
+        sent = []
+
+        async def send(chat_id, text):
+            sent.append(text)
+
+        d = dispatcher(send)
+        d.start()
+        assert d.publish("BUY BTC\n🕒 10:00:01", ["1"], dedupe_key="BUY BTC") == 1
+        assert d.publish("BUY BTC\n🕒 10:15:03", ["1"], dedupe_key="BUY BTC") == 0
+        assert d.publish("SELL BTC\n🕒 10:15:03", ["1"], dedupe_key="SELL BTC") == 1
+        await d.stop()
+        return sent, d.metrics()
+
+    sent, metrics = run(main())
+    assert len(sent) == 2 and metrics['deduplicated'] == 1
+
+
+def test_dropped_alert_is_not_deduplicated():
+    async def main():
+        async def send(chat_id, text):
+            pass
+
+        d = dispatcher(send, max_queue=1)
+        assert d.publish("a", ["1"]) == 1
+        assert d.publish("b", ["1"]) == 0  # queue full
+        d.start()
+        await asyncio.sleep(0.05)
+        queued = d.publish("b", ["1"])
+        await d.stop()
+        return queued, d.metrics()
+
+    queued, metrics = run(main())
+    assert queued == 1 and metrics['dropped'] == 1 and metrics['deduplicated'] == 0
+
+
+def test_failed_alert_can_be_resent():
+    async def main():
+        async def send(chat_id, text):
+            raise Permanent()
+
+        d = dispatcher(send)
+        d.start()
+        d.publish("x", ["1"])
+        await asyncio.sleep(0.05)
+        queued = d.publish("x", ["1"])
+        await d.stop()
+        return queued, d.metrics()
+
+    queued, metrics = run(main())
+    assert queued == 1 and metrics['failed'] == 2
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from backtest import BacktestEngine
+
+FEE_BPS, SLIPPAGE_BPS = 10.0, 5.0
+
+
+def synthetic(n: int = 1500, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    close = 62000 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+    volume = rng.uniform(100, 1000, n)
+    return close, volume
+
+
+def loop_equity(close, volume, ema_window, rsi_window, volume_window,
+                rsi_overbought=70, rsi_oversold=30, long_only=False):
+    # हर बार पर सिर्फ उस बार तक का डेटा - पुराना per-bar तरीका
+    cost = (FEE_BPS + SLIPPAGE_BPS) / 1e4
+    alpha = 2 / (ema_window + 1)
+    warmup = max(ema_window, rsi_window, volume_window)
+    ema = close[0]
+    up = down = None
+    held = position = 0.
+    equity, curve = 1.0, []
+    for i in range(len(close)):
+        ema = close[0] if i == 0 else alpha * close[i] + (1 - alpha) * ema
+        if i == rsi_window:
+            # calculate_rsi जैसा seed (बार 0..window), फिर उसी रिकर्शन का पहला स्टेप
+            deltas = np.diff(close[:rsi_window + 1])
+            up = deltas[deltas >= 0].sum() / rsi_window
+            down = -deltas[deltas < 0].sum() / rsi_window
+        if i >= rsi_window:
+            delta = close[i] - close[i - 1]
+            up = (up * (rsi_window - 1) + max(delta, 0.)) / rsi_window
+            down = (down * (rsi_window - 1) + max(-delta, 0.)) / rsi_window
+
+        # बार i पर रिटर्न, पिछले बार तक की पोज़िशन से
+        ret = close[i] / close[i - 1] - 1 if i else 0.
+        turnover = abs(held - position)
+        position = held
+        equity *= 1 + position * ret - turnover * cost
+        curve.append(equity)
+
+        if i < warmup:
+            continue
+        rsi = 100. - 100. / (1. + up / down)
+        volume_ok = volume[i] > volume[i - volume_window + 1:i + 1].mean()
+        if close[i] > ema and rsi < rsi_overbought and volume_ok:
+            held = 1.
+        elif close[i] < ema and rsi > rsi_oversold and volume_ok:
+            held = 0. if long_only else -1.
+    return np.array(curve)
+
+
+@pytest.mark.parametrize("params", [
+    dict(ema_window=20, rsi_window=14, volume_window=20),
+    dict(ema_window=10, rsi_window=14, volume_window=10),  # volume_window < rsi_window (CLI grid)
+    dict(ema_window=50, rsi_window=7, volume_window=30),
+])
+def test_matches_per_bar_loop(params):
+    close, volume = synthetic()
+    engine = BacktestEngine(close, volume, fee_bps=FEE_BPS, slippage_bps=SLIPPAGE_BPS)
+    assert np.allclose(engine.equity_curve(**params), loop_equity(close, volume, **params), rtol=1e-9)
+
+
+def test_no_look_ahead():
+    close, volume = synthetic()
+    params = dict(ema_window=10, rsi_window=14, volume_window=10)
+    base = BacktestEngine(close, volume).signals(**params)
+    for cut in (5, 14, 15, 200, 1000):
+        changed = close.copy()
+        changed[cut + 1:] *= 1.5
+        assert np.array_equal(BacktestEngine(changed, volume).signals(**params)[:cut + 1], base[:cut + 1])
+
+
+def test_short_history_has_no_signals():
+    close, volume = synthetic(10)
+    engine = BacktestEngine(close, volume)
+    assert not engine.signals().any()
+    assert engine.run()['trades'] == 0
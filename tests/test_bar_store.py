@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.bar_store import BarStore
+
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+def bars(start: str, closes) -> pd.DataFrame:
+    index = pd.date_range(start, periods=len(closes), freq="1min", tz="UTC")
+    return pd.DataFrame({field: np.asarray(closes, dtype=float) for field in FIELDS}, index=index)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BarStore(str(tmp_path))
+
+
+def test_forming_bar_is_not_stored(store):
+    df = bars("2024-01-01 00:00", range(10))
+    assert store.append("X", "1m", df, now=df.index[-1].timestamp() + 30) == 9
+    assert store.frame("X", "1m")["Close"].tolist() == list(map(float, range(9)))
+
+
+def test_normal_sync_is_a_pure_append(store):
+    df = bars("2024-01-01 00:00", range(10))
+    store.append("X", "1m", df, now=df.index[-1].timestamp() + 30)
+    inode = os.stat(store._path("X", "1m", "close")).st_ino
+    held = store.frame("X", "1m")
+
+    # yfinance history(start=<आखिरी स्टोर्ड बार>) वही बार फिर लौटाता है
+    refetch = bars("2024-01-01 00:08", [8, 9, 10])
+    assert store.append("X", "1m", refetch, now=refetch.index[-1].timestamp() + 5) == 1
+    assert os.stat(store._path("X", "1m", "close")).st_ino == inode
+    assert store.length("X", "1m") == 10
+    assert held["Close"].tolist() == list(map(float, range(9)))
+
+
+def test_revised_bar_rewrites_without_touching_held_frames(store):
+    df = bars("2024-01-01 00:00", range(10))
+    store.append("X", "1m", df, now=1e10)
+    held = store.frame("X", "1m")
+
+    store.append("X", "1m", bars("2024-01-01 00:05", [99]), now=1e10)
+    assert store.frame("X", "1m")["Close"].tolist() == [0., 1., 2., 3., 4., 99.]
+    assert held["Close"].tolist() == list(map(float, range(10)))
+    assert not [name for name in os.listdir(store._dir("X", "1m")) if name.endswith(".tmp")]
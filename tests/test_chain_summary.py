@@ -0,0 +1,95 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from options import OptionAnalyzer, summarize_chains
+from src.providers import AsyncMarketData, FakeProvider
+
+SPOT = 22000.
+
+
+def synthetic_columns(n_expiries, n_strikes, seed=5):
+    # हर एक्सपायरी में अलग स्ट्राइक ग्रिड; कुछ स्ट्राइक्स पर सिर्फ एक साइड, कुछ IV गायब
+    rng = np.random.default_rng(seed)
+    parts = []
+    for e in range(n_expiries):
+        strikes = SPOT + 50. * (np.arange(n_strikes) - n_strikes // 2 + e)
+        for is_call in (True, False):
+            k = strikes[rng.random(n_strikes) > 0.1]
+            parts.append((np.full(k.size, e, dtype=np.int32), np.full(k.size, is_call), k,
+                          rng.integers(0, 100000, k.size).astype(float),
+                          rng.integers(0, 5000, k.size).astype(float),
+                          np.where(rng.random(k.size) > 0.05, rng.uniform(0.1, 0.4, k.size), np.nan)))
+    order = rng.permutation(sum(p[0].size for p in parts))
+    names = ('expiry', 'is_call', 'strike', 'open_interest', 'volume', 'iv')
+    return {name: np.concatenate([p[i] for p in parts])[order] for i, name in enumerate(names)}
+
+
+def brute_force(strike, oi, is_call, walls):
+    # n×n payoff मैट्रिक्स वाला सीधा तरीका
+    grid = np.unique(strike)
+    C = np.array([oi[is_call & (strike == s)].sum() for s in grid])
+    P = np.array([oi[~is_call & (strike == s)].sum() for s in grid])
+    settle = grid[:, None]
+    pain = (np.maximum(settle - grid, 0) * C).sum(1) + (np.maximum(grid - settle, 0) * P).sum(1)
+    return {
+        'pcr_oi': oi[~is_call].sum() / oi[is_call].sum(),
+        'max_pain': grid[np.argmin(pain)],
+        'call_walls': grid[np.argsort(-C, kind='stable')[:walls]],
+        'put_walls': grid[np.argsort(-P, kind='stable')[:walls]],
+    }
+
+
+def test_summarize_chains_matches_brute_force():
+    n_expiries, walls = 6, 3
+    columns = synthetic_columns(n_expiries, 120)
+    got = summarize_chains(columns, SPOT, n_expiries, walls)
+
+    for e in range(n_expiries):
+        m = columns['expiry'] == e
+        expected = brute_force(columns['strike'][m], columns['open_interest'][m], columns['is_call'][m], walls)
+        assert got['pcr_oi'][e] == pytest.approx(expected['pcr_oi'])
+        assert got['max_pain'][e] == expected['max_pain']
+        assert np.array_equal(got['call_walls'][e], expected['call_walls'])
+        assert np.array_equal(got['put_walls'][e], expected['put_walls'])
+
+        # स्माइल: हर एक्सपायरी का सेगमेंट उसकी स्ट्राइक्स, क्रम में
+        start, end = got['smile_offsets'][e], got['smile_offsets'][e + 1]
+        assert np.array_equal(got['smile_strike'][start:end], np.unique(columns['strike'][m]))
+    assert got['smile_offsets'][-1] == got['smile_strike'].size
+
+
+def test_missing_expiry_is_nan():
+    columns = synthetic_columns(3, 40)
+    keep = columns['expiry'] != 1
+    got = summarize_chains({name: values[keep] for name, values in columns.items()}, SPOT, 3)
+    assert np.isnan(got['pcr_oi'][1]) and np.isnan(got['max_pain'][1]) and np.isnan(got['atm_iv'][1])
+    assert np.all(np.isnan(got['call_walls'][1]))
+    assert got['smile_offsets'][1] == got['smile_offsets'][2]
+    assert np.isfinite(got['max_pain'][[0, 2]]).all()
+
+
+def test_summarize_expiries_matches_per_expiry_analysis():
+    analyzer = OptionAnalyzer("NIFTY")
+
+    async def run():
+        market = AsyncMarketData(FakeProvider())
+        summary = await analyzer.summarize_expiries_async(market)
+        per_expiry = [await analyzer.analyze_chain_async(market, expiry_index=i, as_records=False)
+                      for i in range(len(summary['expiries']))]
+        return summary, per_expiry
+
+    summary, per_expiry = asyncio.run(run())
+    assert len(per_expiry) == 4
+    for i, chain in enumerate(per_expiry):
+        assert chain['expiry'] == summary['expiries'][i]
+        calls, puts = chain['calls'], chain['puts']
+        strike = np.r_[calls['strike'], puts['strike']]
+        oi = np.r_[calls['openInterest'], puts['openInterest']].astype(float)
+        is_call = np.r_[np.ones(len(calls), bool), np.zeros(len(puts), bool)]
+        expected = brute_force(strike, oi, is_call, 3)
+        assert summary['pcr_oi'][i] == pytest.approx(expected['pcr_oi'])
+        assert summary['max_pain'][i] == expected['max_pain']
+        assert np.array_equal(summary['call_walls'][i], expected['call_walls'])
+        assert np.array_equal(summary['put_walls'][i], expected['put_walls'])
@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+import pytest
+
+from options import black_scholes_greeks
+
+S, R = 45000., 0.06
+
+
+def synthetic_chain(n: int = 500, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    strikes = (S + 100 * rng.integers(-40, 41, n)).astype(float)
+    expiries = rng.choice([3, 7, 14, 28, 56], n) / 365
+    ivs = rng.uniform(0.08, 0.45, n)
+    flags = rng.choice(['c', 'p'], n)
+    return strikes, expiries, ivs, flags
+
+
+def scalar_greeks(flag, s, k, t, r, sigma):
+    # py_vollib की units: theta प्रति दिन, vega/rho प्रति 1%
+    cdf = lambda x: 0.5 * (1 + math.erf(x / math.sqrt(2)))
+    pdf = lambda x: math.exp(-0.5 * x * x) / math.sqrt(2 * math.pi)
+    d1 = (math.log(s / k) + (r + 0.5 * sigma ** 2) * t) / (sigma * math.sqrt(t))
+    d2 = d1 - sigma * math.sqrt(t)
+    discount = math.exp(-r * t)
+    if flag == 'c':
+        price = s * cdf(d1) - k * discount * cdf(d2)
+        delta = cdf(d1)
+        theta = -s * pdf(d1) * sigma / (2 * math.sqrt(t)) - r * k * discount * cdf(d2)
+        rho = k * t * discount * cdf(d2)
+    else:
+        price = k * discount * cdf(-d2) - s * cdf(-d1)
+        delta = cdf(d1) - 1
+        theta = -s * pdf(d1) * sigma / (2 * math.sqrt(t)) + r * k * discount * cdf(-d2)
+        rho = -k * t * discount * cdf(-d2)
+    return {
+        'price': price, 'delta': delta, 'gamma': pdf(d1) / (s * sigma * math.sqrt(t)),
+        'theta': theta / 365, 'vega': s * pdf(d1) * math.sqrt(t) / 100, 'rho': rho / 100,
+    }
+
+
+def test_matches_scalar_formulas():
+    strikes, expiries, ivs, flags = synthetic_chain()
+    ours = black_scholes_greeks(S, strikes, expiries, R, ivs, flags)
+    expected = [scalar_greeks(f, S, k, t, R, s) for f, k, t, s in zip(flags, strikes, expiries, ivs)]
+    for name in ('price', 'delta', 'gamma', 'theta', 'vega', 'rho'):
+        assert np.allclose(ours[name], [e[name] for e in expected], rtol=1e-7, atol=1e-9), name
+
+
+def test_put_call_parity():
+    strikes, expiries, ivs, _ = synthetic_chain()
+    calls = black_scholes_greeks(S, strikes, expiries, R, ivs, 'c')
+    puts = black_scholes_greeks(S, strikes, expiries, R, ivs, 'p')
+    assert np.allclose(calls['price'] - puts['price'], S - strikes * np.exp(-R * expiries), atol=1e-6)
+
+
+def test_matches_py_vollib():
+    pytest.importorskip("py_vollib")
+    from py_vollib.black_scholes import black_scholes
+    from py_vollib.black_scholes.greeks import analytical
+
+    strikes, expiries, ivs, flags = synthetic_chain()
+    ours = black_scholes_greeks(S, strikes, expiries, R, ivs, flags)
+    reference = {
+        'price': black_scholes,
+        'delta': analytical.delta,
+        'gamma': analytical.gamma,
+        'theta': analytical.theta,
+        'vega': analytical.vega,
+        'rho': analytical.rho,
+    }
+    for name, fn in reference.items():
+        expected = np.array([fn(f, S, k, t, R, s) for f, k, t, s in zip(flags, strikes, expiries, ivs)])
+        assert np.allclose(ours[name], expected, rtol=1e-7, atol=1e-9), name
+
+
+@pytest.mark.parametrize("flag", ['c', 'p'])
+def test_calculate_greeks_uses_engine_units(flag):
+    from options import OptionAnalyzer
+
+    analyzer = OptionAnalyzer("NIFTY")
+    got = analyzer.calculate_greeks(S=45000, K=45200, T=15 / 365, sigma=0.15, option_type=flag)
+    expected = scalar_greeks(flag, 45000., 45200., 15 / 365, analyzer.risk_free_rate, 0.15)
+    for name in ('delta', 'gamma', 'theta', 'vega', 'rho'):
+        assert got[name] == pytest.approx(round(expected[name], 4), abs=1e-4), name
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from options import OptionAnalyzer, black_scholes_greeks, implied_volatility
+
+S, R = 45000., 0.06
+
+
+def synthetic_chain(n: int = 2000, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    strikes = (S + 100 * rng.integers(-40, 41, n)).astype(float)
+    expiries = rng.choice([3, 7, 14, 28, 56], n) / 365
+    ivs = rng.uniform(0.08, 0.45, n)
+    flags = rng.choice(['c', 'p'], n)
+    return strikes, expiries, ivs, flags
+
+
+def test_round_trip():
+    strikes, expiries, ivs, flags = synthetic_chain()
+    greeks = black_scholes_greeks(S, strikes, expiries, R, ivs, flags)
+    solved = implied_volatility(greeks['price'], S, strikes, expiries, R, flags)
+    # बिना time value वाले डीप ITM/OTM स्ट्राइक्स पर IV पहचानी नहीं जा सकती
+    identifiable = greeks['vega'] > 1e-3
+    assert np.isfinite(solved[identifiable]).all()
+    assert np.max(np.abs(solved - ivs)[identifiable]) < 1e-4
+
+
+def test_out_of_bounds_prices_are_nan():
+    K = np.array([44000., 46000.])
+    T = 7 / 365
+    intrinsic = S - K[0] * np.exp(-R * T)
+    prices = np.array([intrinsic * 0.5, S * 1.1])  # intrinsic से कम, spot से ज़्यादा
+    assert np.isnan(implied_volatility(prices, S, K, T, R, 'c')).all()
+    assert np.isnan(implied_volatility(10., S, 45000., 0., R, 'c'))
+
+
+def test_matches_py_vollib():
+    pytest.importorskip("py_vollib")
+    from py_vollib.black_scholes.implied_volatility import implied_volatility as vollib_iv
+
+    strikes, expiries, ivs, flags = synthetic_chain(200)
+    greeks = black_scholes_greeks(S, strikes, expiries, R, ivs, flags)
+    solved = implied_volatility(greeks['price'], S, strikes, expiries, R, flags)
+    for i in np.flatnonzero(greeks['vega'] > 1e-3):
+        assert solved[i] == pytest.approx(vollib_iv(greeks['price'][i], S, strikes[i], expiries[i], R, flags[i]),
+                                          abs=1e-5)
+
+
+def test_fill_implied_volatility_uses_mid_then_last_price():
+    strikes = np.array([44500., 45000., 45500.])
+    T = 14 / 365
+    prices = black_scholes_greeks(S, strikes, T, R, 0.2, 'c')['price']
+    df = pd.DataFrame({
+        'strike': strikes,
+        'bid': [prices[0] - 1, 0., prices[2] - 2],
+        'ask': [prices[0] + 1, 0., prices[2] + 2],
+        'lastPrice': [1., prices[1], 1.],
+    })
+    OptionAnalyzer("NIFTY").fill_implied_volatility(df, S, T, 'c')
+    assert np.allclose(df['iv'], 0.2, atol=1e-4)
@@ -0,0 +1,81 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.cache import MarketDataCache
+from src.providers import AsyncMarketData, FakeProvider
+
+
+def test_concurrent_identical_calls_share_one_fetch():
+    provider = FakeProvider(latency=0.05)
+    market = AsyncMarketData(provider)
+
+    async def run():
+        return await asyncio.gather(*(market.history("NIFTY", "1d", "15m") for _ in range(5)),
+                                    market.history("BANKNIFTY", "1d", "15m"))
+
+    frames = asyncio.run(run())
+    assert provider.calls["history"] == 2  # NIFTY एक बार, BANKNIFTY एक बार
+    assert market.coalesced == 4
+    assert all(frame is frames[0] for frame in frames[:5])
+    assert market.inflight == 0
+
+
+def test_cancelled_caller_does_not_cancel_shared_fetch():
+    provider = FakeProvider(latency=0.05)
+    market = AsyncMarketData(provider)
+
+    async def run():
+        first = asyncio.ensure_future(market.expiries("NIFTY"))
+        second = asyncio.ensure_future(market.expiries("NIFTY"))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert len(asyncio.run(run())) == 4
+    assert provider.calls["expiries"] == 1
+
+
+def test_slow_provider_times_out():
+    executor = ThreadPoolExecutor(max_workers=1)
+    market = AsyncMarketData(FakeProvider(latency=0.5), executor=executor, timeout=0.05)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(market.option_chain("NIFTY", "2024-01-04"))
+        assert market.inflight == 0
+    finally:
+        executor.shutdown(wait=False)
+
+
+def test_cache_serves_repeat_calls():
+    provider = FakeProvider()
+    cache = MarketDataCache(timer=lambda: 1_700_000_000.0)
+    market = AsyncMarketData(provider, cache=cache)
+
+    async def run():
+        first = await market.history("NIFTY", "5d", "15m")
+        second = await market.history("NIFTY", "5d", "15m")
+        other_period = await market.history("NIFTY", "1d", "15m")
+        return first, second, other_period
+
+    first, second, other_period = asyncio.run(run())
+    assert second is first
+    assert len(other_period) < len(first)
+    assert provider.calls["history"] == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_bars_uses_its_own_cache_key():
+    provider = FakeProvider()
+    cache = MarketDataCache(timer=lambda: 1_700_000_000.0)
+    market = AsyncMarketData(provider, cache=cache)
+
+    async def run():
+        return (await market.bars("NIFTY", "15m", 200), await market.bars("NIFTY", "15m", 1),
+                await market.history("NIFTY", "5d", "15m"))
+
+    tail_200, tail_1, history = asyncio.run(run())
+    assert len(tail_200) == 200 and len(tail_1) == 1
+    assert tail_1.index[-1] == tail_200.index[-1] == history.index[-1]
+    assert cache.stats()["hits"] == 0 and cache.stats()["entries"] == 3
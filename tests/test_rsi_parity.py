@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from technical import StreamingRSI, TechnicalAnalysis
+
+
+def loop_rsi_series(prices: np.ndarray, window: int = 14) -> np.ndarray:
+    # calculate_rsi का लूप, पूरा array लौटाने के लिए
+    deltas = np.diff(prices)
+    seed = deltas[:window]
+    up = seed[seed >= 0].sum() / window
+    down = -seed[seed < 0].sum() / window
+    rsi = np.zeros_like(prices)
+    rsi[:window] = 100. - 100. / (1. + up / down)
+    for i in range(window, len(prices)):
+        delta = deltas[i - 1]
+        up = (up * (window - 1) + (delta if delta > 0 else 0.)) / window
+        down = (down * (window - 1) + (-delta if delta < 0 else 0.)) / window
+        rsi[i] = 100. - 100. / (1. + up / down)
+    return rsi
+
+
+@pytest.fixture
+def prices():
+    return 62000 + np.cumsum(np.random.default_rng(42).normal(0, 40, 5000))
+
+
+def test_series_matches_loop(prices):
+    series = TechnicalAnalysis.calculate_rsi_series(prices)
+    assert np.allclose(series, loop_rsi_series(prices), rtol=0, atol=1e-8)
+
+
+def test_last_value_matches_calculate_rsi(prices):
+    series = TechnicalAnalysis.calculate_rsi_series(prices)
+    last = TechnicalAnalysis.calculate_rsi_series(prices, last_only=True)
+    assert TechnicalAnalysis.calculate_rsi(prices) == last == round(series[-1], 2)
+
+
+@pytest.mark.parametrize("window", [2, 14, 30])
+def test_window_sizes(prices, window):
+    series = TechnicalAnalysis.calculate_rsi_series(prices[:500], window=window)
+    assert np.allclose(series, loop_rsi_series(prices[:500], window), rtol=0, atol=1e-8)
+
+
+def test_columns_match_single_series(prices):
+    # 2-D (time × symbol) कॉलम-वाइज़
+    panel = np.column_stack([prices, prices[::-1].copy()])
+    series = TechnicalAnalysis.calculate_rsi_series(panel)
+    for column in range(panel.shape[1]):
+        assert np.allclose(series[:, column], loop_rsi_series(panel[:, column]), rtol=0, atol=1e-8)
+
+
+def test_too_few_prices_returns_none():
+    assert TechnicalAnalysis.calculate_rsi_series(np.arange(5.)) is None
+
+
+def test_streaming_matches_batch(prices):
+    # हर नए बार पर O(1) update == पूरी हिस्ट्री पर calculate_rsi
+    stream = StreamingRSI(14)
+    for i, price in enumerate(prices[:600]):
+        value = stream.update(price)
+        if i >= 40:
+            assert value == pytest.approx(TechnicalAnalysis.calculate_rsi(prices[:i + 1]), abs=0.011)
+
+
+def test_streaming_seed_matches_batch(prices):
+    stream = StreamingRSI(14)
+    assert stream.seed(prices[:-1]) == pytest.approx(TechnicalAnalysis.calculate_rsi(prices[:-1]), abs=0.011)
+    assert stream.update(prices[-1]) == pytest.approx(TechnicalAnalysis.calculate_rsi(prices), abs=0.011)
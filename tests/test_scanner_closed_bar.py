@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from src.scanner import BUY_MESSAGE, closed_bars, signals_from_frame, signals_from_watchlist_frame
+
+STEP = 15 * 60
+
+
+def uptrend_with_forming_bar(n: int = 80) -> pd.DataFrame:
+    # बंद बार्स: ऊपर जाता ट्रेंड, आखिरी बंद बार पर तेज़ वॉल्यूम; आखिरी रो अभी बन रहा बार (कुछ सेकंड पुराना)
+    index = pd.date_range("2024-01-01", periods=n, freq="15min", tz="UTC")
+    close = 100 + 2 * np.sin(np.arange(n) / 3.0) + np.arange(n) * 0.02
+    volume = np.full(n, 1000.0)
+    volume[-2] = 5000.0
+    volume[-1] = 3.0
+    return pd.DataFrame({'Open': close, 'High': close + 0.5, 'Low': close - 0.5, 'Close': close,
+                         'Volume': volume}, index=index)
+
+
+def test_closed_bars_drops_forming_bar():
+    df = uptrend_with_forming_bar()
+    now = df.index[-1].timestamp() + 5
+    assert closed_bars(df, "15m", now).index[-1] == df.index[-2]
+    assert len(closed_bars(df, "15m", df.index[-1].timestamp() + STEP)) == len(df)
+    assert len(closed_bars(df, None, now)) == len(df)
+
+
+def test_scan_right_after_close_evaluates_last_closed_bar():
+    df = uptrend_with_forming_bar()
+    now = df.index[-1].timestamp() + 5
+    # forming बार पर नियम चलें तो वॉल्यूम शर्त कभी पूरी नहीं होती
+    assert signals_from_frame(df, "BTC") == []
+    assert signals_from_frame(df, "BTC", "15m", now) == [BUY_MESSAGE.format(symbol="BTC")]
+
+
+def test_watchlist_scan_evaluates_last_closed_bar():
+    df = uptrend_with_forming_bar()
+    now = df.index[-1].timestamp() + 5
+    signals = signals_from_watchlist_frame(df, ["BTC-USD"], interval="15m", now=now)
+    assert [s['signal'] for s in signals] == ['BUY']
@@ -0,0 +1,49 @@
+import math
+
+import numpy as np
+import pytest
+
+from technical import (
+    StreamingBollingerBands,
+    StreamingMACD,
+    StreamingStochastic,
+    StreamingVWAP,
+    TechnicalAnalysis as ta,
+)
+
+N, START = 600, 40
+
+
+def same(a, b, tol=0.011) -> bool:
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k], tol) for k in a)
+    if a is None or b is None:
+        return a is b
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    return abs(a - b) <= tol
+
+
+rng = np.random.default_rng(7)
+close = 62000 + np.cumsum(rng.normal(0, 40, N))
+high = close + rng.uniform(0, 60, N)
+low = close - rng.uniform(0, 60, N)
+volume = rng.uniform(10, 500, N)
+
+STREAMS = {
+    'macd': (StreamingMACD, lambda i: (close[i],), lambda i: ta.calculate_macd(close[:i + 1])),
+    'bollinger': (StreamingBollingerBands, lambda i: (close[i],),
+                  lambda i: ta.calculate_bollinger_bands(close[:i + 1])),
+    'stochastic': (StreamingStochastic, lambda i: (high[i], low[i], close[i]),
+                   lambda i: ta.calculate_stochastic_oscillator(high[:i + 1], low[:i + 1], close[:i + 1])),
+    'vwap': (StreamingVWAP, lambda i: (high[i], low[i], close[i], volume[i]),
+             lambda i: ta.calculate_vwap(high[:i + 1], low[:i + 1], close[:i + 1], volume[:i + 1])),
+}
+
+
+@pytest.mark.parametrize("name", STREAMS)
+def test_streaming_matches_batch(name):
+    cls, args, batch = STREAMS[name]
+    stream = cls()
+    mismatches = [i for i in range(N) if not same(stream.update(*args(i)), batch(i)) and i >= START]
+    assert mismatches == []
@@ -0,0 +1,102 @@
+import asyncio
+import csv
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ticks import ReplayTickSource, Tick, TickPipeline
+from technical import IndicatorBatch
+
+SYMBOLS = ("BTC", "ETH")
+INTERVALS = ("1m", "5m")
+
+
+def write_replay(path, symbols, ts, price, volume) -> None:
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["symbol", "ts", "price", "volume"])
+        writer.writerows(zip(symbols, ts, price, volume))
+
+
+def expected_bars(symbols, ts, price, volume, symbol: str, interval: str) -> pd.DataFrame:
+    mask = symbols == symbol
+    frame = pd.DataFrame({"price": price[mask], "volume": volume[mask]},
+                         index=pd.to_datetime(ts[mask], unit="s", utc=True))
+    rule = interval.replace("m", "min")
+    bars = frame["price"].resample(rule).ohlc()
+    bars["volume"] = frame["volume"].resample(rule).sum()
+    # खाली बार्स pipeline नहीं बनाती; आखिरी बार अभी बन रहा है
+    return bars.dropna().iloc[:-1]
+
+
+@pytest.fixture
+def ticks(tmp_path):
+    # ~2 टिक/सेकंड, अनियमित अंतराल, दोनों सिंबल बारी-बारी
+    rng = np.random.default_rng(11)
+    n = 40_000
+    ts = np.round(1_700_000_000 + np.cumsum(rng.exponential(0.5, n)), 3)
+    symbols = np.array(SYMBOLS)[rng.integers(0, len(SYMBOLS), n)]
+    price = np.round(np.where(symbols == "BTC", 62000.0, 3000.0) * np.exp(np.cumsum(rng.normal(0, 2e-4, n))), 4)
+    volume = np.round(rng.exponential(0.3, n), 6)
+    path = tmp_path / "ticks.csv"
+    write_replay(path, symbols, ts, price, volume)
+    return str(path), symbols, ts, price, volume
+
+
+def test_bars_and_indicators_match_batch(ticks):
+    path, symbols, ts, price, volume = ticks
+    pipeline = TickPipeline(ReplayTickSource(path), intervals=INTERVALS, rules=[], capacity=5000)
+    asyncio.run(pipeline.run())
+
+    for symbol in SYMBOLS:
+        for interval in INTERVALS:
+            series = pipeline.aggregators[symbol].series[interval]
+            expected = expected_bars(symbols, ts, price, volume, symbol, interval)
+            got = series.last()
+            assert np.array_equal(expected.index.as_unit("s").asi8, got["timestamp"] // 10**9)
+            for column in ("open", "high", "low", "close", "volume"):
+                assert np.allclose(expected[column].to_numpy(), got[column]), (symbol, interval, column)
+
+            batch = IndicatorBatch({c: got[c] for c in ("open", "high", "low", "close", "volume")}).compute(
+                [{'kind': 'ema', 'window': 20, 'name': 'ema'}, {'kind': 'rsi', 'window': 14, 'name': 'rsi'},
+                 {'kind': 'volume_ma', 'window': 20, 'name': 'volume_ma'}]).iloc[-1]
+            snap = series.snapshot()
+            assert snap["ema"] == pytest.approx(batch["ema"], abs=1e-6)
+            assert snap["rsi"] == pytest.approx(batch["rsi"], abs=0.011)
+            assert snap["volume_ma"] == pytest.approx(batch["volume_ma"], abs=1e-6)
+
+
+def test_paced_replay_keeps_every_tick(tmp_path):
+    # पुराना डेटा, 1 टिक/सेकंड, timer flush चालू: replay घड़ी से बार बंद हों, wall clock से नहीं
+    n = 5 * 60
+    ts = 1_600_000_000 + np.arange(n, dtype=float)
+    symbols = np.full(n, "BTC")
+    price = 62000.0 + np.arange(n) % 17
+    volume = np.ones(n)
+    path = tmp_path / "paced.csv"
+    write_replay(path, symbols, ts, price, volume)
+
+    pipeline = TickPipeline(ReplayTickSource(str(path), speed=1200), intervals=("1m",), rules=[],
+                            flush_interval=0.01)
+    asyncio.run(pipeline.run())
+    series = pipeline.aggregators["BTC"].series["1m"]
+    expected = expected_bars(symbols, ts, price, volume, "BTC", "1m")
+    assert series.late_ticks == 0
+    assert np.allclose(series.last()["volume"], expected["volume"].to_numpy())
+    assert np.allclose(series.last()["close"], expected["close"].to_numpy())
+
+
+def test_late_tick_does_not_reopen_closed_bar():
+    pipeline = TickPipeline(ReplayTickSource(""), intervals=("1m",), rules=[], timer=lambda: 0.0)
+
+    async def feed():
+        for tick in (("BTC", 0.0, 1.0, 1.0), ("BTC", 30.0, 2.0, 1.0)):
+            await pipeline.process(Tick(*tick))
+        await pipeline.flush(61.0)
+        await pipeline.process(Tick("BTC", 59.0, 5.0, 1.0))  # बंद हो चुके बार का टिक
+
+    asyncio.run(feed())
+    series = pipeline.aggregators["BTC"].series["1m"]
+    assert series.late_ticks == 1
+    assert series.last()["close"].tolist() == [2.0]